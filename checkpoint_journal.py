@@ -0,0 +1,80 @@
+"""
+Журнал контрольной точки: разрешенные узлы анализа дописываются в файл по мере получения
+
+После сбоя или остановки анализ продолжается с тем же журналом (resume):
+узлы из журнала попадают в таблицу разрешенных узлов кеша результатов,
+и репозиторий запрашивается только для неисследованной границы графа.
+"""
+
+import json
+import os
+from typing import Dict, Any, Tuple
+
+
+class CheckpointJournal:
+    """Файл JSON Lines: одна строка на разрешенный узел"""
+
+    def __init__(self, filename: str, resume: bool = False):
+        self.filename = filename
+        # Узел -> (фактическая версия, зависимости), прочитанные из журнала
+        self.entries: Dict[Tuple, Tuple[str, Dict[str, str]]] = {}
+        # Поврежденные строки (например, недописанная последняя строка после сбоя)
+        self.skipped_lines = 0
+        self.recorded = 0
+
+        if resume:
+            self._load()
+        # Без resume журнал начинается заново; при продолжении новые узлы дописываются в конец
+        mode = 'a' if resume else 'w'
+        # Построчная буферизация: каждая строка попадает в файл сразу после записи
+        self.file = open(filename, mode, encoding='utf-8', buffering=1)
+
+    def _load(self) -> None:
+        if not os.path.exists(self.filename):
+            print(f"Журнал контрольной точки не найден, анализ начинается заново: {self.filename}")
+            return
+
+        # Конец последней целой строки: недописанный хвост отрезается, иначе
+        # следующая запись продолжила бы его и тоже оказалась бы поврежденной
+        valid_end = 0
+        with open(self.filename, 'rb') as journal:
+            for line in journal:
+                try:
+                    entry = json.loads(line)
+                    repository_type, repo_url, test_mode, name, version = entry['key']
+                    self.entries[(repository_type, repo_url, bool(test_mode), name, version)] = (
+                        entry['version'], entry['dependencies'])
+                except (ValueError, KeyError, TypeError):
+                    self.skipped_lines += 1
+                if line.endswith(b'\n'):
+                    valid_end = journal.tell()
+            if valid_end < journal.tell():
+                os.truncate(self.filename, valid_end)
+
+        message = f"Журнал контрольной точки {self.filename}: узлов {len(self.entries)}"
+        if self.skipped_lines:
+            message += f", пропущено поврежденных строк: {self.skipped_lines}"
+        print(message)
+
+    def restore(self, result_cache) -> int:
+        """Переносит узлы журнала в таблицу разрешенных узлов; возвращает их число"""
+        count = len(self.entries)
+        for node_key, (actual_version, dependencies) in self.entries.items():
+            result_cache.remember(node_key, actual_version, dependencies)
+        # Узлы нужны только один раз: дальше они живут в кеше клиента
+        self.entries = {}
+        return count
+
+    def record(self, node_key: Tuple, actual_version: str, dependencies: Dict[str, Any]) -> None:
+        """Дописывает разрешенный узел в журнал"""
+        self.file.write(json.dumps({
+            'key': list(node_key),
+            'version': actual_version,
+            'dependencies': dependencies,
+        }, ensure_ascii=False) + "\n")
+        self.recorded += 1
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -1,70 +1,186 @@
-from typing import Dict, Any, Set, Tuple
+import time
+from typing import TYPE_CHECKING, Dict, Any, Set, Tuple, Optional
 from repository_client import RepositoryClient
 from network_error import NetworkError
 
+if TYPE_CHECKING:
+    # Только для аннотаций: во время выполнения модули загружаются по необходимости
+    from graph_store import GraphStore, StoredNode
+    from result_cache import ResultCache
+    from checkpoint_journal import CheckpointJournal
+
 
 class DependencyAnalyzer:
     """Анализатор зависимостей"""
     
-    def __init__(self, max_depth: int = 3, filter_str: str = ""):
+    def __init__(self, max_depth: int = 3, filter_str: str = "",
+                 repository_client: Optional[RepositoryClient] = None,
+                 time_budget: float = 0, max_nodes: int = 0, repository_type: str = "",
+                 graph_store: Optional["GraphStore"] = None,
+                 result_cache: Optional["ResultCache"] = None,
+                 checkpoint: Optional["CheckpointJournal"] = None):
         self.max_depth = max_depth
         self.filter_str = filter_str
         self.visited_packages: Set[Tuple[str, str]] = set()
         self.dependency_tree: Dict[str, Any] = {}
-        self.repository_client = RepositoryClient()
+        # Клиент может быть общим для нескольких анализов (сохраняет кеш метаданных)
+        self.repository_client = repository_client or RepositoryClient()
+        
+        # Бюджет анализа (0 - без ограничения)
+        self.time_budget = time_budget
+        self.max_nodes = max_nodes
+        self.started_at: Optional[float] = None
+        self.nodes_analyzed = 0
+        self.truncated_nodes = 0
+        # Повторные посещения пакетов (узлы с пометкой cached)
+        self.repeated_nodes = 0
+        # Узлы, зависимости которых взяты из кеша результатов, и узлы с ошибками
+        self.reused_nodes = 0
+        self.failed_nodes = 0
+        self.truncation_reason = ""
+        # Были ли узлы, отсеченные ограничением глубины
+        self.depth_limit_reached = False
+        # Определенные типы репозиториев: URL -> тип
+        self.repository_types: Dict[str, str] = {}
+        # Явно заданный тип репозитория (например, для внутренних зеркал)
+        self.repository_type = repository_type
+        # Хранилище на диске: узлы записываются сразу, в памяти остается только текущий путь
+        self.graph_store = graph_store
+        # Зависимости уже разрешенных узлов (от прошлых анализов на этом клиенте)
+        self.result_cache = result_cache
+        # Журнал контрольной точки: каждый загруженный узел дописывается в файл
+        self.checkpoint = checkpoint
+    
+    def _resolve_repository_type(self, repo_url: str) -> str:
+        """Определяет тип репозитория при первом обращении и запоминает его"""
+        repo_type = self.repository_types.get(repo_url)
+        if repo_type is None:
+            repo_type = self.repository_type or self.repository_client.detect_repository_type(repo_url)
+            self.repository_types[repo_url] = repo_type
+            print(f"[ANALYZE DEBUG] Тип репозитория '{repo_url}': {repo_type}")
+        return repo_type
+    
+    def _budget_exhausted(self) -> bool:
+        """Проверяет, исчерпан ли бюджет по времени или числу узлов"""
+        if self.truncation_reason:
+            return True
+        
+        if self.max_nodes and self.nodes_analyzed >= self.max_nodes:
+            self.truncation_reason = f"достигнут лимит узлов ({self.max_nodes})"
+        elif self.time_budget and time.monotonic() - self.started_at >= self.time_budget:
+            self.truncation_reason = f"исчерпан бюджет времени ({self.time_budget} с)"
+        
+        return bool(self.truncation_reason)
+    
+    def _store_node(self, result: Dict[str, Any], first_id: int) -> "StoredNode":
+        """Записывает узел в хранилище; дети к этому моменту уже записаны"""
+        from graph_store import StoredNode, FLAG_CACHED, FLAG_TRUNCATED
+        
+        children = []
+        for child in result.get('dependencies', {}).values():
+            if not isinstance(child, StoredNode):
+                # Узел ошибки, созданный без рекурсивного вызова
+                child = self._store_node(child, self.graph_store.next_id)
+            children.append(child)
+        
+        if not children:
+            # Поддерево отброшено (ошибка или фильтр) - удаляем уже записанных потомков
+            self.graph_store.delete_from(first_id)
+        
+        flags = (FLAG_CACHED if result.get('cached') else 0) | (FLAG_TRUNCATED if result.get('truncated') else 0)
+        return self.graph_store.add_node(result['name'], result.get('version', 'unknown'), children,
+                                         result.get('error'), flags)
     
     def analyze_package(self, package_name: str, version: str = "latest", 
            repo_url: str = "https://registry.npmjs.org", depth: int = 0, 
            test_mode: bool = False) -> Dict[str, Any]:
+        """Анализирует пакет и его зависимости; с хранилищем возвращает узел из хранилища"""
+        if self.graph_store is None:
+            return self._analyze_package(package_name, version, repo_url, depth, test_mode)
+        
+        first_id = self.graph_store.next_id
+        result = self._analyze_package(package_name, version, repo_url, depth, test_mode)
+        return self._store_node(result, first_id)
+    
+    def _analyze_package(self, package_name: str, version: str, repo_url: str, depth: int,
+                         test_mode: bool) -> Dict[str, Any]:
 
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+        
         if depth >= self.max_depth:
+            self.depth_limit_reached = True
             return {"name": package_name, "version": version, "dependencies": {}}
         
         cache_key = (package_name, version)
         if cache_key in self.visited_packages:
+            self.repeated_nodes += 1
             return {"name": package_name, "version": version, "dependencies": {}, "cached": True}
         
+        # Бюджет исчерпан - узел остается неисследованной границей графа
+        if self._budget_exhausted():
+            self.truncated_nodes += 1
+            return {"name": package_name, "version": version, "dependencies": {}, "truncated": True}
+        
         self.visited_packages.add(cache_key)
+        self.nodes_analyzed += 1
         
         try:
-            print(f"Анализ {package_name}@{version} (уровень {depth})...")
-            
-            # Определяем тип репозитория
-            repo_type = self.repository_client.detect_repository_type(repo_url)
-            print(f"[ANALYZE DEBUG] Тип репозитория '{repo_url}': {repo_type}")
-            
-            # Получаем информацию о пакете
-            package_info = None
-            actual_version = version
+            resolved = None
+            node_key = (self.repository_type, repo_url, test_mode, package_name, version)
+            if self.result_cache is not None:
+                resolved = self.result_cache.resolved(node_key)
             
-            try:
-                if repo_type == 'npm':
-                    package_info = self.repository_client.fetch_npm_package_info(
-                        package_name, version, test_mode
-                    )
-                elif repo_type == 'pypi':
-                    package_info = self.repository_client.fetch_pypi_package_info(package_name, version)
-                    actual_version = package_info.get('version', version)
-                elif repo_type == 'uppercase':
-                    package_info = self.repository_client.fetch_uppercase_package_info(
-                        package_name, version, repo_url
+            if resolved is not None:
+                # Узел разрешен прошлым анализом - репозиторий не нужен
+                self.reused_nodes += 1
+                actual_version, dependencies = resolved
+            else:
+                print(f"Анализ {package_name}@{version} (уровень {depth})...")
+                
+                # Тип репозитория определяется один раз за анализ
+                repo_type = self._resolve_repository_type(repo_url)
+                
+                # Получаем информацию о пакете
+                package_info = None
+                actual_version = version
+                
+                try:
+                    package_info = self.repository_client.fetch_package_info(
+                        repo_type, package_name, version, repo_url, test_mode
                     )
-                    actual_version = package_info.get('version', version) if package_info else version
-                elif repo_type == 'local':
-                    pass
-                else:
-                    raise NetworkError(f"Неподдерживаемый репозиторий: {repo_url}")
-                    
-            except NetworkError as e:
-                return {
-                    "name": package_name,
-                    "version": version,
-                    "error": str(e),
-                    "dependencies": {}
-                }
+                    if repo_type != 'npm' and package_info:
+                        actual_version = package_info.get('version', version)
+                        
+                except NetworkError as e:
+                    self.failed_nodes += 1
+                    return {
+                        "name": package_name,
+                        "version": version,
+                        "error": str(e),
+                        "dependencies": {}
+                    }
+                
+                # Извлекаем зависимости (БЕЗ ФИЛЬТРАЦИИ на этом этапе)
+                dependencies = self.repository_client.get_backend(repo_type).extract_dependencies(package_info)
+                
+                if self.result_cache is not None:
+                    self.result_cache.remember(node_key, actual_version, dependencies)
+                if self.checkpoint is not None:
+                    self.checkpoint.record(node_key, actual_version, dependencies)
             
-            # Извлекаем зависимости (БЕЗ ФИЛЬТРАЦИИ на этом этапе)
-            dependencies = self.repository_client.extract_dependencies(package_info, repo_type)
+            # Загружаем метаданные детей заранее и параллельно (если включен пул разбора)
+            # После исчерпания бюджета дети не анализируются - загружать их незачем
+            if depth + 1 < self.max_depth and not self._budget_exhausted():
+                pending = {dep_name: dep_version for dep_name, dep_version in dependencies.items()
+                           if (dep_name, dep_version) not in self.visited_packages}
+                if self.result_cache is not None:
+                    pending = {dep_name: dep_version for dep_name, dep_version in pending.items()
+                               if self.result_cache.resolved(
+                                   (self.repository_type, repo_url, test_mode, dep_name, dep_version)) is None}
+                if pending:
+                    self.repository_client.prefetch(self._resolve_repository_type(repo_url),
+                                                    pending, repo_url, test_mode)
             
             # Рекурсивно анализируем зависимости (ВСЕГДА анализируем все зависимости)
             child_deps = {}
@@ -76,7 +192,10 @@ class DependencyAnalyzer:
                     # ФИЛЬТРАЦИЯ ПРИМЕНЯЕТСЯ ЗДЕСЬ: добавляем только если пакет или его дети прошли фильтр
                     if self._should_include_in_graph(child_result):
                         child_deps[dep_name] = child_result
+                    elif self.graph_store is not None:
+                        self.graph_store.delete_subtree(child_result)
                 except (NetworkError, Exception) as e:
+                    self.failed_nodes += 1
                     error_result = {
                         "name": dep_name, 
                         "version": dep_version,
@@ -102,6 +221,7 @@ class DependencyAnalyzer:
                 return result
                 
         except Exception as e:
+            self.failed_nodes += 1
             error_result = {
                 "name": package_name,
                 "version": version,
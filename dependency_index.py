@@ -0,0 +1,89 @@
+"""
+Обратный индекс графа зависимостей для запросов "кто зависит от X"
+"""
+
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+
+class DependencyIndex:
+    """Индекс построенного дерева: родители, глубина и число входящих связей каждого пакета"""
+
+    def __init__(self, tree: Dict[str, Any]):
+        self.root = tree['name']
+        # Пакет -> список непосредственных родителей (без повторов, в порядке обхода)
+        self.parents: Dict[str, List[str]] = {self.root: []}
+        # Пакет -> минимальная глубина от корня
+        self.depth: Dict[str, int] = {self.root: 0}
+        # Пакет -> родитель на кратчайшем пути от корня
+        self.predecessor: Dict[str, Optional[str]] = {self.root: None}
+        # Пакет -> версии, встреченные в графе
+        self.versions: Dict[str, List[str]] = {}
+        self._build(tree)
+
+    def _build(self, tree: Dict[str, Any]) -> None:
+        """Обход в ширину: первая встреча пакета дает его минимальную глубину"""
+        queue = deque([(tree, 0)])
+        while queue:
+            node, node_depth = queue.popleft()
+            name = node['name']
+
+            version = node.get('version', 'unknown')
+            node_versions = self.versions.setdefault(name, [])
+            if version not in node_versions:
+                node_versions.append(version)
+
+            for child in node.get('dependencies', {}).values():
+                child_name = child['name']
+                child_parents = self.parents.setdefault(child_name, [])
+                if name not in child_parents:
+                    child_parents.append(name)
+                if child_name not in self.depth:
+                    self.depth[child_name] = node_depth + 1
+                    self.predecessor[child_name] = name
+                queue.append((child, node_depth + 1))
+
+    def __contains__(self, package_name: str) -> bool:
+        return package_name in self.depth
+
+    def packages(self) -> List[str]:
+        """Все пакеты графа"""
+        return list(self.depth.keys())
+
+    def fan_in(self, package_name: str) -> int:
+        """Число пакетов, непосредственно зависящих от данного"""
+        return len(self.parents.get(package_name, []))
+
+    def reverse_dependencies(self, package_name: str) -> List[str]:
+        """Пакеты, непосредственно зависящие от данного"""
+        return list(self.parents.get(package_name, []))
+
+    def shortest_path(self, package_name: str) -> List[str]:
+        """Кратчайший путь от корня до пакета (пустой список, если пакета нет в графе)"""
+        if package_name not in self.predecessor:
+            return []
+        path = []
+        current = package_name
+        while current is not None:
+            path.append(current)
+            current = self.predecessor[current]
+        path.reverse()
+        return path
+
+    def all_paths(self, package_name: str) -> List[List[str]]:
+        """Все простые пути от корня до пакета (подъем по родителям от пакета к корню)"""
+        if package_name not in self.depth:
+            return []
+
+        paths = []
+        stack = [(package_name, [package_name])]
+        while stack:
+            current, reversed_path = stack.pop()
+            if current == self.root:
+                paths.append(list(reversed(reversed_path)))
+                continue
+            for parent in reversed(self.parents.get(current, [])):
+                # Пропускаем циклы: пакет не может встретиться в пути дважды
+                if parent not in reversed_path:
+                    stack.append((parent, reversed_path + [parent]))
+        return paths
@@ -0,0 +1,145 @@
+"""
+Локальный сервис анализа зависимостей с прогретыми кешами
+"""
+
+import copy
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Tuple
+from urllib.parse import urlparse, parse_qs
+from config_error import ConfigError
+from network_error import NetworkError
+from dependency_visualizer import DependencyVisualizer
+from graph_statistics import GraphStatistics
+
+
+class DependencyServer:
+    """HTTP-сервис на localhost, который держит в памяти репозитории, метаданные и готовые графы"""
+
+    # Соответствие параметров запроса параметрам конфигурации
+    QUERY_PARAMETERS = {
+        'package': 'package_name',
+        'repository': 'repository_url',
+        'version': 'package_version',
+        'max_depth': 'max_depth',
+        'filter': 'filter_substring',
+        'test_mode': 'test_repository_mode',
+    }
+
+    def __init__(self, visualizer: DependencyVisualizer, host: str = "127.0.0.1", port: int = 8765):
+        self.visualizer = visualizer
+        self.host = host
+        self.port = port
+        # Общий клиент: кеш метаданных, разобранные репозитории и готовые графы живут между запросами
+        self.repository_client = visualizer.create_repository_client()
+        self.httpd = None
+
+    def build_visualizer(self, query: Dict[str, str]) -> DependencyVisualizer:
+        """Создает визуализатор с конфигурацией по умолчанию, переопределенной параметрами запроса"""
+        request_visualizer = copy.copy(self.visualizer)
+        request_visualizer.config = dict(self.visualizer.config)
+        # Сервис хранит готовые графы в памяти и отдает их из разных потоков
+        request_visualizer.config['graph_store'] = ""
+        request_visualizer.graph_store = None
+
+        for query_param, config_param in self.QUERY_PARAMETERS.items():
+            if query_param in query:
+                request_visualizer.config[config_param] = query[query_param]
+
+        request_visualizer._validate_parameter_types()
+        request_visualizer._validate_parameter_values()
+        return request_visualizer
+
+    def analyze(self, request_visualizer: DependencyVisualizer) -> Dict[str, Any]:
+        """Возвращает граф из кеша результатов общего клиента или строит его"""
+        # Версия из запроса (?version=) - версия корня анализа и часть ключа кеша результатов
+        root_version = request_visualizer.config['package_version'] or "latest"
+        tree = request_visualizer.analyze_real_dependencies(self.repository_client, root_version=root_version)
+
+        # Реестр может заменить отсутствующую версию последней - сообщаем об этом в лог сервиса
+        if root_version != "latest" and 'error' not in tree and tree.get('version') != root_version:
+            print(f"Запрошена версия {tree['name']}@{root_version}, проанализирована {tree.get('version')}")
+        return tree
+
+    def clear_cache(self) -> None:
+        """Сбрасывает все кеши сервиса"""
+        self.repository_client.clear_cache()
+
+    def handle(self, method: str, path: str, query: Dict[str, str]) -> Tuple[int, str, str]:
+        """Обрабатывает запрос и возвращает (код ответа, тип содержимого, тело)"""
+        if method == 'GET' and path == '/health':
+            body = json.dumps({
+                "status": "ok",
+                "cached_packages": len(self.repository_client.package_cache),
+                "cached_graphs": len(self.repository_client.result_cache),
+            }, ensure_ascii=False)
+            return 200, 'application/json', body
+
+        if method == 'POST' and path == '/cache/clear':
+            self.clear_cache()
+            return 200, 'application/json', json.dumps({"status": "cleared"})
+
+        if method == 'GET' and path in ('/analyze', '/tree', '/export', '/statistics'):
+            request_visualizer = self.build_visualizer(query)
+            tree = self.analyze(request_visualizer)
+
+            if path == '/analyze':
+                return 200, 'application/json', json.dumps(tree, ensure_ascii=False)
+            if path == '/statistics':
+                return 200, 'application/json', json.dumps(GraphStatistics(tree).to_dict(), ensure_ascii=False)
+            if path == '/tree':
+                return 200, 'text/plain', "\n".join(request_visualizer.format_tree_lines(tree)) + "\n"
+            return 200, 'text/plain', "\n".join(request_visualizer.format_report_lines(tree)) + "\n"
+
+        return 404, 'application/json', json.dumps({"error": f"Неизвестный запрос: {method} {path}"},
+                                                   ensure_ascii=False)
+
+    def serve_forever(self) -> None:
+        """Запускает сервис и обрабатывает запросы до остановки"""
+        server = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            def _dispatch(self, method):
+                parsed = urlparse(self.path)
+                query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+                try:
+                    status, content_type, body = server.handle(method, parsed.path, query)
+                except ConfigError as e:
+                    status, content_type = 400, 'application/json'
+                    body = json.dumps({"error": f"Ошибка конфигурации: {e}"}, ensure_ascii=False)
+                except NetworkError as e:
+                    status, content_type = 502, 'application/json'
+                    body = json.dumps({"error": f"Ошибка сети: {e}"}, ensure_ascii=False)
+                except Exception as e:
+                    status, content_type = 500, 'application/json'
+                    body = json.dumps({"error": f"Неожиданная ошибка: {e}"}, ensure_ascii=False)
+
+                payload = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', f"{content_type}; charset=utf-8")
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._dispatch('GET')
+
+            def do_POST(self):
+                self._dispatch('POST')
+
+        self.httpd = ThreadingHTTPServer((self.host, self.port), RequestHandler)
+        print(f"Сервис анализа зависимостей запущен: http://{self.host}:{self.port}")
+        print("Запросы: /analyze, /tree, /export, /statistics, /health, POST /cache/clear")
+        try:
+            self.httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\nСервис остановлен")
+        finally:
+            self.httpd.server_close()
+            # Пулы предзагрузки и разбора клиента не переживают сервис
+            self.repository_client.close()
+
+    def shutdown(self) -> None:
+        """Останавливает сервис из другого потока"""
+        if self.httpd:
+            self.httpd.shutdown()
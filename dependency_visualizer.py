@@ -2,19 +2,57 @@ import os
 import re
 import datetime
 import sys
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Iterator, List, Optional
 from yaml_parser import YAMLParser
 from config_error import ConfigError
 from network_error import NetworkError
 from dependency_analyzer import DependencyAnalyzer
+from repository_client import RepositoryClient
 from output_capture import OutputCapture
+from dependency_index import DependencyIndex
+from output_writer import OutputWriter
+from graph_statistics import GraphStatistics
 
 
 class DependencyVisualizer:
+    # Необязательные параметры конфигурации: имя -> (тип, значение по умолчанию)
+    OPTIONAL_PARAMETERS = {
+        'http_max_retries': (int, 3),             # Число повторов при временных сетевых ошибках
+        'http_rate_limit': (float, 10.0),         # Запросов в секунду к одному хосту (0 - без ограничения)
+        'http_failure_threshold': (int, 5),       # Ошибок подряд до размыкания цепи для хоста
+        'http_error_ttl': (float, 30.0),          # Секунд хранения ошибки в кеше
+        'http_reset_timeout': (float, 30.0),      # Секунд до пробного запроса к хосту с разомкнутой цепью
+        'time_budget': (float, 0.0),              # Бюджет времени анализа в секундах (0 - без ограничения)
+        'max_nodes': (int, 0),                    # Максимум анализируемых узлов (0 - без ограничения)
+        'progressive_output': (bool, False),      # Постепенное углубление с выводом каждого уровня
+        'parse_workers': (int, 0),                # Процессов для разбора ответов реестров и больших UPPERCASE файлов (0 - без пула)
+        'repository_mirrors': (str, ""),          # Зеркала реестра через запятую
+        'repository_type': (str, ""),             # Тип репозитория (npm, pypi, ...), если не определяется по URL
+        'output_chunk_size': (int, 0),            # Максимальный размер части выходного файла в байтах (0 - один файл)
+        'statistics_json': (bool, False),         # Сохранять статистику графа в JSON рядом с выходным файлом
+        'log_output': (bool, True),               # Дублировать вывод в файл лога visualizer_log_<время>.txt
+        'log_max_bytes': (int, 10 * 1024 * 1024), # Размер файла лога до ротации в байтах (0 - без ротации)
+        'log_backup_count': (int, 3),             # Сколько заполненных файлов лога хранить
+        'graph_store': (str, ""),                 # Файл SQLite для хранения графа на диске (пусто - в памяти)
+        'metadata_cache_limit': (int, 0),         # Максимум пакетов в кеше метаданных (0 - без ограничения)
+        'compare_version': (str, ""),             # Версия корня для сравнения графов с package_version
+        'metrics_file': (str, ""),                # Отчет о метриках запуска: <имя>.json и <имя>.prom
+        'result_cache': (bool, True),             # Переиспользовать графы и разрешенные узлы прошлых анализов на клиенте
+        'checkpoint_file': (str, ""),             # Журнал разрешенных узлов для продолжения прерванного анализа
+        'resume': (bool, False),                  # Продолжить анализ по журналу checkpoint_file
+    }
+    
     def __init__(self, config_path: str = "config.yaml"):
         self.config_path = config_path
         self.config: Dict[str, Any] = {}
-        #self.output_capture = None  создание файдов с логами
+        self.output_capture: Optional[OutputCapture] = None
+        self.analyzer: Optional[DependencyAnalyzer] = None
+        self.graph_store = None
+        self.metrics = None
+        self.checkpoint = None
+        # Клиент репозиториев запуска: создается при первом анализе, закрывается в конце run()
+        self.repository_client: Optional[RepositoryClient] = None
         self.load_config()
     
     def load_config(self) -> None:
@@ -51,6 +89,10 @@ class DependencyVisualizer:
             if param not in self.config:
                 raise ConfigError(f"Отсутствует обязательный параметр: {param}")
         
+        # Значения по умолчанию для необязательных параметров
+        for param, (_, default_value) in self.OPTIONAL_PARAMETERS.items():
+            self.config.setdefault(param, default_value)
+        
         # Валидация типов и значений
         self._validate_parameter_types()
         self._validate_parameter_values()
@@ -68,6 +110,9 @@ class DependencyVisualizer:
             'test_repository_mode': bool,
             'ascii_tree_output': bool
         }
+        for param, (expected_type, _) in self.OPTIONAL_PARAMETERS.items():
+            if param in self.config:
+                type_conversions[param] = expected_type
         
         for param, expected_type in type_conversions.items():
             try:
@@ -91,6 +136,11 @@ class DependencyVisualizer:
                         else:
                             raise ValueError(f"Не могу преобразовать в число: {self.config[param]}")
                 
+                elif expected_type == float:
+                    # Целые и строковые значения приводим к числу с плавающей точкой
+                    if isinstance(self.config[param], (int, str)) and not isinstance(self.config[param], bool):
+                        self.config[param] = float(self.config[param])
+                
                 # Проверяем итоговый тип
                 if not isinstance(self.config[param], expected_type):
                     raise ValueError(f"Ожидался тип {expected_type.__name__}")
@@ -115,6 +165,17 @@ class DependencyVisualizer:
         repo_url = self.config['repository_url']
         if not repo_url:
             raise ConfigError("URL репозитория не может быть пустым")
+        
+        # Проверка сетевых параметров
+        for param in ('http_max_retries', 'http_rate_limit', 'http_failure_threshold', 'http_error_ttl',
+                      'http_reset_timeout',
+                      'time_budget', 'max_nodes', 'parse_workers', 'output_chunk_size',
+                      'log_max_bytes', 'log_backup_count', 'metadata_cache_limit'):
+            if self.config.get(param, 0) < 0:
+                raise ConfigError(f"Параметр '{param}' не может быть отрицательным")
+        
+        if self.config.get('resume') and not self.config.get('checkpoint_file'):
+            raise ConfigError("Для продолжения анализа (resume) нужен параметр checkpoint_file")
     
     def display_config(self) -> None:
         """Вывод всех параметров конфигурации"""
@@ -127,32 +188,160 @@ class DependencyVisualizer:
         
         print("=" * 50)
     
-    def analyze_real_dependencies(self) -> Dict[str, Any]:
+    def create_repository_client(self) -> RepositoryClient:
+        """Создает клиент репозиториев с сетевыми параметрами из конфигурации"""
+        return RepositoryClient(http_options={
+            'max_retries': self.config['http_max_retries'],
+            'rate_limit': self.config['http_rate_limit'],
+            'failure_threshold': self.config['http_failure_threshold'],
+            'error_ttl': self.config['http_error_ttl'],
+            'reset_timeout': self.config['http_reset_timeout'],
+            'error_cache_limit': self.config['metadata_cache_limit'],
+        }, parse_workers=self.config['parse_workers'], mirrors=self.get_repository_mirrors(),
+           cache_limit=self.config['metadata_cache_limit'], metrics=self.metrics)
+    
+    def get_repository_client(self) -> RepositoryClient:
+        """Клиент репозиториев запуска (общий для всех анализов визуализатора)"""
+        if self.repository_client is None:
+            self.repository_client = self.create_repository_client()
+        return self.repository_client
+    
+    def close_repository_client(self) -> None:
+        """Останавливает пулы предзагрузки и разбора клиента запуска"""
+        if self.repository_client is not None:
+            self.repository_client.close()
+            self.repository_client = None
+    
+    def get_repository_mirrors(self) -> List[str]:
+        """Список зеркал реестра из конфигурации"""
+        return [mirror.strip() for mirror in self.config['repository_mirrors'].split(',') if mirror.strip()]
+    
+    def analyze_real_dependencies(self, repository_client: Optional[RepositoryClient] = None,
+                                  max_depth: Optional[int] = None,
+                                  time_budget: Optional[float] = None,
+                                  root_version: str = "latest") -> Dict[str, Any]:
         """Реальный анализ зависимостей"""
+        if max_depth is None:
+            max_depth = self.config['max_depth']
+        if time_budget is None:
+            time_budget = self.config['time_budget']
+        
         print(f"\nНачинаем анализ пакета: {self.config['package_name']}")
         print(f"Репозиторий: {self.config['repository_url']}")
-        print(f"Версия: {self.config['package_version']}")
-        print(f"Макс. глубина: {self.config['max_depth']}")
+        print(f"Версия: {self.config['package_version'] if root_version == 'latest' else root_version}")
+        print(f"Макс. глубина: {max_depth}")
         
         if self.config['filter_substring']:
             print(f"Фильтр: '{self.config['filter_substring']}'")
         
+        if self.config['graph_store']:
+            # Граф записывается на диск по мере анализа; предыдущее хранилище больше не нужно
+            from graph_store import GraphStore
+            self.close_graph_store()
+            self.graph_store = GraphStore(self.config['graph_store'])
+            print(f"Хранилище графа: {self.config['graph_store']}")
+        
+        repository_client = repository_client or self.get_repository_client()
+        
+        # Граф в хранилище на диске в памяти не кешируется
+        result_cache = None
+        if self.config['result_cache'] and self.graph_store is None:
+            result_cache = repository_client.result_cache
+            cached = self.get_cached_graph(result_cache, max_depth, root_version)
+            if cached is not None:
+                dependency_tree, self.analyzer = cached
+                print(f"Граф взят из кеша результатов: "
+                      f"{dependency_tree['name']}@{dependency_tree.get('version', 'unknown')}")
+                if self.metrics is not None:
+                    self.metrics.inc('result_cache_hits_total')
+                return dependency_tree
+        
+        # Таблица разрешенных узлов нужна журналу всегда: по ней продолжается анализ
+        node_cache = result_cache
+        if self.checkpoint is not None:
+            node_cache = repository_client.result_cache
+            restored = self.checkpoint.restore(node_cache)
+            if restored:
+                print(f"Восстановлено узлов из журнала: {restored}")
+        
         analyzer = DependencyAnalyzer(
-            max_depth=self.config['max_depth'],
-            filter_str=self.config['filter_substring']
+            max_depth=max_depth,
+            filter_str=self.config['filter_substring'],
+            repository_client=repository_client,
+            time_budget=time_budget,
+            max_nodes=self.config['max_nodes'],
+            repository_type=self.config['repository_type'],
+            graph_store=self.graph_store,
+            result_cache=node_cache,
+            checkpoint=self.checkpoint
         )
+        self.analyzer = analyzer
         
         dependency_tree = analyzer.analyze_package(
             package_name=self.config['package_name'],
-            version="latest",
+            version=root_version,
             repo_url=self.config['repository_url'],
             test_mode=self.config['test_repository_mode']
         )
         
+        if analyzer.truncation_reason:
+            print(f"\nАнализ остановлен: {analyzer.truncation_reason}. "
+                  f"Неисследованных узлов: {analyzer.truncated_nodes}")
+        
+        if analyzer.reused_nodes:
+            print(f"Узлов из кеша результатов: {analyzer.reused_nodes}, "
+                  f"загружено из репозитория: {analyzer.nodes_analyzed - analyzer.reused_nodes}")
+        
+        # Неполный граф (бюджет, ошибки сети) не кешируется: следующий анализ повторит загрузку
+        if result_cache is not None and not analyzer.truncation_reason and not analyzer.failed_nodes:
+            result_cache.put_graph(self.get_result_key(max_depth, dependency_tree.get('version', root_version)),
+                                   dependency_tree, analyzer)
+        
+        if self.metrics is not None and analyzer.started_at is not None:
+            self.metrics.record_analysis(analyzer, time.monotonic() - analyzer.started_at)
+        
+        if self.graph_store is not None:
+            self.graph_store.commit()
+        
         return dependency_tree
     
-    def display_ascii_tree(self, tree: Dict[str, Any], prefix: str = "", is_last: bool = True):
-        """Отображает ASCII-дерево зависимостей в консоль"""
+    def get_result_key(self, max_depth: int, root_version: str) -> tuple:
+        """Ключ графа в кеше результатов (версия корня - фактическая)"""
+        return (self.config['repository_type'], self.config['repository_url'],
+                self.config['test_repository_mode'], self.config['package_name'],
+                root_version, max_depth, self.config['filter_substring'])
+    
+    def get_cached_graph(self, result_cache, max_depth: int, root_version: str):
+        """(дерево, анализатор) из кеша результатов или None"""
+        # Запрошенная версия корня ("latest") сводится к фактической по разрешенным узлам
+        resolved = result_cache.resolved((self.config['repository_type'], self.config['repository_url'],
+                                          self.config['test_repository_mode'], self.config['package_name'],
+                                          root_version))
+        if resolved is None:
+            return None
+        return result_cache.get_graph(self.get_result_key(max_depth, resolved[0]))
+    
+    def open_checkpoint(self) -> None:
+        """Открывает журнал контрольной точки (при resume - с узлами прошлого запуска)"""
+        from checkpoint_journal import CheckpointJournal
+        self.checkpoint = CheckpointJournal(self.config['checkpoint_file'], self.config['resume'])
+        print(f"Журнал контрольной точки: {self.config['checkpoint_file']}")
+    
+    def close_checkpoint(self) -> None:
+        """Закрывает журнал (файл остается на диске для следующего resume)"""
+        if self.checkpoint is not None:
+            self.checkpoint.close()
+            self.checkpoint = None
+    
+    def close_graph_store(self) -> None:
+        """Закрывает хранилище графа (файл остается на диске)"""
+        if self.graph_store is not None:
+            self.graph_store.close()
+            self.graph_store = None
+    
+    @staticmethod
+    def format_tree_lines(tree: Dict[str, Any], prefix: str = "", is_last: bool = True) -> Iterator[str]:
+        """Построчно формирует ASCII-дерево зависимостей"""
         name = tree['name']
         version = tree.get('version', 'unknown')
         error = tree.get('error')
@@ -163,8 +352,10 @@ class DependencyVisualizer:
         
         if error:
             current_line += f" [ОШИБКА: {error}]"
+        if tree.get('truncated'):
+            current_line += " [УСЕЧЕНО]"
         
-        print(current_line)
+        yield current_line
         
         # Зависимости
         dependencies = tree.get('dependencies', {})
@@ -174,103 +365,262 @@ class DependencyVisualizer:
             
             for i, (dep_name, dep_tree) in enumerate(dependencies.items()):
                 is_last_dep = (i == dep_count - 1)
-                self.display_ascii_tree(dep_tree, new_prefix, is_last_dep)
+                yield from DependencyVisualizer.format_tree_lines(dep_tree, new_prefix, is_last_dep)
     
-    def save_tree_to_file(self, tree: Dict[str, Any]):
+    def analyze_progressively(self) -> Dict[str, Any]:
+        """Постепенное углубление: каждый уровень выводится сразу, уже полученные узлы берутся из кеша"""
+        repository_client = self.get_repository_client()
+        max_depth = self.config['max_depth']
+        time_budget = self.config['time_budget']
+        started_at = time.monotonic()
+        dependency_tree = None
         
-        try:
-            # Используем имя файла из конфига, если указано, иначе генерируем
-            if self.config['output_filename'] and self.config['output_filename'] != 'dependency_graph.txt':
-                output_file = self.config['output_filename']
-            else:
-                package_name = tree['name']
-                output_file = f"{package_name}_dependency_graph.txt"
+        for depth in range(1, max_depth + 1):
+            # Бюджет времени общий для всех уровней
+            remaining_budget = 0.0
+            if time_budget:
+                remaining_budget = time_budget - (time.monotonic() - started_at)
+                if remaining_budget <= 0 and dependency_tree is not None:
+                    print(f"\nБюджет времени исчерпан, углубление остановлено на уровне {depth - 1}")
+                    break
+                remaining_budget = max(remaining_budget, 0.001)
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                # Заголовок файла
-                f.write(f"ГРАФ ЗАВИСИМОСТЕЙ\n")
-                f.write(f"{'='*50}\n")
-                f.write(f"Пакет: {tree['name']}@{tree.get('version', 'unknown')}\n")
+            dependency_tree = self.analyze_real_dependencies(repository_client, depth, remaining_budget)
+            
+            if self.config['ascii_tree_output']:
+                print(f"\nДерево зависимостей для {self.config['package_name']} "
+                      f"(глубина {depth} из {max_depth}):")
+                self.display_ascii_tree(dependency_tree)
+            self.save_tree_to_file(dependency_tree)
+            
+            # Глубже графа нет или бюджет исчерпан - следующие уровни ничего не добавят
+            if not self.analyzer.depth_limit_reached or self.analyzer.truncation_reason:
+                break
+        
+        return dependency_tree
+    
+    def analyze_upgrade(self) -> Dict[str, Any]:
+        """Строит графы двух версий корня на общем клиенте и выводит разницу между ними"""
+        from upgrade_diff import GraphSummary, UpgradeDiff
+        
+        # Общий кеш метаданных: общие поддеревья второй раз загружаются и разбираются из кеша
+        repository_client = self.get_repository_client()
+        old_version = self.config['package_version']
+        new_version = self.config['compare_version']
+        
+        # Первый граф сводится к версиям и глубинам до построения второго
+        old_summary = GraphSummary(self.analyze_real_dependencies(repository_client, root_version=old_version))
+        new_tree = self.analyze_real_dependencies(repository_client, root_version=new_version)
+        
+        diff = UpgradeDiff(old_summary, GraphSummary(new_tree))
+        print(f"\n{'='*50}")
+        print(f"СРАВНЕНИЕ ВЕРСИЙ {self.config['package_name']}: {old_version} -> {new_version}")
+        print(f"{'='*50}")
+        for line in diff.format_lines():
+            print(line)
+        
+        self.save_upgrade_diff(diff, new_tree)
+        return new_tree
+    
+    def save_upgrade_diff(self, diff, tree: Dict[str, Any]) -> None:
+        """Сохраняет разницу версий: graph.txt -> graph.diff.txt и graph.diff.json"""
+        import json
+        
+        stem = self.get_output_stem(self.get_output_filename(tree))
+        try:
+            with open(f"{stem}.diff.txt", 'w', encoding='utf-8') as f:
+                f.write(f"СРАВНЕНИЕ ВЕРСИЙ {self.config['package_name']}\n")
                 f.write(f"Репозиторий: {self.config['repository_url']}\n")
-                f.write(f"Время генерации: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
                 f.write(f"Максимальная глубина: {self.config['max_depth']}\n")
-                
-                if self.config['filter_substring']:
-                    f.write(f"Фильтр: '{self.config['filter_substring']}'\n")
-                
-                f.write(f"{'='*50}\n\n")
-                
-                # Функция для рекурсивной записи дерева в файл
-                def write_tree_to_file(tree_node, prefix="", is_last=True):
-                    name = tree_node['name']
-                    version = tree_node.get('version', 'unknown')
-                    error = tree_node.get('error')
-                    
-                    connector = "└── " if is_last else "├── "
-                    line = f"{prefix}{connector}{name}@{version}"
-                    
-                    if error:
-                        line += f" [ОШИБКА: {error}]"
-                    
+                f.write(f"{'='*50}\n")
+                for line in diff.format_lines():
                     f.write(line + "\n")
-                    
-                    # Рекурсивно записываем зависимости
-                    dependencies = tree_node.get('dependencies', {})
-                    if dependencies:
-                        new_prefix = prefix + ("    " if is_last else "│   ")
-                        dep_count = len(dependencies)
-                        
-                        for i, (dep_name, dep_tree) in enumerate(dependencies.items()):
-                            is_last_dep = (i == dep_count - 1)
-                            write_tree_to_file(dep_tree, new_prefix, is_last_dep)
-                
-                # Записываем основное дерево
-                write_tree_to_file(tree)
-                
-                # Статистика
-                f.write(f"\n{'='*50}\n")
-                f.write("СТАТИСТИКА:\n")
-                
-                def count_dependencies(tree_node):
-                    total = 1  # текущий пакет
-                    for dep in tree_node.get('dependencies', {}).values():
-                        total += count_dependencies(dep)
-                    return total
-                
-                total_packages = count_dependencies(tree)
-                f.write(f"Всего пакетов в графе: {total_packages}\n")
-                f.write(f"Уровней вложенности: {self.config['max_depth']}\n")
+            with open(f"{stem}.diff.json", 'w', encoding='utf-8') as f:
+                json.dump(diff.to_dict(), f, ensure_ascii=False, indent=2)
+            print(f"\nСравнение версий сохранено в файл: {stem}.diff.txt")
+        except Exception as e:
+            print(f"Ошибка при сохранении сравнения {stem}.diff.txt: {e}")
+    
+    def display_ascii_tree(self, tree: Dict[str, Any], prefix: str = "", is_last: bool = True):
+        """Отображает ASCII-дерево зависимостей в консоль"""
+        for line in self.format_tree_lines(tree, prefix, is_last):
+            print(line)
+    
+    def format_report_lines(self, tree: Dict[str, Any],
+                            statistics: Optional[GraphStatistics] = None) -> Iterator[str]:
+        """Формирует полный отчет: заголовок, дерево и статистику (вычисляется, если не передана)"""
+        # Заголовок файла
+        yield f"ГРАФ ЗАВИСИМОСТЕЙ"
+        yield f"{'='*50}"
+        yield f"Пакет: {tree['name']}@{tree.get('version', 'unknown')}"
+        yield f"Репозиторий: {self.config['repository_url']}"
+        yield f"Время генерации: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        yield f"Максимальная глубина: {self.config['max_depth']}"
+        
+        if self.config['filter_substring']:
+            yield f"Фильтр: '{self.config['filter_substring']}'"
+        
+        yield f"{'='*50}\n"
+        
+        # Основное дерево
+        yield from self.format_tree_lines(tree)
+        
+        # Статистика
+        yield f"\n{'='*50}"
+        yield "СТАТИСТИКА:"
+        
+        yield from (statistics or GraphStatistics(tree)).format_lines()
+        
+        if self.analyzer and self.analyzer.truncation_reason:
+            yield f"Анализ остановлен: {self.analyzer.truncation_reason}"
+            yield f"Проанализировано узлов: {self.analyzer.nodes_analyzed}"
+            yield f"Неисследованных узлов (усечено): {self.analyzer.truncated_nodes}"
+    
+    def get_output_filename(self, tree: Dict[str, Any]) -> str:
+        """Имя файла вывода из конфига, если указано, иначе генерируется по имени пакета"""
+        if self.config['output_filename'] and self.config['output_filename'] != 'dependency_graph.txt':
+            return self.config['output_filename']
+        package_name = tree['name']
+        return f"{package_name}_dependency_graph.txt"
+    
+    @staticmethod
+    def get_output_stem(output_file: str) -> str:
+        """Имя файла вывода без расширений: graph.txt.gz -> graph"""
+        stem = output_file
+        for extension in ('.gz', '.xz', '.txt'):
+            if stem.lower().endswith(extension):
+                stem = stem[:-len(extension)]
+        return stem
+    
+    def save_statistics_json(self, tree: Dict[str, Any], output_file: str,
+                             statistics: Optional[GraphStatistics] = None) -> None:
+        """Сохраняет статистику графа в JSON: graph.txt -> graph.stats.json"""
+        import json
+        
+        stats_file = f"{self.get_output_stem(output_file)}.stats.json"
+        
+        with open(stats_file, 'w', encoding='utf-8') as f:
+            json.dump((statistics or GraphStatistics(tree)).to_dict(), f, ensure_ascii=False, indent=2)
+        print(f"Статистика графа сохранена в файл: {stats_file}")
+    
+    def save_tree_to_file(self, tree: Dict[str, Any]):
+        
+        output_file = self.get_output_filename(tree)
+        try:
+            # Статистика считается одним обходом графа для отчета и для JSON
+            statistics = GraphStatistics(tree)
+            
+            # Сжатие выбирается по расширению (.gz, .xz), большие отчеты делятся на части
+            with OutputWriter(output_file, self.config['output_chunk_size']) as writer:
+                for line in self.format_report_lines(tree, statistics):
+                    writer.write_line(line)
             
-            print(f"\nГраф зависимостей сохранен в файл: {output_file}")
+            if writer.chunks:
+                print(f"\nГраф зависимостей сохранен в {len(writer.chunks)} частях, индекс: {writer.output_path}")
+            else:
+                print(f"\nГраф зависимостей сохранен в файл: {output_file}")
+            
+            if self.config['statistics_json']:
+                self.save_statistics_json(tree, output_file, statistics)
             
         except Exception as e:
             print(f"Ошибка при сохранении файла {output_file}: {e}")
     
-    def run(self) -> None:
+    def display_index_queries(self, tree: Dict[str, Any], queries: Dict[str, str]) -> None:
+        """Отвечает на запросы к обратному индексу: кто зависит от пакета и как до него добраться"""
+        index = DependencyIndex(tree)
+        
+        for query_type, package_name in queries.items():
+            if not package_name:
+                continue
+            
+            if package_name not in index:
+                print(f"\nПакет {package_name} не найден в графе")
+                continue
+            
+            if query_type == 'reverse':
+                dependents = index.reverse_dependencies(package_name)
+                print(f"\nОт {package_name} зависят ({len(dependents)}), "
+                      f"глубина {index.depth[package_name]}:")
+                for dependent in dependents:
+                    print(f"  {dependent}")
+            elif query_type == 'paths':
+                paths = index.all_paths(package_name)
+                print(f"\nВсе пути от корня до {package_name} ({len(paths)}):")
+                for path in paths:
+                    print(f"  {' -> '.join(path)}")
+            elif query_type == 'shortest_path':
+                print(f"\nКратчайший путь до {package_name}:")
+                print(f"  {' -> '.join(index.shortest_path(package_name))}")
+    
+    def save_run_metrics(self, run_duration: float) -> None:
+        """Сохраняет метрики запуска в JSON и в текстовом формате Prometheus"""
+        if self.metrics is None:
+            return
+        try:
+            self.metrics.finalize(run_duration)
+            json_file, prom_file = self.metrics.save(self.config['metrics_file'])
+            print(f"Метрики запуска сохранены в файлы: {json_file}, {prom_file}")
+        except Exception as e:
+            print(f"Ошибка при сохранении метрик {self.config['metrics_file']}: {e}")
+    
+    def browse_tree(self, tree: Dict[str, Any]) -> None:
+        """Интерактивный просмотр дерева: на экран выводятся только видимые строки"""
+        from tree_viewer import browse_tree
+        browse_tree(tree, f"{tree['name']}@{tree.get('version', 'unknown')}")
+    
+    def run(self, index_queries: Optional[Dict[str, str]] = None, browse: bool = False) -> None:
         """Основной метод запуска приложения"""
+        run_started_at = time.monotonic()
         try:
-            # Создаем лог-файл с именем на основе текущего времени
-            #timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            #log_filename = f"visualizer_log_{timestamp}.txt"
+            if self.config['log_output']:
+                # Создаем лог-файл с именем на основе текущего времени
+                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+                log_filename = f"visualizer_log_{timestamp}.txt"
+                
+                # Начинаем захват вывода
+                self.output_capture = OutputCapture(log_filename, self.config['log_max_bytes'],
+                                                    self.config['log_backup_count'])
+                self.output_capture.start_capture()
             
-            # Начинаем захват вывода
-            #self.output_capture = OutputCapture(log_filename)
-            #self.output_capture.start_capture()
+            if self.config['metrics_file']:
+                from run_metrics import RunMetrics
+                self.metrics = RunMetrics()
             
             # Основная логика
             self.display_config()
             
-            # Реальный анализ зависимостей
-            dependency_tree = self.analyze_real_dependencies()
+            if self.config['checkpoint_file']:
+                self.open_checkpoint()
             
-            # Вывод результатов в консоль
-            if self.config['ascii_tree_output']:
-                print(f"\nДерево зависимостей для {self.config['package_name']}:")
-                self.display_ascii_tree(dependency_tree)
+            if self.config['compare_version']:
+                # Сравнение графов двух версий корня вместо построения одного графа
+                dependency_tree = self.analyze_upgrade()
+            elif self.config['progressive_output']:
+                # Каждый уровень выводится и сохраняется по мере углубления
+                dependency_tree = self.analyze_progressively()
+            else:
+                # Реальный анализ зависимостей
+                dependency_tree = self.analyze_real_dependencies()
+                
+                # Вывод результатов в консоль (при просмотре дерево откроется после сохранения)
+                if self.config['ascii_tree_output'] and not browse:
+                    print(f"\nДерево зависимостей для {self.config['package_name']}:")
+                    self.display_ascii_tree(dependency_tree)
+            
+            # Запросы к обратному индексу
+            if index_queries:
+                self.display_index_queries(dependency_tree, index_queries)
             
             # Сохранение графа в текстовый файл
-            self.save_tree_to_file(dependency_tree)
+            if not self.config['progressive_output'] and not self.config['compare_version']:
+                self.save_tree_to_file(dependency_tree)
+            
+            if browse:
+                self.browse_tree(dependency_tree)
             
+            if self.metrics is not None:
+                self.metrics.set('run_success', 1)
             print(f"\nАнализ завершен успешно!")
             
         except ConfigError as e:
@@ -282,7 +632,12 @@ class DependencyVisualizer:
         except Exception as e:
             print(f"Неожиданная ошибка: {e}", file=sys.stderr)
             sys.exit(1)
-        #finally:
+        finally:
+            self.save_run_metrics(time.monotonic() - run_started_at)
+            self.close_graph_store()
+            self.close_checkpoint()
+            self.close_repository_client()
             # Всегда останавливаем захват вывода
-            #if self.output_capture:
-                #self.output_capture.stop_capture()
\ No newline at end of file
+            if self.output_capture:
+                self.output_capture.stop_capture()
+                self.output_capture = None
\ No newline at end of file
@@ -0,0 +1,178 @@
+"""
+Статистика графа зависимостей, вычисляемая за один линейный проход
+"""
+
+import heapq
+from array import array
+from collections import Counter
+from typing import Dict, Any, List, Tuple
+
+
+class GraphStatistics:
+    """Статистика дерева зависимостей: узлы, глубины, поддеревья, ветвление, ошибки
+
+    Дерево один раз обходится в прямом порядке и раскладывается в плоские массивы
+    (родитель, глубина, число детей). Размеры поддеревьев затем считаются одним
+    обратным проходом по массиву: в прямом порядке потомки всегда идут после предка.
+    """
+
+    def __init__(self, tree: Dict[str, Any], top_subtrees: int = 5):
+        self.top_subtrees = top_subtrees
+
+        self.parent = array('l')
+        self.depth = array('l')
+        self.fan_out = array('l')
+        self.names: List[str] = []
+        self.versions: List[str] = []
+
+        self.error_counts: Counter = Counter()
+        self.truncated_nodes = 0
+        self.repeated_nodes = 0
+        # Пакет -> множество непосредственных родителей (для распределения входящих связей)
+        self.parents_by_name: Dict[str, set] = {}
+        self.unique_packages = set()
+
+        self._collect(tree)
+        self.subtree_size = self._subtree_sizes()
+
+    @staticmethod
+    def classify_error(error: str) -> str:
+        """Определяет тип ошибки по тексту сообщения"""
+        text = error.lower()
+        if 'timed out' in text or 'таймаут' in text or 'timeout' in text:
+            return 'timeout'
+        if 'ssl' in text or 'certificate' in text:
+            return 'ssl'
+        if 'http error' in text:
+            for word in text.replace(':', ' ').split():
+                if word.isdigit() and len(word) == 3:
+                    return f"http_{word}"
+            return 'http'
+        if 'недоступен' in text:
+            return 'host_unavailable'
+        if 'не найден' in text:
+            return 'not_found'
+        if 'неподдерживаемый' in text:
+            return 'unsupported'
+        return 'other'
+
+    def _collect(self, tree: Dict[str, Any]) -> None:
+        """Обход в прямом порядке с явным стеком: каждый узел посещается ровно один раз"""
+        stack: List[Tuple[Dict[str, Any], int, int]] = [(tree, -1, 0)]
+        while stack:
+            node, parent_index, node_depth = stack.pop()
+            index = len(self.names)
+            name = node['name']
+
+            dependencies = node.get('dependencies', {})
+            self.parent.append(parent_index)
+            self.depth.append(node_depth)
+            self.fan_out.append(len(dependencies))
+            version = node.get('version', 'unknown')
+            self.names.append(name)
+            self.versions.append(version)
+            self.unique_packages.add((name, version))
+
+            if parent_index >= 0:
+                self.parents_by_name.setdefault(name, set()).add(self.names[parent_index])
+            else:
+                self.parents_by_name.setdefault(name, set())
+
+            if node.get('error'):
+                self.error_counts[self.classify_error(str(node['error']))] += 1
+            if node.get('truncated'):
+                self.truncated_nodes += 1
+            if node.get('cached'):
+                self.repeated_nodes += 1
+
+            # Дети кладутся в обратном порядке, чтобы обход шел в порядке вывода дерева
+            for child in reversed(list(dependencies.values())):
+                stack.append((child, index, node_depth + 1))
+
+    def _subtree_sizes(self) -> array:
+        """Размер поддерева каждого узла одним обратным проходом"""
+        sizes = array('l', [1]) * len(self.names)
+        for index in range(len(self.names) - 1, 0, -1):
+            sizes[self.parent[index]] += sizes[index]
+        return sizes
+
+    @property
+    def total_nodes(self) -> int:
+        return len(self.names)
+
+    @property
+    def unique_names(self) -> int:
+        return len(self.parents_by_name)
+
+    @property
+    def max_depth(self) -> int:
+        return max(self.depth) if self.depth else 0
+
+    def depth_distribution(self) -> Dict[int, int]:
+        return dict(sorted(Counter(self.depth).items()))
+
+    def fan_out_histogram(self) -> Dict[int, int]:
+        return dict(sorted(Counter(self.fan_out).items()))
+
+    def fan_in_histogram(self) -> Dict[int, int]:
+        return dict(sorted(Counter(len(parents) for parents in self.parents_by_name.values()).items()))
+
+    def heaviest_subtrees(self) -> List[Tuple[str, str, int]]:
+        """Самые тяжелые поддеревья (без корня): (имя, версия, размер)
+
+        Пакет, встречающийся в графе несколько раз, учитывается один раз
+        с наибольшим из размеров его поддеревьев.
+        """
+        largest: Dict[Tuple[str, str], int] = {}
+        for index in range(1, len(self.names)):
+            key = (self.names[index], self.versions[index])
+            size = self.subtree_size[index]
+            if size > largest.get(key, 0):
+                largest[key] = size
+        heaviest = heapq.nlargest(self.top_subtrees, largest.items(), key=lambda item: item[1])
+        return [(name, version, size) for (name, version), size in heaviest]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Статистика в виде словаря для JSON"""
+        return {
+            'total_nodes': self.total_nodes,
+            'unique_packages': self.unique_names,
+            'unique_package_versions': len(self.unique_packages),
+            'repeated_nodes': self.repeated_nodes,
+            'truncated_nodes': self.truncated_nodes,
+            'max_depth': self.max_depth,
+            'depth_distribution': self.depth_distribution(),
+            'fan_out_histogram': self.fan_out_histogram(),
+            'fan_in_histogram': self.fan_in_histogram(),
+            'heaviest_subtrees': [
+                {'name': name, 'version': version, 'size': size}
+                for name, version, size in self.heaviest_subtrees()
+            ],
+            'errors_by_type': dict(self.error_counts),
+        }
+
+    def format_lines(self) -> List[str]:
+        """Статистика в виде строк для раздела СТАТИСТИКА"""
+        def histogram(values: Dict[int, int]) -> str:
+            return ", ".join(f"{key}: {count}" for key, count in values.items())
+
+        lines = [
+            f"Всего пакетов в графе: {self.total_nodes}",
+            f"Уникальных пакетов: {self.unique_names} (версий: {len(self.unique_packages)})",
+            f"Повторных узлов (поддерево выведено ранее): {self.repeated_nodes}, "
+            f"усеченных бюджетом: {self.truncated_nodes}",
+            f"Уровней вложенности: {self.max_depth}",
+            f"Распределение по глубине: {histogram(self.depth_distribution())}",
+            f"Исходящие связи (число зависимостей: пакетов): {histogram(self.fan_out_histogram())}",
+            f"Входящие связи (число родителей: пакетов): {histogram(self.fan_in_histogram())}",
+        ]
+
+        heaviest = self.heaviest_subtrees()
+        if heaviest:
+            lines.append("Самые большие поддеревья:")
+            lines.extend(f"  {name}@{version}: {size}" for name, version, size in heaviest)
+
+        if self.error_counts:
+            lines.append("Ошибки по типам: " + ", ".join(
+                f"{error_type}: {count}" for error_type, count in self.error_counts.most_common()))
+        return lines
@@ -0,0 +1,203 @@
+"""
+Хранилище графа зависимостей на диске (SQLite) для графов, не помещающихся в память
+"""
+
+import os
+import sqlite3
+from collections.abc import Mapping
+from typing import Any, Iterator, List, Optional, Tuple
+from config_error import ConfigError
+
+# Отметка хранилища в заголовке файла SQLite (PRAGMA application_id): "DVGS"
+APPLICATION_ID = 0x44564753
+SQLITE_HEADER = b"SQLite format 3\x00"
+# Смещение application_id в заголовке базы SQLite
+APPLICATION_ID_OFFSET = 68
+
+# Признаки узла в столбце flags
+FLAG_CACHED = 1
+FLAG_TRUNCATED = 2
+
+# (id, первый id поддерева, имя, версия, ошибка, признаки, число детей)
+NodeRow = Tuple[int, int, str, str, Optional[str], int, int]
+
+
+class StoredChildren(Mapping):
+    """Зависимости узла из хранилища: имя -> узел, читаются из базы при обращении"""
+
+    __slots__ = ('store', 'parent_id', 'count')
+
+    def __init__(self, store: 'GraphStore', parent_id: int, count: int):
+        self.store = store
+        self.parent_id = parent_id
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[str]:
+        return (node.name for node in self.values())
+
+    def __getitem__(self, name: str) -> 'StoredNode':
+        for node in self.values():
+            if node.name == name:
+                return node
+        raise KeyError(name)
+
+    def values(self) -> List['StoredNode']:
+        return [StoredNode(self.store, row) for row in self.store.children(self.parent_id)]
+
+    def items(self) -> List[Tuple[str, 'StoredNode']]:
+        return [(node.name, node) for node in self.values()]
+
+
+class StoredNode(Mapping):
+    """Узел графа из хранилища с интерфейсом словаря узла (name, version, dependencies, ...)
+
+    В памяти хранится только строка узла; дети читаются из базы при обращении
+    к dependencies, поэтому обход дерева держит в памяти лишь текущий путь.
+    """
+
+    __slots__ = ('store', 'node_id', 'first_id', 'name', 'version', 'error', 'flags', 'child_count')
+
+    def __init__(self, store: 'GraphStore', row: NodeRow):
+        self.store = store
+        (self.node_id, self.first_id, self.name, self.version,
+         self.error, self.flags, self.child_count) = row
+
+    def _keys(self) -> List[str]:
+        keys = ['name', 'version']
+        if self.error is not None:
+            keys.append('error')
+        keys.append('dependencies')
+        if self.flags & FLAG_CACHED:
+            keys.append('cached')
+        if self.flags & FLAG_TRUNCATED:
+            keys.append('truncated')
+        return keys
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'name':
+            return self.name
+        if key == 'version':
+            return self.version
+        if key == 'dependencies':
+            return StoredChildren(self.store, self.node_id, self.child_count)
+        if key == 'error' and self.error is not None:
+            return self.error
+        if key == 'cached' and self.flags & FLAG_CACHED:
+            return True
+        if key == 'truncated' and self.flags & FLAG_TRUNCATED:
+            return True
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def to_dict(self) -> dict:
+        """Полное дерево узла в виде вложенных словарей (только для небольших поддеревьев)"""
+        result = {key: self[key] for key in self._keys() if key != 'dependencies'}
+        result['dependencies'] = {name: child.to_dict() for name, child in self['dependencies'].items()}
+        return result
+
+
+class GraphStore:
+    """Граф зависимостей в SQLite: узлы записываются сразу по мере получения
+
+    Узлы нумеруются в обратном порядке обхода (дети раньше родителя), поэтому
+    поддерево занимает непрерывный диапазон номеров и удаляется одним запросом.
+    """
+
+    # Узлов между фиксациями транзакции
+    COMMIT_INTERVAL = 1000
+    # Страничный кеш SQLite в КиБ (отрицательное значение в PRAGMA cache_size)
+    CACHE_SIZE_KB = 16 * 1024
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        if os.path.exists(filename):
+            # Заменяется только хранилище прошлого анализа, а не случайно указанный чужой файл
+            if not self.is_graph_store(filename):
+                raise ConfigError(f"Файл {filename} существует и не является хранилищем графа; "
+                                  f"укажите другой graph_store или удалите файл")
+            os.remove(filename)
+
+        self.connection = sqlite3.connect(filename)
+        self.connection.execute(f"PRAGMA application_id = {APPLICATION_ID}")
+        # Хранилище временное: журнал и синхронизация с диском не нужны
+        self.connection.execute("PRAGMA journal_mode = OFF")
+        self.connection.execute("PRAGMA synchronous = OFF")
+        self.connection.execute(f"PRAGMA cache_size = -{self.CACHE_SIZE_KB}")
+        self.connection.execute(
+            "CREATE TABLE nodes ("
+            "id INTEGER PRIMARY KEY, first_id INTEGER, parent INTEGER, position INTEGER, "
+            "name TEXT, version TEXT, error TEXT, flags INTEGER, child_count INTEGER)"
+        )
+        self.connection.execute("CREATE INDEX nodes_parent ON nodes (parent, position)")
+
+        self.next_id = 1
+        self.uncommitted = 0
+
+    @staticmethod
+    def is_graph_store(filename: str) -> bool:
+        """Файл создан GraphStore (или пуст): проверяется отметка в заголовке SQLite"""
+        with open(filename, 'rb') as store_file:
+            header = store_file.read(APPLICATION_ID_OFFSET + 4)
+        if not header:
+            return True
+        return (header.startswith(SQLITE_HEADER) and len(header) == APPLICATION_ID_OFFSET + 4 and
+                int.from_bytes(header[APPLICATION_ID_OFFSET:], 'big') == APPLICATION_ID)
+
+    def add_node(self, name: str, version: str, children: List[StoredNode],
+                 error: Optional[str] = None, flags: int = 0) -> StoredNode:
+        """Записывает узел и привязывает к нему уже записанных детей"""
+        node_id = self.next_id
+        self.next_id += 1
+        first_id = min((child.first_id for child in children), default=node_id)
+
+        row = (node_id, first_id, name, version, error, flags, len(children))
+        self.connection.execute(
+            "INSERT INTO nodes (id, first_id, name, version, error, flags, child_count) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)", row
+        )
+        if children:
+            self.connection.executemany(
+                "UPDATE nodes SET parent = ?, position = ? WHERE id = ?",
+                [(node_id, position, child.node_id) for position, child in enumerate(children)]
+            )
+
+        self.uncommitted += 1
+        if self.uncommitted >= self.COMMIT_INTERVAL:
+            self.commit()
+        return StoredNode(self, row)
+
+    def delete_subtree(self, node: StoredNode) -> None:
+        """Удаляет узел вместе со всеми потомками"""
+        self.connection.execute("DELETE FROM nodes WHERE id BETWEEN ? AND ?", (node.first_id, node.node_id))
+
+    def delete_from(self, first_id: int) -> None:
+        """Удаляет все узлы, записанные начиная с указанного номера"""
+        if first_id < self.next_id:
+            self.connection.execute("DELETE FROM nodes WHERE id >= ?", (first_id,))
+
+    def children(self, parent_id: int) -> List[NodeRow]:
+        return self.connection.execute(
+            "SELECT id, first_id, name, version, error, flags, child_count "
+            "FROM nodes WHERE parent = ? ORDER BY position", (parent_id,)
+        ).fetchall()
+
+    def node_count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+
+    def commit(self) -> None:
+        self.connection.commit()
+        self.uncommitted = 0
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.commit()
+            self.connection.close()
+            self.connection = None
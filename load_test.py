@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный тест клиента репозиториев на локальном имитаторе реестра
+
+Запускает mock_registry_server.py в фоновом потоке, строит граф зависимостей
+через DependencyAnalyzer и выводит пропускную способность и задержки загрузок.
+"""
+
+import argparse
+import contextlib
+import os
+import threading
+import time
+from typing import List, Optional
+from dependency_analyzer import DependencyAnalyzer
+from graph_statistics import GraphStatistics
+from mock_registry_server import MockRegistryServer, add_corpus_arguments, build_corpus, build_faults
+from repository_client import RepositoryClient
+
+
+class TimedRepositoryClient(RepositoryClient):
+    """Клиент репозиториев, измеряющий каждую загрузку (с учетом повторов и зеркал)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fetch_latencies: List[float] = []
+        self.fetch_errors = 0
+        self.fetched_bytes = 0
+        self.stats_lock = threading.Lock()
+
+    def fetch_from_repository(self, base_url: str, path: str, mirrors: Optional[List[str]] = None) -> bytes:
+        started_at = time.perf_counter()
+        try:
+            data = super().fetch_from_repository(base_url, path, mirrors)
+        except Exception:
+            with self.stats_lock:
+                self.fetch_latencies.append(time.perf_counter() - started_at)
+                self.fetch_errors += 1
+            raise
+
+        with self.stats_lock:
+            self.fetch_latencies.append(time.perf_counter() - started_at)
+            self.fetched_bytes += len(data)
+        return data
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Перцентиль методом ближайшего ранга"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(fraction * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def run_load_test(args) -> None:
+    corpus = build_corpus(args)
+    server = MockRegistryServer(corpus, build_faults(args))
+    url = server.start()
+    root = args.root or next(iter(corpus.packages))
+
+    client = TimedRepositoryClient(http_options={
+        'max_retries': args.max_retries,
+        'rate_limit': 0,
+        'failure_threshold': args.failure_threshold,
+        'error_ttl': 0,
+        'backoff_base': args.backoff,
+    }, parse_workers=args.parse_workers)
+    analyzer = DependencyAnalyzer(max_depth=args.max_depth, repository_client=client,
+                                  repository_type=args.repository)
+
+    print(f"Имитатор: {url} ({args.repository}, пакетов: {len(corpus.packages)})")
+    print(f"Корень: {root}, глубина: {args.max_depth}, процессов разбора: {args.parse_workers}")
+
+    started_at = time.perf_counter()
+    # Построчный вывод анализатора искажает замер
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        tree = analyzer.analyze_package(root, "latest", url)
+    elapsed = time.perf_counter() - started_at
+
+    client.close()
+    server.shutdown()
+
+    latencies = sorted(client.fetch_latencies)
+    fetches = len(latencies)
+    statistics = GraphStatistics(tree)
+
+    print("=" * 50)
+    print("РЕЗУЛЬТАТЫ НАГРУЗОЧНОГО ТЕСТА")
+    print("=" * 50)
+    print(f"Время: {elapsed:.2f} с")
+    print(f"Узлов в графе: {statistics.total_nodes} ({statistics.total_nodes / elapsed:.1f} узлов/с)")
+    print(f"Загрузок: {fetches} ({fetches / elapsed:.1f} загрузок/с), ошибок: {client.fetch_errors}")
+    print(f"Получено: {client.fetched_bytes / 1024:.1f} КиБ ({client.fetched_bytes / 1024 / elapsed:.1f} КиБ/с)")
+    if latencies:
+        print("Задержка загрузки, мс: " + ", ".join(
+            f"p{int(fraction * 100)}={percentile(latencies, fraction) * 1000:.1f}"
+            for fraction in (0.5, 0.9, 0.95, 0.99)
+        ) + f", max={latencies[-1] * 1000:.1f}")
+    print("Сервер: " + ", ".join(f"{key}={value}" for key, value in server.stats.items()))
+    if statistics.error_counts:
+        print("Ошибки в графе: " + ", ".join(
+            f"{error_type}: {count}" for error_type, count in statistics.error_counts.most_common()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный тест клиента репозиториев на имитаторе реестра")
+    add_corpus_arguments(parser)
+    parser.add_argument('--repository', choices=('npm', 'pypi'), default='npm', help="Формат реестра")
+    parser.add_argument('--root', help="Корневой пакет (по умолчанию первый пакет корпуса)")
+    parser.add_argument('--max-depth', type=int, default=5, help="Глубина анализа")
+    parser.add_argument('--parse-workers', type=int, default=0, help="Процессов разбора (параметр parse_workers)")
+    parser.add_argument('--max-retries', type=int, default=3, help="Повторов при временных ошибках")
+    parser.add_argument('--failure-threshold', type=int, default=0,
+                        help="Ошибок подряд до размыкания цепи (0 - размыкатель выключен)")
+    parser.add_argument('--backoff', type=float, default=0.05, help="Базовая задержка повтора, с")
+    run_load_test(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import os
+from typing import Dict, Any, Optional
+from repository_backends import RepositoryBackend
+
+
+class LocalBackend(RepositoryBackend):
+    """Бэкенд локального каталога: информация о пакетах не загружается"""
+
+    kind = "local"
+
+    @classmethod
+    def matches(cls, repo_url: str) -> bool:
+        """Относительный путь, существующий каталог или строка без схемы URL"""
+        if repo_url.startswith('./') or repo_url.startswith('../'):
+            return True
+        if repo_url.startswith('http://') or repo_url.startswith('https://'):
+            return False
+        if '/' in repo_url or '\\' in repo_url:
+            if os.path.exists(os.path.normpath(repo_url)):
+                return True
+        return ':' not in repo_url or (len(repo_url) > 2 and repo_url[1:3] == ':\\')
+
+    def fetch(self, package_name: str, version: str = "latest",
+              repo_url: str = "", test_mode: bool = False) -> Optional[Dict[str, Any]]:
+        return None
@@ -4,10 +4,29 @@
 """
 
 import os
-import sys
+import argparse
 from dependency_visualizer import DependencyVisualizer
 
 
+def parse_arguments():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(description="Визуализатор графа зависимостей")
+    parser.add_argument('config_file', nargs='?', default=None,
+                        help="Путь к конфигурационному файлу (по умолчанию config.yaml)")
+    parser.add_argument('--serve', action='store_true',
+                        help="Запустить локальный сервис анализа с прогретыми кешами")
+    parser.add_argument('--host', default="127.0.0.1", help="Адрес сервиса (по умолчанию 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="Порт сервиса (по умолчанию 8765)")
+    parser.add_argument('--reverse', metavar='PACKAGE',
+                        help="Показать пакеты, непосредственно зависящие от PACKAGE")
+    parser.add_argument('--paths', metavar='PACKAGE',
+                        help="Показать все пути от корня до PACKAGE")
+    parser.add_argument('--shortest-path', metavar='PACKAGE',
+                        help="Показать кратчайший путь от корня до PACKAGE")
+    parser.add_argument('--browse', action='store_true',
+                        help="Интерактивный просмотр дерева вместо полного вывода в консоль")
+    return parser.parse_args()
+
 
 def main():
     """Точка входа в приложение"""
@@ -16,17 +35,29 @@ def main():
         print("Конфигурационный файл не найден.")
         print("Запустите программу снова для использования созданного конфигурационного файла.")
         return
-    
+
     # Проверяем аргументы командной строки
+    args = parse_arguments()
     config_file = "config.yaml"
-    if len(sys.argv) > 1:
-        config_file = sys.argv[1]
+    if args.config_file:
+        config_file = args.config_file
         print(f"Используется конфигурационный файл: {config_file}")
-    
+
     # Создаем и запускаем визуализатор
     visualizer = DependencyVisualizer(config_file)
-    visualizer.run()
+
+    if args.serve:
+        # Сервис импортируется только при необходимости
+        from dependency_server import DependencyServer
+        DependencyServer(visualizer, args.host, args.port).serve_forever()
+        return
+
+    visualizer.run(index_queries={
+        'reverse': args.reverse,
+        'paths': args.paths,
+        'shortest_path': args.shortest_path,
+    }, browse=args.browse)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,317 @@
+import re
+import threading
+from concurrent.futures import Future
+import xml.etree.ElementTree as ElementTree
+from typing import Dict, Any, List, Optional, Tuple
+from network_error import NetworkError
+from repository_backends import RepositoryBackend
+
+# Координаты артефакта: (groupId, artifactId, version)
+Coordinate = Tuple[str, str, str]
+
+PROPERTY_PATTERN = re.compile(r'\$\{([^}]+)\}')
+VERSION_TOKEN_PATTERN = re.compile(r'[\w.\-]+')
+
+# Области видимости, попадающие в граф времени выполнения
+RUNTIME_SCOPES = ('', 'compile', 'runtime')
+
+
+class MavenModel:
+    """Эффективная модель POM: свойства, управляемые версии и зависимости с учетом родителей"""
+
+    def __init__(self, coordinate: Coordinate):
+        self.coordinate = coordinate
+        self.properties: Dict[str, str] = {}
+        # (groupId, artifactId) -> (версия, область видимости)
+        self.managed: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        # (groupId, artifactId) -> (версия, область видимости, optional)
+        self.dependencies: Dict[Tuple[str, str], Tuple[str, str, bool]] = {}
+
+
+class MavenBackend(RepositoryBackend):
+    """Бэкенд репозитория Maven: разбор POM с родителями, BOM и подстановкой свойств
+
+    Имя пакета задается как groupId:artifactId. Модели родительских POM и BOM
+    кешируются, так как их разделяют многие артефакты.
+    """
+
+    kind = "maven"
+    remote = True
+    # POM небольшие, поэтому соседние зависимости загружаются параллельно даже без пула разбора
+    prefetch_workers = 8
+
+    DEFAULT_REPOSITORY = "https://repo1.maven.org/maven2"
+    MAX_PARENT_DEPTH = 20
+
+    def __init__(self, client):
+        super().__init__(client)
+        self.models: Dict[Coordinate, MavenModel] = {}
+        self.latest_versions: Dict[Tuple[str, str], str] = {}
+        self.interpolations: Dict[Tuple[Coordinate, str], str] = {}
+        # Модели, которые сейчас загружаются: координаты -> (будущий результат, поток-загрузчик)
+        self.pending: Dict[Coordinate, Tuple[Future, int]] = {}
+        # Поток -> координаты модели, загрузки которой он ждет (для обнаружения циклов)
+        self.waiting: Dict[int, Coordinate] = {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def matches(cls, repo_url: str) -> bool:
+        return 'maven.org' in repo_url
+
+    @classmethod
+    def registry_base(cls, repo_url: str) -> str:
+        if not repo_url:
+            return cls.DEFAULT_REPOSITORY
+        return repo_url.rstrip('/')
+
+    @staticmethod
+    def split_name(package_name: str) -> Tuple[str, str]:
+        """groupId:artifactId -> (groupId, artifactId)"""
+        parts = package_name.split(':')
+        if len(parts) < 2 or not parts[0] or not parts[1]:
+            raise NetworkError(f"Имя Maven пакета должно иметь вид groupId:artifactId: {package_name}")
+        return parts[0], parts[1]
+
+    @staticmethod
+    def _local_name(tag: str) -> str:
+        """Имя XML-элемента без пространства имен"""
+        return tag.rsplit('}', 1)[-1]
+
+    @classmethod
+    def _child(cls, element, name: str):
+        if element is None:
+            return None
+        for child in element:
+            if cls._local_name(child.tag) == name:
+                return child
+        return None
+
+    @classmethod
+    def _children(cls, element, name: str) -> List[Any]:
+        if element is None:
+            return []
+        return [child for child in element if cls._local_name(child.tag) == name]
+
+    @classmethod
+    def _text(cls, element, name: str) -> str:
+        child = cls._child(element, name)
+        return (child.text or "").strip() if child is not None else ""
+
+    def _fetch_xml(self, repo_url: str, path: str):
+        raw = self.fetch_from_registry(repo_url, path)
+        try:
+            return ElementTree.fromstring(raw)
+        except ElementTree.ParseError as e:
+            raise NetworkError(f"Ошибка разбора XML {path}: {e}")
+
+    def resolve_latest_version(self, group_id: str, artifact_id: str, repo_url: str) -> str:
+        """Последняя версия артефакта из maven-metadata.xml"""
+        key = (group_id, artifact_id)
+        if key in self.latest_versions:
+            return self.latest_versions[key]
+
+        path = f"/{group_id.replace('.', '/')}/{artifact_id}/maven-metadata.xml"
+        versioning = self._child(self._fetch_xml(repo_url, path), 'versioning')
+        version = self._text(versioning, 'release') or self._text(versioning, 'latest')
+        if not version:
+            versions = self._children(self._child(versioning, 'versions'), 'version')
+            if versions:
+                version = (versions[-1].text or "").strip()
+        if not version:
+            raise NetworkError(f"Не удалось определить последнюю версию {group_id}:{artifact_id}")
+
+        self.latest_versions[key] = version
+        return version
+
+    def _interpolate(self, model: MavenModel, value: str) -> str:
+        """Подставляет ${свойства}; результат запоминается для пары (модель, строка)"""
+        if not value or '${' not in value:
+            return value
+
+        memo_key = (model.coordinate, value)
+        cached = self.interpolations.get(memo_key)
+        if cached is not None:
+            return cached
+
+        result = value
+        # Свойства могут ссылаться друг на друга - подставляем до неподвижной точки
+        for _ in range(10):
+            substituted = PROPERTY_PATTERN.sub(
+                lambda match: model.properties.get(match.group(1), match.group(0)), result
+            )
+            if substituted == result:
+                break
+            result = substituted
+
+        self.interpolations[memo_key] = result
+        return result
+
+    def load_model(self, coordinate: Coordinate, repo_url: str, depth: int = 0) -> MavenModel:
+        """Строит (или берет из кеша) эффективную модель POM
+
+        Общий родитель или BOM соседних артефактов загружается один раз:
+        остальные потоки ждут результата первой загрузки.
+        """
+        thread_id = threading.get_ident()
+        with self.lock:
+            model = self.models.get(coordinate)
+            if model is not None:
+                return model
+            pending = self.pending.get(coordinate)
+            if pending is None:
+                future = Future()
+                self.pending[coordinate] = (future, thread_id)
+            else:
+                future = pending[0]
+                self._check_wait_cycle(coordinate, thread_id)
+                self.waiting[thread_id] = coordinate
+
+        if pending is not None:
+            try:
+                return future.result()
+            finally:
+                with self.lock:
+                    self.waiting.pop(thread_id, None)
+
+        try:
+            # Готовая модель попадает в self.models до снятия отметки о загрузке
+            model = self._build_model(coordinate, repo_url, depth)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.pending.pop(coordinate, None)
+        future.set_result(model)
+        return model
+
+    def _check_wait_cycle(self, coordinate: Coordinate, thread_id: int) -> None:
+        """Ожидание загрузки, которая (через цепочку ожиданий) ждет текущий поток, - цикл POM (под self.lock)"""
+        current = coordinate
+        while current in self.pending:
+            owner = self.pending[current][1]
+            if owner == thread_id:
+                raise NetworkError(f"Циклическая ссылка между POM: {':'.join(coordinate)}")
+            current = self.waiting.get(owner)
+
+    def _build_model(self, coordinate: Coordinate, repo_url: str, depth: int) -> MavenModel:
+        """Загружает POM и строит эффективную модель с учетом родителей и BOM"""
+        if depth > self.MAX_PARENT_DEPTH:
+            raise NetworkError(f"Слишком глубокая цепочка родительских POM: {':'.join(coordinate)}")
+
+        group_id, artifact_id, version = coordinate
+        path = f"/{group_id.replace('.', '/')}/{artifact_id}/{version}/{artifact_id}-{version}.pom"
+        project = self._fetch_xml(repo_url, path)
+
+        model = MavenModel(coordinate)
+
+        # Родительский POM: свойства, управляемые версии и зависимости наследуются
+        parent_element = self._child(project, 'parent')
+        parent_version = ""
+        parent_managed = {}
+        if parent_element is not None:
+            parent_coordinate = (
+                self._text(parent_element, 'groupId'),
+                self._text(parent_element, 'artifactId'),
+                self._text(parent_element, 'version'),
+            )
+            parent_version = parent_coordinate[2]
+            parent = self.load_model(parent_coordinate, repo_url, depth + 1)
+            model.properties.update(parent.properties)
+            parent_managed = parent.managed
+            model.dependencies.update(parent.dependencies)
+
+        for properties in self._children(project, 'properties'):
+            for prop in properties:
+                model.properties[self._local_name(prop.tag)] = (prop.text or "").strip()
+
+        model.properties.update({
+            'project.groupId': group_id,
+            'project.artifactId': artifact_id,
+            'project.version': version,
+            'pom.groupId': group_id,
+            'pom.version': version,
+            'version': version,
+            'project.parent.version': parent_version,
+        })
+
+        # Управляемые версии по приоритету, как в Maven: собственные записи,
+        # затем импортированные BOM (первый объявленный важнее), затем родитель
+        management = self._child(self._child(project, 'dependencyManagement'), 'dependencies')
+        own_managed = {}
+        for dependency in self._children(management, 'dependency'):
+            dep_group = self._interpolate(model, self._text(dependency, 'groupId'))
+            dep_artifact = self._interpolate(model, self._text(dependency, 'artifactId'))
+            dep_version = self._interpolate(model, self._text(dependency, 'version'))
+            dep_scope = self._text(dependency, 'scope')
+
+            if dep_scope == 'import' and self._text(dependency, 'type') == 'pom':
+                bom = self.load_model((dep_group, dep_artifact, dep_version), repo_url, depth + 1)
+                for key, managed in bom.managed.items():
+                    model.managed.setdefault(key, managed)
+            else:
+                own_managed[(dep_group, dep_artifact)] = (dep_version, dep_scope)
+        model.managed.update(own_managed)
+        for key, managed in parent_managed.items():
+            model.managed.setdefault(key, managed)
+
+        dependencies = self._child(project, 'dependencies')
+        for dependency in self._children(dependencies, 'dependency'):
+            dep_group = self._interpolate(model, self._text(dependency, 'groupId'))
+            dep_artifact = self._interpolate(model, self._text(dependency, 'artifactId'))
+            dep_version = self._interpolate(model, self._text(dependency, 'version'))
+            dep_scope = self._text(dependency, 'scope')
+            optional = self._text(dependency, 'optional').lower() == 'true'
+            model.dependencies[(dep_group, dep_artifact)] = (dep_version, dep_scope, optional)
+
+        with self.lock:
+            self.models[coordinate] = model
+        return model
+
+    @staticmethod
+    def _concrete_version(version: str) -> str:
+        """Из диапазона версий ([1.0,2.0), (,1.5]) берется первая указанная граница"""
+        if version and version[0] in '[(':
+            match = VERSION_TOKEN_PATTERN.search(version)
+            return match.group(0) if match else ""
+        return version
+
+    def fetch(self, package_name: str, version: str = "latest",
+              repo_url: str = "", test_mode: bool = False) -> Dict[str, Any]:
+        """Получает информацию о Maven артефакте и его зависимостях времени выполнения"""
+        try:
+            group_id, artifact_id = self.split_name(package_name)
+            version = self._concrete_version(version)
+            if not version or version == "latest":
+                version = self.resolve_latest_version(group_id, artifact_id, repo_url)
+
+            model = self.load_model((group_id, artifact_id, version), repo_url)
+
+            dependencies = {}
+            for (dep_group, dep_artifact), (dep_version, dep_scope, optional) in model.dependencies.items():
+                managed_version, managed_scope = model.managed.get((dep_group, dep_artifact), ("", ""))
+                scope = dep_scope or managed_scope
+                if optional or scope not in RUNTIME_SCOPES:
+                    continue
+                dep_version = self._interpolate(model, dep_version or managed_version) or "latest"
+                dependencies[f"{dep_group}:{dep_artifact}"] = dep_version
+
+            return {
+                "name": package_name,
+                "version": version,
+                "dependencies": dependencies
+            }
+
+        except NetworkError:
+            raise
+        except Exception as e:
+            raise NetworkError(f"Ошибка получения Maven пакета {package_name}: {e}")
+
+    def extract_dependencies(self, package_info: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        return dict((package_info or {}).get('dependencies', {}))
+
+    def clear_cache(self) -> None:
+        with self.lock:
+            self.models.clear()
+            self.latest_versions.clear()
+            self.interpolations.clear()
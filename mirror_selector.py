@@ -0,0 +1,85 @@
+"""
+Выбор зеркала репозитория по задержке и доле ошибок
+"""
+
+import threading
+import time
+from typing import Dict, List
+
+
+class MirrorStats:
+    """Скользящие оценки задержки и доли ошибок одного зеркала"""
+
+    def __init__(self):
+        self.latency = None          # Сглаженная задержка успешных запросов, секунды
+        self.error_rate = 0.0        # Сглаженная доля ошибок
+        self.requests = 0
+        self.failed_until = 0.0      # До этого момента зеркало считается нездоровым
+
+
+class MirrorSelector:
+    """Направляет запросы на самое быстрое исправное зеркало"""
+
+    def __init__(self, smoothing: float = 0.3, unhealthy_error_rate: float = 0.5,
+                 cooldown: float = 30.0):
+        self.smoothing = smoothing
+        self.unhealthy_error_rate = unhealthy_error_rate
+        self.cooldown = cooldown
+        self.stats: Dict[str, MirrorStats] = {}
+        self.lock = threading.Lock()
+
+    def _stats(self, mirror: str) -> MirrorStats:
+        if mirror not in self.stats:
+            self.stats[mirror] = MirrorStats()
+        return self.stats[mirror]
+
+    def _is_healthy(self, stats: MirrorStats, now: float) -> bool:
+        """Зеркало исправно, если доля ошибок невелика или истекла пауза после сбоев (под self.lock)"""
+        return stats.error_rate < self.unhealthy_error_rate or now >= stats.failed_until
+
+    def is_healthy(self, mirror: str) -> bool:
+        with self.lock:
+            return self._is_healthy(self._stats(mirror), time.monotonic())
+
+    def order(self, mirrors: List[str]) -> List[str]:
+        """Порядок перебора зеркал: исправные по возрастанию задержки, затем остальные.
+        Зеркала без замеров идут первыми среди исправных, чтобы получить для них оценку."""
+        # Оценки всех зеркал снимаются одним захватом блокировки, затем сортируются
+        now = time.monotonic()
+        with self.lock:
+            keys = []
+            for position, mirror in enumerate(mirrors):
+                stats = self._stats(mirror)
+                latency = stats.latency if stats.latency is not None else 0.0
+                keys.append((not self._is_healthy(stats, now), latency, position))
+        return [mirrors[position] for _, _, position in sorted(keys)]
+
+    def record_success(self, mirror: str, latency: float) -> None:
+        with self.lock:
+            stats = self._stats(mirror)
+            stats.requests += 1
+            if stats.latency is None:
+                stats.latency = latency
+            else:
+                stats.latency += self.smoothing * (latency - stats.latency)
+            stats.error_rate -= self.smoothing * stats.error_rate
+
+    def record_failure(self, mirror: str) -> None:
+        with self.lock:
+            stats = self._stats(mirror)
+            stats.requests += 1
+            stats.error_rate += self.smoothing * (1.0 - stats.error_rate)
+            if stats.error_rate >= self.unhealthy_error_rate:
+                stats.failed_until = time.monotonic() + self.cooldown
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Текущие оценки по всем зеркалам"""
+        with self.lock:
+            return {
+                mirror: {
+                    'latency': stats.latency if stats.latency is not None else -1.0,
+                    'error_rate': stats.error_rate,
+                    'requests': stats.requests,
+                }
+                for mirror, stats in self.stats.items()
+            }
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Локальный имитатор реестров NPM и PyPI для нагрузочных тестов
+
+Отдает документы в форматах NPM (packument) и PyPI JSON из сгенерированного
+или сохраненного корпуса и умеет вносить задержку, ограничение пропускной
+способности, ошибки сервера и обрывы соединения.
+"""
+
+import argparse
+import json
+import random
+import re
+import socket
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse, unquote
+
+
+class RegistryCorpus:
+    """Корпус пакетов: имя -> {version, dependencies: {имя: требование версии}}"""
+
+    def __init__(self, packages: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.packages: Dict[str, Dict[str, Any]] = packages or {}
+        # PyPI отвечает на любое написание имени (pkg_a, PKG.A -> pkg-a)
+        self.canonical_names = {self.canonical_name(name): name for name in self.packages}
+
+    @staticmethod
+    def canonical_name(name: str) -> str:
+        return re.sub(r'[-_.]+', '-', name).lower()
+
+    @classmethod
+    def generate(cls, package_count: int = 1000, fan_out: int = 5, seed: int = 1,
+                 payload_versions: int = 20) -> 'RegistryCorpus':
+        """Случайный ацикличный граф: пакет зависит только от пакетов с большими номерами
+
+        payload_versions - число старых версий в документе, чтобы размер ответа
+        был похож на настоящий реестр.
+        """
+        generator = random.Random(seed)
+        width = len(str(package_count))
+        names = [f"pkg-{index:0{width}d}" for index in range(package_count)]
+
+        packages = {}
+        for index, name in enumerate(names):
+            candidates = names[index + 1:]
+            count = min(len(candidates), generator.randint(0, fan_out * 2))
+            # Ближайшие пакеты выбираются чаще - граф получается глубоким, а не плоским
+            window = candidates[:max(count, fan_out * 20)]
+            dependencies = {dep: "1.0.0" for dep in generator.sample(window, min(count, len(window)))}
+            packages[name] = {
+                "version": "1.0.0",
+                "dependencies": dependencies,
+                "history": payload_versions,
+            }
+        return cls(packages)
+
+    @classmethod
+    def load(cls, filename: str) -> 'RegistryCorpus':
+        with open(filename, 'r', encoding='utf-8') as corpus_file:
+            return cls(json.load(corpus_file))
+
+    def save(self, filename: str) -> None:
+        with open(filename, 'w', encoding='utf-8') as corpus_file:
+            json.dump(self.packages, corpus_file, ensure_ascii=False)
+
+    @staticmethod
+    def _history(package: Dict[str, Any]):
+        return [f"0.{minor}.0" for minor in range(package.get("history", 0))]
+
+    def npm_document(self, name: str) -> Optional[Dict[str, Any]]:
+        """Документ пакета в формате NPM (packument)"""
+        package = self.packages.get(name)
+        if package is None:
+            return None
+        latest = package["version"]
+        versions = {
+            old_version: {"name": name, "version": old_version, "dependencies": {}}
+            for old_version in self._history(package)
+        }
+        versions[latest] = {
+            "name": name,
+            "version": latest,
+            "dependencies": {dep: f"^{spec}" for dep, spec in package["dependencies"].items()},
+        }
+        return {"name": name, "dist-tags": {"latest": latest}, "versions": versions}
+
+    def pypi_document(self, name: str) -> Optional[Dict[str, Any]]:
+        """Документ проекта в формате PyPI JSON API"""
+        name = self.canonical_names.get(self.canonical_name(name), name)
+        package = self.packages.get(name)
+        if package is None:
+            return None
+        latest = package["version"]
+        releases = {old_version: [] for old_version in self._history(package)}
+        releases[latest] = []
+        return {
+            "info": {
+                "name": name,
+                "version": latest,
+                "requires_dist": [f"{dep}>={spec}" for dep, spec in package["dependencies"].items()] or None,
+            },
+            "releases": releases,
+        }
+
+
+class FaultSettings:
+    """Параметры внесения сбоев"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, bandwidth: int = 0,
+                 error_rate: float = 0.0, reset_rate: float = 0.0, seed: Optional[int] = None):
+        self.latency = latency          # Задержка перед ответом, с
+        self.jitter = jitter            # Случайная добавка к задержке, с
+        self.bandwidth = bandwidth      # Байт в секунду на соединение (0 - без ограничения)
+        self.error_rate = error_rate    # Доля ответов 503
+        self.reset_rate = reset_rate    # Доля соединений, обрываемых без ответа
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def roll(self) -> float:
+        with self.lock:
+            return self.random.random()
+
+    def delay(self) -> float:
+        if not self.jitter:
+            return self.latency
+        with self.lock:
+            return self.latency + self.random.uniform(0, self.jitter)
+
+
+class MockRegistryServer:
+    """HTTP-имитатор реестров NPM (/<имя>) и PyPI (/pypi/<имя>/json, /<имя>/json)"""
+
+    CHUNK_SIZE = 16 * 1024
+
+    def __init__(self, corpus: RegistryCorpus, faults: Optional[FaultSettings] = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.corpus = corpus
+        self.faults = faults or FaultSettings()
+        self.host = host
+        self.port = port
+        self.httpd = None
+        self.thread = None
+        # Счетчики обработанных запросов
+        self.stats = {"requests": 0, "not_found": 0, "errors_injected": 0, "resets_injected": 0, "bytes_sent": 0}
+        self.lock = threading.Lock()
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self.lock:
+            self.stats[key] += amount
+
+    def document(self, path: str) -> Optional[Dict[str, Any]]:
+        """Документ по пути запроса: формат PyPI определяется окончанием /json"""
+        path = unquote(urlparse(path).path).strip('/')
+        if path.endswith('/json'):
+            name = path[:-len('/json')]
+            if name.startswith('pypi/'):
+                name = name[len('pypi/'):]
+            return self.corpus.pypi_document(name)
+        return self.corpus.npm_document(path)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def _create_handler(self):
+        server = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _reset_connection(self):
+                # SO_LINGER с нулевым таймаутом: закрытие отправляет RST вместо FIN
+                self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+                self.close_connection = True
+                self.connection.close()
+
+            def _send(self, status: int, payload: bytes):
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+
+                bandwidth = server.faults.bandwidth
+                for start in range(0, len(payload), server.CHUNK_SIZE):
+                    chunk = payload[start:start + server.CHUNK_SIZE]
+                    self.wfile.write(chunk)
+                    if bandwidth > 0:
+                        time.sleep(len(chunk) / bandwidth)
+                server._count("bytes_sent", len(payload))
+
+            def do_GET(self):
+                server._count("requests")
+                faults = server.faults
+
+                delay = faults.delay()
+                if delay > 0:
+                    time.sleep(delay)
+
+                if faults.reset_rate and faults.roll() < faults.reset_rate:
+                    server._count("resets_injected")
+                    self._reset_connection()
+                    return
+                if faults.error_rate and faults.roll() < faults.error_rate:
+                    server._count("errors_injected")
+                    self._send(503, b'{"error": "injected"}')
+                    return
+
+                document = server.document(self.path)
+                if document is None:
+                    server._count("not_found")
+                    self._send(404, b'{"error": "Not found"}')
+                    return
+                self._send(200, json.dumps(document).encode('utf-8'))
+
+        return RequestHandler
+
+    def start(self) -> str:
+        """Запускает сервер в фоновом потоке и возвращает его адрес"""
+        self.httpd = ThreadingHTTPServer((self.host, self.port), self._create_handler())
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="mock-registry", daemon=True)
+        self.thread.start()
+        return self.url
+
+    def serve_forever(self) -> None:
+        self.httpd = ThreadingHTTPServer((self.host, self.port), self._create_handler())
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        print(f"Имитатор реестра запущен: {self.url} (пакетов: {len(self.corpus.packages)})")
+        print(f"NPM: {self.url}/<пакет>, PyPI: {self.url}/pypi/<пакет>/json")
+        try:
+            self.httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\nИмитатор остановлен")
+        finally:
+            self.httpd.server_close()
+
+    def shutdown(self) -> None:
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+
+
+def add_corpus_arguments(parser: argparse.ArgumentParser) -> None:
+    """Общие аргументы корпуса и сбоев (используются и в load_test.py)"""
+    parser.add_argument('--corpus', help="JSON-файл корпуса (по умолчанию - сгенерированный)")
+    parser.add_argument('--packages', type=int, default=1000, help="Пакетов в сгенерированном корпусе")
+    parser.add_argument('--fan-out', type=int, default=5, help="Среднее число зависимостей пакета")
+    parser.add_argument('--seed', type=int, default=1, help="Зерно генератора корпуса и сбоев")
+    parser.add_argument('--latency', type=float, default=0.0, help="Задержка ответа, с")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Случайная добавка к задержке, с")
+    parser.add_argument('--bandwidth', type=int, default=0, help="Байт в секунду на соединение (0 - без ограничения)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Доля ответов 503")
+    parser.add_argument('--reset-rate', type=float, default=0.0, help="Доля обрываемых соединений")
+
+
+def build_corpus(args) -> RegistryCorpus:
+    if args.corpus:
+        return RegistryCorpus.load(args.corpus)
+    return RegistryCorpus.generate(args.packages, args.fan_out, args.seed)
+
+
+def build_faults(args) -> FaultSettings:
+    return FaultSettings(args.latency, args.jitter, args.bandwidth, args.error_rate, args.reset_rate, args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Имитатор реестров NPM и PyPI с внесением сбоев")
+    add_corpus_arguments(parser)
+    parser.add_argument('--host', default="127.0.0.1", help="Адрес (по умолчанию 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8900, help="Порт (по умолчанию 8900)")
+    parser.add_argument('--save-corpus', metavar='FILE', help="Сохранить корпус в JSON и выйти")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args)
+    if args.save_corpus:
+        corpus.save(args.save_corpus)
+        print(f"Корпус сохранен: {args.save_corpus} (пакетов: {len(corpus.packages)})")
+        return
+
+    MockRegistryServer(corpus, build_faults(args), args.host, args.port).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
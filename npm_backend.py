@@ -0,0 +1,90 @@
+import json
+import socket
+import urllib.error
+from typing import Dict, Any, Optional
+from network_error import NetworkError
+from registry_parsing import reduce_npm_document
+from repository_backends import RepositoryBackend
+from repository_client import get_test_package
+
+
+class NpmBackend(RepositoryBackend):
+    """Бэкенд реестра NPM"""
+
+    kind = "npm"
+    remote = True
+    
+    DEFAULT_REGISTRY = "https://registry.npmjs.org"
+
+    @classmethod
+    def matches(cls, repo_url: str) -> bool:
+        return 'npmjs.org' in repo_url or 'github.com' in repo_url
+
+    @classmethod
+    def registry_base(cls, repo_url: str) -> str:
+        """Базовый URL реестра из конфигурации (github.com и пустой URL - публичный реестр)"""
+        if not repo_url or 'github.com' in repo_url:
+            return cls.DEFAULT_REGISTRY
+        return repo_url.rstrip('/')
+
+    def fetch(self, package_name: str, version: str = "latest",
+              repo_url: str = "", test_mode: bool = False) -> Dict[str, Any]:
+        """Получает информацию о NPM пакете с исправленным URL"""
+        
+        if test_mode:
+            test_data = get_test_package(package_name)
+            if test_data:
+                print(f"Используются тестовые данные для {package_name}")
+                return test_data
+            else:
+                print(f"Используются данные по умолчанию для {package_name} (офлайн-режим)")
+                return {
+                    "name": package_name,
+                    "version": version,
+                    "dependencies": {
+                        "accepts": "~1.3.8",
+                        "body-parser": "1.20.1", 
+                        "cookie": "0.5.0"
+                    }
+                }
+        
+        try:
+            # ИСПРАВЛЕНИЕ: Всегда запрашиваем основной URL пакета без версии
+            # NPM registry возвращает всю информацию о пакете, включая все версии
+            base_url = self.registry_base(repo_url)
+            url = f"{base_url}/{package_name}"
+            
+            print(f"Выполняется онлайн-запрос к: {url}")
+            
+            # Выбор зеркала, повторы, ограничение частоты и размыкатель цепи - в клиенте
+            raw = self.fetch_from_registry(repo_url, f"/{package_name}")
+            return self.client._parse_document(reduce_npm_document, raw, package_name, version)
+                
+        except urllib.error.URLError as e:
+            raise NetworkError(f"Ошибка получения пакета {package_name}: {e}")
+        except socket.timeout:
+            raise NetworkError(f"Таймаут при получении пакета {package_name}")
+        except json.JSONDecodeError as e:
+            raise NetworkError(f"Ошибка парсинга ответа для {package_name}: {e}")
+        except NetworkError:
+            raise
+        except Exception as e:
+            raise NetworkError(f"Неожиданная ошибка при получении {package_name}: {e}")
+
+    def collect_dependencies(self, package_info: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        dependencies = {}
+        # Для тестовых данных зависимости уже в правильном формате
+        if 'dependencies' in package_info:
+            deps = package_info.get('dependencies', {})
+            for dep, version in deps.items():
+                dependencies[dep] = version
+        else:
+            # Для реальных NPM данных
+            if 'dist-tags' in package_info and 'versions' in package_info:
+                latest_version = package_info['dist-tags']['latest']
+                version_data = package_info['versions'].get(latest_version, {})
+                
+                deps = version_data.get('dependencies', {})
+                for dep, version in deps.items():
+                    dependencies[dep] = version
+        return dependencies
@@ -1,41 +1,124 @@
+import os
 import sys
+import queue
+import atexit
 import datetime
+import threading
 
 
 class OutputCapture:
-    """Класс для захвата вывода в консоль и записи в файл"""
-    
-    def __init__(self, log_filename: str = "output_log.txt"):
+    """Класс для захвата вывода в консоль и записи в файл
+
+    Запись в лог выполняет фоновый поток: основной поток только кладет текст
+    в ограниченную очередь, а поток записывает его пачками с одним flush на пачку.
+    """
+
+    # Признак завершения работы фонового потока
+    _STOP = object()
+
+    def __init__(self, log_filename: str = "output_log.txt", max_bytes: int = 10 * 1024 * 1024,
+                 backup_count: int = 3, queue_size: int = 10000, batch_size: int = 1000):
         self.log_filename = log_filename
         self.original_stdout = sys.stdout
         self.log_file = None
-    
+        # Ротация лога по размеру: log.txt -> log.txt.1 -> ... -> log.txt.N
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self.writer_thread = None
+        self.written_bytes = 0
+
+    def _rotate(self):
+        """Переименовывает заполненный лог и открывает новый"""
+        self.log_file.close()
+        if self.backup_count > 0:
+            for number in range(self.backup_count - 1, 0, -1):
+                source = f"{self.log_filename}.{number}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.log_filename}.{number + 1}")
+            os.replace(self.log_filename, f"{self.log_filename}.1")
+        self.log_file = open(self.log_filename, 'w', encoding='utf-8')
+        self.written_bytes = 0
+
+    def _write_batch(self, parts):
+        text = "".join(parts)
+        size = len(text.encode('utf-8'))
+        if self.max_bytes > 0 and self.written_bytes and self.written_bytes + size > self.max_bytes:
+            self._rotate()
+        self.log_file.write(text)
+        self.log_file.flush()
+        self.written_bytes += size
+
+    def _writer_loop(self):
+        """Фоновый поток: забирает из очереди все накопленное и пишет одной операцией"""
+        while True:
+            item = self.queue.get()
+            items_taken = 1
+            stop = item is self._STOP
+            parts = [] if stop else [item]
+
+            while not stop and len(parts) < self.batch_size:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                items_taken += 1
+                if item is self._STOP:
+                    stop = True
+                else:
+                    parts.append(item)
+
+            try:
+                if parts:
+                    self._write_batch(parts)
+            except Exception as e:
+                self.original_stdout.write(f"Ошибка записи лога {self.log_filename}: {e}\n")
+            finally:
+                for _ in range(items_taken):
+                    self.queue.task_done()
+
+            if stop:
+                return
+
     def start_capture(self):
         """Начать захват вывода"""
         self.log_file = open(self.log_filename, 'w', encoding='utf-8')
-        
+        self.written_bytes = 0
+        self.writer_thread = threading.Thread(target=self._writer_loop, name="output-capture-writer",
+                                              daemon=True)
+        self.writer_thread.start()
+
         class DualOutput:
-            def __init__(self, original, log_file):
+            def __init__(self, original, log_queue):
                 self.original = original
-                self.log_file = log_file
-            
+                self.log_queue = log_queue
+
             def write(self, text):
                 self.original.write(text)
-                self.log_file.write(text)
-                self.log_file.flush()
-            
+                if text:
+                    # Блокируется только при переполнении очереди
+                    self.log_queue.put(text)
+                return len(text)
+
             def flush(self):
+                # Сбрасывается только консоль: очередь лога дописывается фоновым потоком
+                # и полностью записывается в stop_capture (в том числе при выходе через atexit)
                 self.original.flush()
-                self.log_file.flush()
-        
-        sys.stdout = DualOutput(self.original_stdout, self.log_file)
-        
+
+            def __getattr__(self, name):
+                return getattr(self.original, name)
+
+        sys.stdout = DualOutput(self.original_stdout, self.queue)
+        # Лог дописывается и при аварийном завершении программы
+        atexit.register(self.stop_capture)
+
         # Записываем заголовок в лог
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         print(f"\n{'='*60}")
         print(f"ЛОГ ВЫПОЛНЕНИЯ - {timestamp}")
         print(f"{'='*60}")
-    
+
     def stop_capture(self):
         """Остановить захват вывода"""
         if self.log_file:
@@ -43,7 +126,11 @@ class OutputCapture:
             print(f"\n{'='*60}")
             print(f"ВЫПОЛНЕНИЕ ЗАВЕРШЕНО - {timestamp}")
             print(f"{'='*60}")
-            
+
             sys.stdout = self.original_stdout
+            self.queue.put(self._STOP)
+            self.writer_thread.join()
             self.log_file.close()
-            print(f"\nПолный лог выполнения сохранен в: {self.log_filename}")
\ No newline at end of file
+            self.log_file = None
+            atexit.unregister(self.stop_capture)
+            print(f"\nПолный лог выполнения сохранен в: {self.log_filename}")
@@ -0,0 +1,118 @@
+"""
+Запись выходного файла графа: сжатие по расширению и разбиение на части
+"""
+
+import os
+from typing import List, Tuple
+
+# Расширение -> модуль сжатия (импортируется только при необходимости)
+COMPRESSION_EXTENSIONS = {
+    '.gz': 'gzip',
+    '.xz': 'lzma',
+}
+
+
+def open_text_output(filename: str):
+    """Открывает текстовый файл на запись; для .gz и .xz - через потоковый компрессор"""
+    extension = os.path.splitext(filename)[1].lower()
+    module_name = COMPRESSION_EXTENSIONS.get(extension)
+    if module_name == 'gzip':
+        import gzip
+        return gzip.open(filename, 'wt', encoding='utf-8')
+    if module_name == 'lzma':
+        import lzma
+        return lzma.open(filename, 'wt', encoding='utf-8')
+    return open(filename, 'w', encoding='utf-8')
+
+
+class OutputWriter:
+    """Построчная запись отчета в файл или в набор частей ограниченного размера с индексом"""
+
+    def __init__(self, filename: str, chunk_size: int = 0):
+        self.filename = filename
+        # Максимальный размер части в байтах несжатого текста (0 - без разбиения)
+        self.chunk_size = chunk_size
+        self.chunks: List[Tuple[str, int, int, int]] = []  # (файл, первая строка, последняя строка, байт)
+        self.current_file = None
+        self.current_bytes = 0
+        self.current_first_line = 1
+        self.line_number = 0
+
+        if self.chunk_size > 0:
+            self.index_filename = self._index_name()
+        else:
+            self.index_filename = None
+            self.current_file = open_text_output(filename)
+
+    def _split_name(self) -> Tuple[str, str]:
+        """Делит имя файла на основу и расширения: graph.txt.gz -> (graph, .txt.gz)"""
+        stem, compression = os.path.splitext(self.filename)
+        if compression.lower() not in COMPRESSION_EXTENSIONS:
+            stem, compression = self.filename, ""
+        stem, extension = os.path.splitext(stem)
+        return stem, extension + compression
+
+    def _index_name(self) -> str:
+        stem, _ = self._split_name()
+        return f"{stem}.index.txt"
+
+    def _chunk_name(self, number: int) -> str:
+        stem, extension = self._split_name()
+        return f"{stem}.part{number:03d}{extension}"
+
+    def _start_chunk(self) -> None:
+        chunk_name = self._chunk_name(len(self.chunks) + 1)
+        self.current_file = open_text_output(chunk_name)
+        self.current_bytes = 0
+        self.current_first_line = self.line_number + 1
+        self.chunks.append((chunk_name, self.current_first_line, self.current_first_line, 0))
+
+    def _finish_chunk(self) -> None:
+        if self.current_file is None:
+            return
+        self.current_file.close()
+        self.current_file = None
+        chunk_name, first_line, _, _ = self.chunks[-1]
+        self.chunks[-1] = (chunk_name, first_line, self.line_number, self.current_bytes)
+
+    def write_line(self, line: str) -> None:
+        """Записывает строку; при превышении размера части начинает новую"""
+        text = line + "\n"
+        if self.chunk_size > 0:
+            size = len(text.encode('utf-8'))
+            if self.current_file is None:
+                self._start_chunk()
+            elif self.current_bytes and self.current_bytes + size > self.chunk_size:
+                self._finish_chunk()
+                self._start_chunk()
+            self.current_bytes += size
+        # Строка отчета может содержать переводы строк (многострочные сообщения об ошибках)
+        self.line_number += text.count("\n")
+        self.current_file.write(text)
+
+    def close(self) -> None:
+        """Закрывает текущий файл и записывает индекс частей"""
+        if self.chunk_size <= 0:
+            if self.current_file is not None:
+                self.current_file.close()
+                self.current_file = None
+            return
+
+        self._finish_chunk()
+        with open(self.index_filename, 'w', encoding='utf-8') as index_file:
+            index_file.write(f"ИНДЕКС ЧАСТЕЙ: {self.filename}\n")
+            index_file.write(f"Частей: {len(self.chunks)}, строк: {self.line_number}\n")
+            for chunk_name, first_line, last_line, size in self.chunks:
+                index_file.write(f"{os.path.basename(chunk_name)}\tстроки {first_line}-{last_line}\t{size} байт\n")
+
+    @property
+    def output_path(self) -> str:
+        """Файл, который следует сообщить пользователю"""
+        return self.index_filename or self.filename
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
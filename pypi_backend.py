@@ -0,0 +1,151 @@
+import threading
+import urllib.error
+from collections import OrderedDict
+from urllib.parse import urlparse
+from typing import Dict, Any, List, Optional, Set, Tuple
+from network_error import NetworkError
+from registry_parsing import summarize_pypi_document, select_pypi_versions
+from repository_backends import RepositoryBackend
+from requirement_parser import parse_requirement
+
+
+class PypiBackend(RepositoryBackend):
+    """Бэкенд реестра PyPI"""
+
+    kind = "pypi"
+    remote = True
+    
+    DEFAULT_REGISTRY = "https://pypi.org/pypi"
+
+    def __init__(self, client):
+        super().__init__(client)
+        # (URL реестра, имя) -> (сводка документа, индекс выпусков, выбранные заранее версии):
+        # документ пакета загружается и разбирается один раз для всех ребер, ведущих к пакету
+        self.documents: Dict[Tuple[str, str], Tuple[Dict[str, Any], Any, Dict[str, Dict[str, Any]]]] = OrderedDict()
+        # (URL реестра, имя) -> запрошенные версии ребер, которые анализатор загрузит позже
+        self.expected: Dict[Tuple[str, str], Set[str]] = {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def matches(cls, repo_url: str) -> bool:
+        return 'pypi.org' in repo_url or 'pypi.python.org' in repo_url
+
+    @classmethod
+    def registry_base(cls, repo_url: str) -> str:
+        """Базовый URL JSON API из конфигурации (для адреса без пути добавляется /pypi)"""
+        if not repo_url:
+            return cls.DEFAULT_REGISTRY
+        base_url = repo_url.rstrip('/')
+        if not urlparse(base_url).path:
+            base_url += "/pypi"
+        return base_url
+
+    def fetch(self, package_name: str, version: str = "latest",
+              repo_url: str = "", test_mode: bool = False) -> Dict[str, Any]:
+        """Получает информацию о Python пакете с улучшенной обработкой версий"""
+        document_key = (self.registry_base(repo_url), package_name)
+        with self.lock:
+            document = self.documents.get(document_key)
+            package_info = document[2].pop(version, None) if document is not None else None
+        
+        if package_info is None:
+            # Версия выбирается вместе со всеми объявленными ребрами к этому пакету
+            with self.lock:
+                expected = self.expected.pop(document_key, set())
+            expected.discard(version)
+            versions = [version] + sorted(expected)
+            try:
+                packages = self.fetch_versions(package_name, versions, repo_url)
+            except NetworkError:
+                if len(versions) == 1:
+                    raise
+                # Ошибка выбора другой версии не должна мешать этому ребру
+                packages = self.fetch_versions(package_name, [version], repo_url)
+            package_info = packages[0]
+            if len(packages) > 1:
+                with self.lock:
+                    document = self.documents.get(document_key)
+                    if document is not None:
+                        document[2].update(zip(versions[1:], packages[1:]))
+        
+        # УЛУЧШЕННОЕ определение версии
+        if version == "latest":
+            print(f"Используется последняя версия: {package_info['version']}")
+        elif package_info['version'] != version:
+            print(f"Версия {version} нормализована до {package_info['version']}")
+        
+        return package_info
+
+    def expect_versions(self, packages: Dict[str, str], repo_url: str = "") -> None:
+        """Запоминает ребра, которые будут загружены: их версии выбираются одним пакетным поиском"""
+        base_url = self.registry_base(repo_url)
+        with self.lock:
+            for package_name, version in packages.items():
+                self.expected.setdefault((base_url, package_name), set()).add(version)
+
+    def fetch_versions(self, package_name: str, versions: List[str], repo_url: str = "") -> List[Dict[str, Any]]:
+        """Информация о пакете для нескольких запрошенных версий (ребер графа, ведущих к пакету)"""
+        try:
+            summary, version_index, _ = self._get_document(package_name, repo_url)
+            return select_pypi_versions(summary, package_name, versions, version_index)
+            
+        except urllib.error.URLError as e:
+            raise NetworkError(f"Ошибка получения PyPI пакета {package_name}: {e}")
+        except NetworkError:
+            raise
+        except Exception as e:
+            raise NetworkError(f"Ошибка обработки PyPI пакета {package_name}: {e}")
+
+    def _get_document(self, package_name: str, repo_url: str) -> Tuple[Dict[str, Any], Any, Dict[str, Dict[str, Any]]]:
+        """Сводка документа пакета, индекс выпусков и выбранные заранее версии (загружаются при первом обращении)"""
+        from version_matcher import VersionIndex
+
+        base_url = self.registry_base(repo_url)
+        document_key = (base_url, package_name)
+        with self.lock:
+            document = self.documents.get(document_key)
+            if document is not None:
+                self.documents.move_to_end(document_key)
+                return document
+        
+        # Выбор зеркала, повторы, ограничение частоты и размыкатель цепи - в клиенте
+        raw = self.fetch_from_registry(repo_url, f"/{package_name}/json")
+        summary = self.client._parse_document(summarize_pypi_document, raw, package_name, "latest")
+        document = (summary, VersionIndex(summary['releases']), {})
+        
+        with self.lock:
+            self.documents[document_key] = document
+            # Документов не больше, чем записей в кеше метаданных
+            if self.client.cache_limit:
+                while len(self.documents) > self.client.cache_limit:
+                    self.documents.popitem(last=False)
+        return document
+
+    def collect_dependencies(self, package_info: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Зависимости из requires_dist (строки требований PEP 508)"""
+        dependencies = {}
+        deps_list = package_info.get('dependencies') or package_info.get('info', {}).get('requires_dist', [])
+        
+        if deps_list:
+            print(f"Обработка зависимостей PyPI:")
+            for dep in deps_list:
+                try:
+                    # Разбор строки запоминается: повторяющиеся требования не разбираются заново
+                    requirement = parse_requirement(dep)
+                    
+                    # ФИЛЬТР неправильных имен
+                    if requirement.accepted:
+                        dependencies[requirement.normalized_name] = requirement.version
+                        print(f"  - {requirement.normalized_name} -> {requirement.version}")
+                        
+                except Exception as e:
+                    print(f"  Ошибка парсинга '{dep}': {e}")
+        
+        if not dependencies:
+            print(f"  Зависимости не найдены")
+        return dependencies
+
+    def clear_cache(self) -> None:
+        with self.lock:
+            self.documents.clear()
+            self.expected.clear()
@@ -0,0 +1,91 @@
+"""
+Разбор ответов реестров NPM и PyPI
+
+Функции принимают сырой ответ реестра и сводят его к {name, version, dependencies}.
+Они определены на уровне модуля, чтобы их можно было выполнять в пуле процессов:
+в основной процесс возвращается только небольшой результат, а не весь документ.
+"""
+
+import json
+from typing import Dict, Any, List
+from network_error import NetworkError
+
+
+def reduce_npm_document(raw: bytes, package_name: str, version: str = "latest") -> Dict[str, Any]:
+    """Сводит документ пакета NPM (packument) к информации о нужной версии"""
+    data = json.loads(raw.decode())
+
+    # После получения данных, извлекаем информацию о нужной версии
+    if version != "latest" and version in data.get('versions', {}):
+        # Если указана конкретная версия и она существует
+        version_data = data['versions'][version]
+        return {
+            "name": data.get('name', package_name),
+            "version": version,
+            "dependencies": version_data.get('dependencies', {})
+        }
+
+    # Используем последнюю версию (по умолчанию)
+    latest_version = data.get('dist-tags', {}).get('latest')
+    if latest_version and latest_version in data.get('versions', {}):
+        version_data = data['versions'][latest_version]
+        return {
+            "name": data.get('name', package_name),
+            "version": latest_version,
+            "dependencies": version_data.get('dependencies', {})
+        }
+
+    # Если не удалось найти последнюю версию, возвращаем базовую информацию
+    return {
+        "name": data.get('name', package_name),
+        "version": version,
+        "dependencies": data.get('versions', {}).get(list(data['versions'].keys())[0], {}).get('dependencies', {})
+    }
+
+
+def summarize_pypi_document(raw: bytes, package_name: str, version: str = "latest") -> Dict[str, Any]:
+    """Сводит JSON проекта PyPI к данным, не зависящим от запрошенной версии
+
+    Зависимости берутся из info и одинаковы для любой версии, поэтому сводка
+    разбирается один раз на пакет, а версия выбирается по списку выпусков.
+    """
+    data = json.loads(raw.decode())
+    return {
+        'name': data['info'].get('name', package_name),
+        'latest_version': data['info']['version'],
+        'releases': list(data['releases'].keys()),
+        'dependencies': data['info'].get('requires_dist') or []
+    }
+
+
+def select_pypi_versions(summary: Dict[str, Any], package_name: str, versions: List[str],
+                         version_index=None) -> List[Dict[str, Any]]:
+    """Информация о пакете для каждой запрошенной версии; версии выбираются одним пакетным поиском"""
+    from version_matcher import VersionIndex
+
+    # УЛУЧШЕННОЕ определение версии
+    requested = [version for version in versions if version != "latest"]
+    if requested:
+        # НОРМАЛИЗАЦИЯ ВЕРСИИ - исправляем неправильные версии
+        version_index = version_index or VersionIndex(summary['releases'])
+        selected = dict(zip(requested, version_index.select(requested)))
+
+    packages = []
+    for version in versions:
+        if version == "latest":
+            version = summary['latest_version']
+        else:
+            version = selected[version]
+            # Проверяем существование версии
+            if version not in version_index.positions:
+                raise NetworkError(
+                    f"Версия {version} не найдена для пакета {package_name}. "
+                    f"Доступные версии: {', '.join(summary['releases'][:5])}"
+                )
+        packages.append({
+            'name': summary['name'],
+            'version': version,
+            'dependencies': summary['dependencies']
+        })
+    return packages
+
@@ -0,0 +1,104 @@
+"""
+Реестр бэкендов репозиториев
+
+Каждый тип репозитория (npm, pypi, uppercase, local и будущие) реализуется отдельным
+классом в своем модуле. Модуль импортируется только при первом обращении к бэкенду,
+поэтому офлайн-анализ не загружает сетевые библиотеки.
+"""
+
+import importlib
+from typing import Dict, Any, Optional, Tuple
+from network_error import NetworkError
+
+
+class RepositoryBackend:
+    """Базовый класс бэкенда репозитория"""
+
+    # Тип репозитория, которому соответствует бэкенд
+    kind = "generic"
+    # Удаленный репозиторий: метаданные можно загружать заранее и параллельно
+    remote = False
+    # Потоков предварительной загрузки, если пул разбора не задан (0 - без предзагрузки)
+    prefetch_workers = 0
+
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def matches(cls, repo_url: str) -> bool:
+        """Относится ли адрес из конфигурации к репозиторию этого типа"""
+        return False
+
+    @classmethod
+    def registry_base(cls, repo_url: str) -> str:
+        """Базовый URL реестра из адреса в конфигурации"""
+        return repo_url.rstrip('/')
+
+    def fetch(self, package_name: str, version: str = "latest",
+              repo_url: str = "", test_mode: bool = False) -> Optional[Dict[str, Any]]:
+        """Получает информацию о пакете"""
+        raise NetworkError(f"Неподдерживаемый репозиторий: {repo_url}")
+
+    def fetch_from_registry(self, repo_url: str, path: str) -> bytes:
+        """Загружает путь из реестра или его зеркал; зеркала нормализуются как repository_url"""
+        mirrors = [self.registry_base(mirror) for mirror in self.client.mirrors]
+        return self.client.fetch_from_repository(self.registry_base(repo_url), path, mirrors)
+
+    def expect_versions(self, packages: Dict[str, str], repo_url: str = "") -> None:
+        """Сообщает о ребрах {имя: версия}, которые анализатор загрузит позже"""
+        pass
+
+    def extract_dependencies(self, package_info: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Извлекает зависимости из информации о пакете"""
+        dependencies = self.collect_dependencies(package_info)
+        print(f"[EXTRACT DEBUG] Итоговые зависимости ({self.kind}): {dependencies}")
+        return dependencies
+
+    def collect_dependencies(self, package_info: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Зависимости {имя: версия} в формате, который возвращает fetch() бэкенда"""
+        return {}
+
+    def clear_cache(self) -> None:
+        """Сбрасывает внутренние кеши бэкенда"""
+        pass
+
+
+# Тип репозитория -> (модуль, класс бэкенда). Порядок - порядок проверки при определении
+# типа по адресу: файловые бэкенды идут первыми, чтобы офлайн-анализ не импортировал сетевые
+BACKEND_REGISTRY: Dict[str, Tuple[str, str]] = {
+    'uppercase': ('uppercase_backend', 'UppercaseBackend'),
+    'local': ('local_backend', 'LocalBackend'),
+    'npm': ('npm_backend', 'NpmBackend'),
+    'pypi': ('pypi_backend', 'PypiBackend'),
+    'maven': ('maven_backend', 'MavenBackend'),
+}
+
+_loaded_backend_classes: Dict[str, type] = {}
+
+
+def register_backend(kind: str, module_name: str, class_name: str) -> None:
+    """Регистрирует бэкенд; модуль будет импортирован при первом использовании"""
+    BACKEND_REGISTRY[kind] = (module_name, class_name)
+    _loaded_backend_classes.pop(kind, None)
+
+
+def get_backend_class(kind: str) -> type:
+    """Возвращает класс бэкенда, импортируя его модуль при первом обращении"""
+    if kind in _loaded_backend_classes:
+        return _loaded_backend_classes[kind]
+
+    if kind not in BACKEND_REGISTRY:
+        return RepositoryBackend
+
+    module_name, class_name = BACKEND_REGISTRY[kind]
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    _loaded_backend_classes[kind] = backend_class
+    return backend_class
+
+
+def detect_repository_type(repo_url: str) -> str:
+    """Определяет тип репозитория по URL: первый бэкенд реестра, которому подходит адрес"""
+    for kind in BACKEND_REGISTRY:
+        if get_backend_class(kind).matches(repo_url):
+            return kind
+    return RepositoryBackend.kind
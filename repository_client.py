@@ -1,12 +1,10 @@
-import json
-import urllib.request
-import urllib.error
-import re
-import socket
 import os
-from typing import Dict, Any
-from network_error import NetworkError
-import ssl
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Tuple, Optional
+from repository_backends import RepositoryBackend, get_backend_class, detect_repository_type
+from result_cache import ResultCache
 
 try:
     from test_data import get_test_package
@@ -29,212 +27,176 @@ except ImportError:
 class RepositoryClient:
     """Клиент для получения зависимостей из репозиториев"""
     
-    def __init__(self):
+    def __init__(self, http_options: Optional[Dict[str, Any]] = None, parse_workers: int = 0,
+                 mirrors: Optional[List[str]] = None, cache_limit: int = 0, metrics=None):
         self.test_repo = None
         self.test_repo_path = None
+        # Параметры устойчивого HTTP-клиента (повторы, ограничение частоты, размыкатель цепи)
+        self.http_options = http_options or {}
+        self._http_client = None
+        # Пул процессов для разбора больших ответов реестров (0 - разбор в текущем процессе)
+        self.parse_workers = parse_workers
+        self._parse_pool = None
+        self._prefetch_pool = None
+        # Дополнительные зеркала реестров в порядке предпочтения
+        self.mirrors = [mirror.rstrip('/') for mirror in (mirrors or []) if mirror]
+        self._mirror_selector = None
+        # Кеш метаданных пакетов: (тип репозитория, URL, имя, версия, тестовый режим) -> информация о пакете
+        self.package_cache: Dict[Tuple[str, str, str, str, bool], Dict[str, Any]] = OrderedDict()
+        # Максимум записей кеша метаданных (0 - без ограничения); вытесняются давно не использованные
+        self.cache_limit = cache_limit
+        self._cache_lock = threading.Lock()
+        # Готовые графы и разрешенные узлы; сбрасываются вместе с кешем метаданных
+        self.result_cache = ResultCache(node_limit=cache_limit)
+        # Бэкенды репозиториев создаются при первом обращении: тип -> бэкенд
+        self.backends: Dict[str, RepositoryBackend] = {}
+        # Метрики запуска (RunMetrics) или None
+        self.metrics = metrics
 
-    @staticmethod
-    def _normalize_package_name(name: str) -> str:
-        """Нормализует имя пакета (заменяет дефисы на подчеркивания)"""
-        if not name:
-            return name
-        
-        # Заменяем дефисы на подчеркивания
-        name = name.replace('-', '_')
-        
-        # Удаляем лишние символы в конце
-        name = re.sub(r'[^\w\.]+$', '', name)
-        
-        return name.lower()
+    def get_backend(self, repo_type: str) -> RepositoryBackend:
+        """Возвращает бэкенд для типа репозитория, загружая его модуль при первом обращении"""
+        backend = self.backends.get(repo_type)
+        if backend is None:
+            backend = get_backend_class(repo_type)(self)
+            self.backends[repo_type] = backend
+        return backend
 
-    @staticmethod
-    def _normalize_python_version(requested_version: str, available_versions: list) -> str:
-        """Нормализует запрошенную версию на основе доступных версий"""
-        if not available_versions:
-            return "latest"
-        
-        # Если запрошенная версия существует - возвращаем её
-        if requested_version in available_versions:
-            return requested_version
-        
-        # Пытаемся найти подходящую версию
-        requested_clean = re.sub(r'[^\d\.]', '', requested_version)
-        
-        if not requested_clean:
-            return available_versions[-1]  # возвращаем последнюю версию
-        
-        # Ищем версии, которые начинаются с запрошенной
-        for available in available_versions:
-            if available.startswith(requested_clean):
-                return available
-        
-        # Ищем версии, содержащие запрошенную
-        for available in available_versions:
-            if requested_clean in available:
-                return available
-        
-        # Возвращаем последнюю доступную версию
-        return available_versions[-1]
+    def fetch_package_info(self, repo_type: str, package_name: str, version: str = "latest",
+                           repo_url: str = "", test_mode: bool = False) -> Dict[str, Any]:
+        """Получает информацию о пакете с учетом кеша метаданных"""
+        cache_key = (repo_type, repo_url, package_name, version, test_mode)
+        with self._cache_lock:
+            if cache_key in self.package_cache:
+                if self.cache_limit:
+                    self.package_cache.move_to_end(cache_key)
+                if self.metrics is not None:
+                    self.metrics.inc('metadata_cache_hits_total', {'backend': repo_type})
+                return self.package_cache[cache_key]
+        
+        if self.metrics is None:
+            package_info = self.get_backend(repo_type).fetch(package_name, version, repo_url, test_mode)
+        else:
+            self.metrics.inc('metadata_cache_misses_total', {'backend': repo_type})
+            started_at = time.monotonic()
+            try:
+                package_info = self.get_backend(repo_type).fetch(package_name, version, repo_url, test_mode)
+            except Exception as e:
+                self.metrics.record_fetch(repo_type, time.monotonic() - started_at, e)
+                raise
+            self.metrics.record_fetch(repo_type, time.monotonic() - started_at)
+        
+        with self._cache_lock:
+            self.package_cache[cache_key] = package_info
+            if self.cache_limit:
+                while len(self.package_cache) > self.cache_limit:
+                    self.package_cache.popitem(last=False)
+        return package_info
 
-    @staticmethod
-    def _extract_python_version(dep_string: str) -> str:
-        """Извлекает версию из строки зависимости Python"""
-        if not dep_string:
-            return "latest"
-        
-        # Удаляем условные зависимости (всё что после ;)
-        dep_string = dep_string.split(';')[0].strip()
-        
-        # Ищем версионные спецификаторы - ТОЛЬКО КОРРЕКТНЫЕ ФОРМАТЫ
-        version_patterns = [
-            r'===?\s*([\d\.]+[\w]*)',     # ==, === (только цифры и точки)
-            r'>=\s*([\d\.]+)',            # >= (только цифры)
-            r'<=\s*([\d\.]+)',            # <= (только цифры)  
-            r'>\s*([\d\.]+)',             # > (только цифры)
-            r'<\s*([\d\.]+)',             # < (только цифры)
-            r'~=\s*([\d\.]+)',            # ~= (только цифры)
-            r'!=\s*([\d\.]+)',            # != (только цифры)
-        ]
-        
-        for pattern in version_patterns:
-            match = re.search(pattern, dep_string)
-            if match:
-                version = match.group(1)
-                version = version.strip('"\'').strip()
-                # Проверяем что версия содержит хотя бы одну цифру
-                if version and re.search(r'\d', version):
-                    return version
-        
-        # Если версия не указана явно, возвращаем latest
-        return "latest"
+    @property
+    def http_client(self):
+        """HTTP-клиент реестров создается при первом сетевом запросе"""
+        if self._http_client is None:
+            from resilient_http import ResilientHttpClient
+            self._http_client = ResilientHttpClient(metrics=self.metrics, **self.http_options)
+        return self._http_client
 
-    @staticmethod
-    def fetch_pypi_package_info(package_name: str, version: str = "latest") -> Dict[str, Any]:
-        """Получает информацию о Python пакете с улучшенной обработкой версий"""
-        try:
-            url = f"https://pypi.org/pypi/{package_name}/json"
-            
-            # SSL контекст для обхода проблем с сертификатами
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            request = urllib.request.Request(url)
-            with urllib.request.urlopen(request, timeout=10, context=ssl_context) as response:
-                data = json.loads(response.read().decode())
-                
-                # УЛУЧШЕННОЕ определение версии
-                if version == "latest":
-                    version = data['info']['version']
-                    print(f"Используется последняя версия: {version}")
-                else:
-                    # НОРМАЛИЗАЦИЯ ВЕРСИИ - исправляем неправильные версии
-                    available_versions = list(data['releases'].keys())
-                    normalized_version = RepositoryClient._normalize_python_version(version, available_versions)
-                    if normalized_version != version:
-                        print(f"Версия {version} нормализована до {normalized_version}")
-                        version = normalized_version
-                    
-                    # Проверяем существование версии
-                    if version not in data['releases']:
-                        available_versions = list(data['releases'].keys())[:5]
-                        raise NetworkError(
-                            f"Версия {version} не найдена для пакета {package_name}. "
-                            f"Доступные версии: {', '.join(available_versions)}"
-                        )
-                
-                return {
-                    'info': data['info'],
-                    'version': version,
-                    'releases': data['releases'],
-                    'dependencies': data['info'].get('requires_dist', [])
-                }
-                
-        except urllib.error.URLError as e:
-            raise NetworkError(f"Ошибка получения PyPI пакета {package_name}: {e}")
-        except Exception as e:
-            raise NetworkError(f"Ошибка обработки PyPI пакета {package_name}: {e}")
+    @property
+    def mirror_selector(self):
+        """Статистика зеркал создается при первом сетевом запросе"""
+        if self._mirror_selector is None:
+            from mirror_selector import MirrorSelector
+            self._mirror_selector = MirrorSelector()
+        return self._mirror_selector
 
-    @staticmethod
-    def extract_dependencies(package_info: Dict[str, Any], repo_type: str) -> Dict[str, str]:
-        """Извлекает зависимости из информации о пакете"""
-        dependencies = {}
-        
-        if repo_type == 'npm':
-            # Для тестовых данных зависимости уже в правильном формате
-            if 'dependencies' in package_info:
-                deps = package_info.get('dependencies', {})
-                for dep, version in deps.items():
-                    dependencies[dep] = version
-            else:
-                # Для реальных NPM данных
-                if 'dist-tags' in package_info and 'versions' in package_info:
-                    latest_version = package_info['dist-tags']['latest']
-                    version_data = package_info['versions'].get(latest_version, {})
-                    
-                    deps = version_data.get('dependencies', {})
-                    for dep, version in deps.items():
-                        dependencies[dep] = version
-        
-        elif repo_type == 'pypi':
-            # УЛУЧШЕННАЯ обработка PyPI зависимостей
-            deps_list = package_info.get('dependencies') or package_info.get('info', {}).get('requires_dist', [])
-            
-            if deps_list:
-                print(f"Обработка зависимостей PyPI:")
-                for dep in deps_list:
-                    try:
-                        dep_clean = dep.split(';')[0].strip()
-                        # УЛУЧШЕННЫЙ парсинг имени пакета
-                        dep_name_match = re.match(r'^([a-zA-Z0-9_\-\.]+)', dep_clean)
-                        if not dep_name_match:
-                            continue
-                        
-                        dep_name = dep_name_match.group(1).strip()
-                        
-                        # Нормализуем имя пакета (убираем неправильные символы)
-                        dep_name = RepositoryClient._normalize_package_name(dep_name)
-                        
-                        # ФИЛЬТР неправильных имен
-                        if (dep_name and 
-                            not dep_name.startswith('python') and 
-                            not dep_name.startswith('extra') and
-                            len(dep_name) > 1 and  # не слишком короткое
-                            not re.search(r'[~!@#$%^&*()+=]', dep_name) and  # нет спецсимволов
-                            dep_name not in ['', 'None', 'None)', 'or']):
-                            
-                            version = RepositoryClient._extract_python_version(dep)
-                            dependencies[dep_name] = version
-                            print(f"  - {dep_name} -> {version}")
-                            
-                    except Exception as e:
-                        print(f"  Ошибка парсинга '{dep}': {e}")
-            
-            if not dependencies:
-                print(f"  Зависимости не найдены")
-        
-        elif repo_type == 'uppercase':
-            # ДОБАВЛЕННЫЙ БЛОК ДЛЯ UPPERCASE РЕПОЗИТОРИЯ
-            print(f"[EXTRACT DEBUG] Извлечение UPPERCASE зависимостей из: {package_info.get('name', 'unknown')}")
+    def fetch_from_repository(self, base_url: str, path: str, mirrors: Optional[List[str]] = None) -> bytes:
+        """Загружает путь из реестра, выбирая самое быстрое исправное зеркало
+
+        mirrors - зеркала, уже приведенные бэкендом к базовому URL реестра (по умолчанию self.mirrors)
+        """
+        candidates = [base_url.rstrip('/')]
+        candidates += [mirror for mirror in (self.mirrors if mirrors is None else mirrors)
+                       if mirror not in candidates]
+        if len(candidates) == 1:
+            return self.http_client.fetch(candidates[0] + path)
+        
+        last_error = None
+        for mirror in self.mirror_selector.order(candidates):
+            started_at = time.monotonic()
+            try:
+                data = self.http_client.fetch(mirror + path)
+            except Exception as e:
+                last_error = e
+                if not self.http_client.is_transient_error(e):
+                    # Зеркало ответило (например, 404) - ответ окончательный
+                    self.mirror_selector.record_success(mirror, time.monotonic() - started_at)
+                    raise
+                self.mirror_selector.record_failure(mirror)
+                print(f"Зеркало {mirror} недоступно: {e}")
+                continue
             
-            # Проверяем несколько возможных мест хранения зависимостей
-            if 'dependencies' in package_info and package_info['dependencies']:
-                deps = package_info['dependencies']
-                print(f"[EXTRACT DEBUG] Найдены UPPERCASE зависимости: {deps}")
-                
-                if isinstance(deps, dict):
-                    dependencies = deps
-                    print(f"[EXTRACT DEBUG] Успешно извлечено {len(dependencies)} зависимостей")
-                else:
-                    print(f"[EXTRACT DEBUG] ОШИБКА: зависимости не в формате dict: {type(deps)}")
-                    dependencies = {}
-            else:
-                print(f"[EXTRACT DEBUG] ВНИМАНИЕ: нет зависимостей в package_info")
-                print(f"[EXTRACT DEBUG] Доступные ключи: {list(package_info.keys())}")
-                dependencies = {}
+            self.mirror_selector.record_success(mirror, time.monotonic() - started_at)
+            if mirror != candidates[0]:
+                print(f"Используется зеркало: {mirror}")
+            return data
         
-        print(f"[EXTRACT DEBUG] Итоговые зависимости ({repo_type}): {dependencies}")
-        return dependencies
+        raise last_error
+
+    def _parse_document(self, reducer, raw: bytes, package_name: str, version: str) -> Dict[str, Any]:
+        """Разбирает ответ реестра в пуле процессов или, если пул не задан, в текущем процессе"""
+        if self.parse_workers <= 0:
+            return reducer(raw, package_name, version)
+        
+        if self._parse_pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self._parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+        return self._parse_pool.submit(reducer, raw, package_name, version).result()
+
+    def prefetch(self, repo_type: str, packages: Dict[str, str], repo_url: str = "",
+                 test_mode: bool = False) -> None:
+        """Параллельно загружает метаданные пакетов в кеш, чтобы загрузка и разбор шли одновременно"""
+        backend = self.get_backend(repo_type)
+        if not test_mode:
+            # Бэкенд может выбрать версии всех ребер к одному пакету вместе (PyPI)
+            backend.expect_versions(packages, repo_url)
+        workers = self.parse_workers * 2 if self.parse_workers > 0 else backend.prefetch_workers
+        if workers <= 0 or not backend.remote or test_mode:
+            return
+        
+        pending = [(name, version) for name, version in packages.items()
+                   if (repo_type, repo_url, name, version, test_mode) not in self.package_cache]
+        if len(pending) < 2:
+            return
+        
+        if self._prefetch_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._prefetch_pool = ThreadPoolExecutor(max_workers=workers)
+        
+        def fetch_quietly(name, version):
+            try:
+                self.fetch_package_info(repo_type, name, version, repo_url, test_mode)
+            except Exception:
+                # Ошибка будет получена повторно (из кеша ошибок) при обычном анализе узла
+                pass
+        
+        futures = [self._prefetch_pool.submit(fetch_quietly, name, version) for name, version in pending]
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        """Останавливает пулы потоков и процессов"""
+        if self._prefetch_pool is not None:
+            self._prefetch_pool.shutdown()
+            self._prefetch_pool = None
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+            self._parse_pool = None
+
+    def clear_cache(self) -> None:
+        """Сбрасывает кеш метаданных, разобранных репозиториев и построенных графов"""
+        self.package_cache.clear()
+        self.result_cache.clear()
+        for backend in self.backends.values():
+            backend.clear_cache()
 
     def init_test_repository(self, repo_path: str):
         """Инициализирует тестовый репозиторий"""
@@ -246,128 +208,7 @@ class RepositoryClient:
         else:
             print(f"Использование существующего тестового репозитория: {self.test_repo_path}")
 
-    
-
-    @staticmethod
-    def fetch_npm_package_info(package_name: str, version: str = "latest", test_mode: bool = False) -> Dict[str, Any]:
-        """Получает информацию о NPM пакете с исправленным URL"""
-        
-        if test_mode:
-            test_data = get_test_package(package_name)
-            if test_data:
-                print(f"Используются тестовые данные для {package_name}")
-                return test_data
-            else:
-                print(f"Используются данные по умолчанию для {package_name} (офлайн-режим)")
-                return {
-                    "name": package_name,
-                    "version": version,
-                    "dependencies": {
-                        "accepts": "~1.3.8",
-                        "body-parser": "1.20.1", 
-                        "cookie": "0.5.0"
-                    }
-                }
-        
-        try:
-            import ssl
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            # ИСПРАВЛЕНИЕ: Всегда запрашиваем основной URL пакета без версии
-            # NPM registry возвращает всю информацию о пакете, включая все версии
-            url = f"https://registry.npmjs.org/{package_name}"
-            
-            print(f"Выполняется онлайн-запрос к: {url}")
-            
-            request = urllib.request.Request(url)
-            with urllib.request.urlopen(request, timeout=10, context=ssl_context) as response:
-                data = json.loads(response.read().decode())
-                
-                # После получения данных, извлекаем информацию о нужной версии
-                if version != "latest" and version in data.get('versions', {}):
-                    # Если указана конкретная версия и она существует
-                    version_data = data['versions'][version]
-                    return {
-                        "name": data.get('name', package_name),
-                        "version": version,
-                        "dependencies": version_data.get('dependencies', {})
-                    }
-                else:
-                    # Используем последнюю версию (по умолчанию)
-                    latest_version = data.get('dist-tags', {}).get('latest')
-                    if latest_version and latest_version in data.get('versions', {}):
-                        version_data = data['versions'][latest_version]
-                        return {
-                            "name": data.get('name', package_name),
-                            "version": latest_version,
-                            "dependencies": version_data.get('dependencies', {})
-                        }
-                    else:
-                        # Если не удалось найти последнюю версию, возвращаем базовую информацию
-                        return {
-                            "name": data.get('name', package_name),
-                            "version": version,
-                            "dependencies": data.get('versions', {}).get(list(data['versions'].keys())[0], {}).get('dependencies', {})
-                        }
-                    
-        except urllib.error.URLError as e:
-            raise NetworkError(f"Ошибка получения пакета {package_name}: {e}")
-        except socket.timeout:
-            raise NetworkError(f"Таймаут при получении пакета {package_name}")
-        except json.JSONDecodeError as e:
-            raise NetworkError(f"Ошибка парсинга ответа для {package_name}: {e}")
-        except Exception as e:
-            raise NetworkError(f"Неожиданная ошибка при получении {package_name}: {e}")
-        
-
-    
-    @staticmethod
-    def fetch_uppercase_package_info(package_name: str, version: str = "latest", repo_path: str = "") -> Dict[str, Any]:
-        """Получает информацию о пакете из UPPERCASE репозитория"""
-        try:
-            from uppercase_repository import UppercaseRepository
-            
-            repo = UppercaseRepository(repo_path)
-            package_info = repo.get_package(package_name, version)
-            
-            if not package_info:
-                raise NetworkError(f"Пакет {package_name} не найден в UPPERCASE репозитории")
-            
-            return package_info
-            
-        except ImportError:
-            raise NetworkError("Модуль UPPERCASE репозитория не доступен")
-        except Exception as e:
-            raise NetworkError(f"Ошибка получения пакета из UPPERCASE репозитория: {e}")
-
-    # Обновить метод detect_repository_type:
     @staticmethod
     def detect_repository_type(repo_url: str) -> str:
         """Определяет тип репозитория по URL"""
-        # Проверяем UPPERCASE репозиторий по расширению .txt
-        if repo_url.endswith('.txt'):
-            return 'uppercase'
-        
-        if repo_url.startswith('./') or repo_url.startswith('../'):
-            return 'local'
-        
-        if not repo_url.startswith('http://') and not repo_url.startswith('https://'):
-            if '/' in repo_url or '\\' in repo_url:
-                normalized_path = os.path.normpath(repo_url)
-                if os.path.exists(normalized_path) or os.path.isdir(normalized_path):
-                    return 'local'
-            if ':' not in repo_url or (len(repo_url) > 2 and repo_url[1:3] == ':\\'):
-                return 'local'
-        
-        if 'npmjs.org' in repo_url or 'registry.npmjs.org' in repo_url:
-            return 'npm'
-        elif 'pypi.org' in repo_url or 'pypi.python.org' in repo_url:
-            return 'pypi'
-        elif 'repo1.maven.org' in repo_url or 'maven.org' in repo_url:
-            return 'maven'
-        elif 'github.com' in repo_url:
-            return 'npm'
-        else:
-            return 'generic'
\ No newline at end of file
+        return detect_repository_type(repo_url)
@@ -0,0 +1,126 @@
+"""
+Разбор строк требований Python (requires_dist) с запоминанием результатов
+
+Одни и те же строки (например, "numpy>=1.22.4") встречаются в сотнях пакетов,
+поэтому каждая строка разбирается один раз, а повторные обращения стоят
+одного поиска в кеше.
+"""
+
+import re
+from functools import lru_cache
+from typing import Tuple
+
+# Максимум различных строк требований в кеше
+REQUIREMENT_CACHE_SIZE = 16384
+
+NAME_PATTERN = re.compile(r'^([a-zA-Z0-9_\-\.]+)')
+EXTRAS_PATTERN = re.compile(r'^\s*\[([^\]]*)\]')
+TRAILING_JUNK_PATTERN = re.compile(r'[^\w\.]+$')
+DIGIT_PATTERN = re.compile(r'\d')
+SPECIAL_CHARS_PATTERN = re.compile(r'[~!@#$%^&*()+=]')
+
+# Спецификаторы версии в порядке приоритета: берется первый найденный по этому списку
+VERSION_PATTERNS = (
+    re.compile(r'===?\s*([\d\.]+[\w]*)'),     # ==, === (только цифры и точки)
+    re.compile(r'>=\s*([\d\.]+)'),            # >= (только цифры)
+    re.compile(r'<=\s*([\d\.]+)'),            # <= (только цифры)
+    re.compile(r'>\s*([\d\.]+)'),             # > (только цифры)
+    re.compile(r'<\s*([\d\.]+)'),             # < (только цифры)
+    re.compile(r'~=\s*([\d\.]+)'),            # ~= (только цифры)
+    re.compile(r'!=\s*([\d\.]+)'),            # != (только цифры)
+)
+
+# Имена, которые не являются пакетами
+IGNORED_NAMES = ('', 'None', 'None)', 'or')
+
+
+class Requirement:
+    """Разобранная строка требования: имя, extras, спецификатор версии и маркеры окружения"""
+
+    __slots__ = ('raw', 'name', 'normalized_name', 'extras', 'specifier', 'markers', 'version', 'accepted')
+
+    def __init__(self, raw: str, name: str, normalized_name: str, extras: Tuple[str, ...],
+                 specifier: str, markers: str, version: str, accepted: bool):
+        self.raw = raw
+        self.name = name                        # Имя как в строке
+        self.normalized_name = normalized_name  # Имя для графа (pkg-name -> pkg_name)
+        self.extras = extras
+        self.specifier = specifier              # Например, ">=1.22.4,<2"
+        self.markers = markers                  # Условие после ';'
+        self.version = version                  # Версия для анализа или "latest"
+        self.accepted = accepted                # Попадает ли зависимость в граф
+
+    def __repr__(self) -> str:
+        return (f"Requirement({self.normalized_name!r}, extras={self.extras!r}, "
+                f"specifier={self.specifier!r}, markers={self.markers!r}, version={self.version!r})")
+
+
+@lru_cache(maxsize=REQUIREMENT_CACHE_SIZE)
+def normalize_package_name(name: str) -> str:
+    """Нормализует имя пакета (заменяет дефисы на подчеркивания)"""
+    if not name:
+        return name
+
+    # Заменяем дефисы на подчеркивания
+    name = name.replace('-', '_')
+
+    # Удаляем лишние символы в конце
+    name = TRAILING_JUNK_PATTERN.sub('', name)
+
+    return name.lower()
+
+
+def select_version(requirement: str) -> str:
+    """Выбирает версию из части требования без маркеров"""
+    for pattern in VERSION_PATTERNS:
+        match = pattern.search(requirement)
+        if match:
+            version = match.group(1).strip('"\'').strip()
+            # Проверяем что версия содержит хотя бы одну цифру
+            if version and DIGIT_PATTERN.search(version):
+                return version
+
+    # Если версия не указана явно, возвращаем latest
+    return "latest"
+
+
+def is_package_name(name: str) -> bool:
+    """Отсеивает имена, которые не являются пакетами (python_version, extra, ...)"""
+    return bool(name and
+                not name.startswith('python') and
+                not name.startswith('extra') and
+                len(name) > 1 and  # не слишком короткое
+                not SPECIAL_CHARS_PATTERN.search(name) and  # нет спецсимволов
+                name not in IGNORED_NAMES)
+
+
+@lru_cache(maxsize=REQUIREMENT_CACHE_SIZE)
+def parse_requirement(raw: str) -> Requirement:
+    """Разбирает строку требования; результат запоминается по исходной строке"""
+    requirement, _, markers = raw.partition(';')
+    requirement = requirement.strip()
+    markers = markers.strip()
+
+    version = select_version(requirement)
+
+    name_match = NAME_PATTERN.match(requirement)
+    if not name_match:
+        return Requirement(raw, "", "", (), requirement, markers, version, False)
+
+    name = name_match.group(1).strip()
+    rest = requirement[name_match.end():]
+
+    extras: Tuple[str, ...] = ()
+    extras_match = EXTRAS_PATTERN.match(rest)
+    if extras_match:
+        extras = tuple(extra.strip() for extra in extras_match.group(1).split(',') if extra.strip())
+        rest = rest[extras_match.end():]
+
+    # Старый формат: "name (>=1.0)"
+    specifier = rest.strip()
+    if specifier.startswith('(') and specifier.endswith(')'):
+        specifier = specifier[1:-1].strip()
+
+    normalized_name = normalize_package_name(name)
+    return Requirement(raw, name, normalized_name, extras, specifier, markers,
+                       version, is_package_name(normalized_name))
@@ -0,0 +1,223 @@
+"""
+Устойчивый HTTP-клиент: повторы с экспоненциальной задержкой, ограничение частоты
+запросов к хосту и размыкатель цепи
+"""
+
+import random
+import socket
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from typing import Dict, Tuple
+from urllib.parse import urlparse
+from network_error import NetworkError
+
+# Максимум URL в кеше ошибок, если размер кеша метаданных не ограничен
+ERROR_CACHE_SIZE = 4096
+
+
+class TokenBucket:
+    """Ограничитель частоты запросов (маркерная корзина)"""
+
+    def __init__(self, rate: float, capacity: float = 0):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Ждет, пока в корзине появится маркер, и забирает его"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+
+class CircuitBreaker:
+    """Размыкатель цепи: после серии ошибок запросы к хосту сразу отклоняются"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        # Полуоткрытое состояние: после паузы выполняется ровно один пробный запрос
+        self.probe_in_flight = False
+        self.lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Разрешен ли запрос (после паузы пропускается один пробный запрос)"""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.probe_in_flight or time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            # Остальные запросы отклоняются, пока проба не завершится успехом или ошибкой
+            self.probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            if self.probe_in_flight or (self.failure_threshold > 0 and self.failures >= self.failure_threshold):
+                # Неудачная проба снова размыкает цепь на reset_timeout
+                self.opened_at = time.monotonic()
+                self.probe_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        with self.lock:
+            return self.opened_at is not None
+
+
+class ResilientHttpClient:
+    """HTTP-клиент для реестров пакетов с повторами, ограничением частоты и размыкателем цепи"""
+
+    def __init__(self, max_retries: int = 3, rate_limit: float = 10.0,
+                 failure_threshold: int = 5, error_ttl: float = 30.0, reset_timeout: float = 30.0,
+                 timeout: float = 10, backoff_base: float = 0.5, backoff_cap: float = 8.0,
+                 error_cache_limit: int = 0, metrics=None):
+        self.max_retries = max_retries
+        self.rate_limit = rate_limit
+        self.failure_threshold = failure_threshold
+        self.error_ttl = error_ttl
+        # Секунд до пробного запроса к хосту после размыкания цепи
+        self.reset_timeout = reset_timeout
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        # Метрики запуска (RunMetrics) или None
+        self.metrics = metrics
+
+        # SSL контекст для обхода проблем с сертификатами
+        self.ssl_context = ssl.create_default_context()
+        self.ssl_context.check_hostname = False
+        self.ssl_context.verify_mode = ssl.CERT_NONE
+
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        # Кратковременный кеш ошибок: URL -> (время истечения, исключение) в порядке истечения
+        self.error_cache: Dict[str, Tuple[float, Exception]] = OrderedDict()
+        # Максимум URL в кеше ошибок (0 - ERROR_CACHE_SIZE)
+        self.error_cache_limit = error_cache_limit or ERROR_CACHE_SIZE
+        self.lock = threading.Lock()
+
+    def _host_state(self, host: str) -> Tuple[TokenBucket, CircuitBreaker]:
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.rate_limit)
+                self.breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self.buckets[host], self.breakers[host]
+
+    @staticmethod
+    def is_transient_error(error: Exception) -> bool:
+        """Временные ошибки, после которых имеет смысл повторить запрос"""
+        if isinstance(error, urllib.error.HTTPError):
+            return error.code == 429 or error.code >= 500
+        # NetworkError здесь - отказ разомкнутой цепи: хост временно недоступен
+        return isinstance(error, (urllib.error.URLError, socket.timeout, ConnectionError, TimeoutError,
+                                  NetworkError))
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Экспоненциальная задержка со случайным разбросом (full jitter)"""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def _outcome(error: Exception) -> str:
+        """Результат запроса для метрик: код HTTP или класс ошибки"""
+        if isinstance(error, urllib.error.HTTPError):
+            return str(error.code)
+        return type(error).__name__
+
+    def fetch(self, url: str) -> bytes:
+        """Загружает содержимое URL; при неудаче выбрасывает исходное исключение или NetworkError"""
+        host = urlparse(url).netloc
+
+        with self.lock:
+            cached_error = self.error_cache.get(url)
+            if cached_error and time.monotonic() >= cached_error[0]:
+                self.error_cache.pop(url, None)
+                cached_error = None
+        if cached_error:
+            if self.metrics is not None:
+                self.metrics.inc('http_error_cache_hits_total', {'host': host})
+            raise cached_error[1]
+
+        bucket, breaker = self._host_state(host)
+
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if not breaker.allow_request():
+                if self.metrics is not None:
+                    self.metrics.inc('http_circuit_open_total', {'host': host})
+                # Цепь могла разомкнуться на этом же запросе: его ошибка сохраняется как причина
+                message = f"Хост {host} временно недоступен (слишком много ошибок подряд)"
+                if last_error is not None:
+                    message += f", последняя ошибка: {last_error}"
+                circuit_error = NetworkError(message)
+                circuit_error.__cause__ = last_error
+                last_error = circuit_error
+                break
+
+            if attempt and self.metrics is not None:
+                self.metrics.inc('http_retries_total', {'host': host})
+
+            bucket.acquire()
+            started_at = time.monotonic()
+            try:
+                request = urllib.request.Request(url)
+                with urllib.request.urlopen(request, timeout=self.timeout, context=self.ssl_context) as response:
+                    data = response.read()
+                breaker.record_success()
+                if self.metrics is not None:
+                    self.metrics.inc('http_requests_total', {'host': host, 'outcome': str(response.status)})
+                    self.metrics.observe('http_request_seconds', time.monotonic() - started_at, {'host': host})
+                    self.metrics.observe('http_response_bytes', len(data), {'host': host})
+                return data
+            except Exception as e:
+                last_error = e
+                if self.metrics is not None:
+                    self.metrics.inc('http_requests_total', {'host': host, 'outcome': self._outcome(e)})
+                    self.metrics.observe('http_request_seconds', time.monotonic() - started_at, {'host': host})
+                if not self.is_transient_error(e):
+                    # Хост ответил (например, 404) - он исправен, повторять бессмысленно
+                    breaker.record_success()
+                    break
+                breaker.record_failure()
+                if attempt < self.max_retries:
+                    time.sleep(self._backoff_delay(attempt))
+
+        if self.error_ttl > 0:
+            self._remember_error(url, last_error)
+        raise last_error
+
+    def _remember_error(self, url: str, error: Exception) -> None:
+        """Кеширует ошибку URL, вытесняя истекшие и самые старые записи"""
+        now = time.monotonic()
+        with self.lock:
+            self.error_cache.pop(url, None)
+            self.error_cache[url] = (now + self.error_ttl, error)
+            # Срок хранения у всех записей одинаковый: истекшие находятся в начале
+            while self.error_cache:
+                expires_at, _ = next(iter(self.error_cache.values()))
+                if expires_at > now and len(self.error_cache) <= self.error_cache_limit:
+                    break
+                self.error_cache.popitem(last=False)
@@ -0,0 +1,76 @@
+"""
+Кеш результатов анализа: готовые графы и разрешенные узлы
+
+Кеш принадлежит клиенту репозиториев и сбрасывается вместе с кешем
+метаданных, поэтому графы не переживают метаданные, из которых построены.
+Кеш живет только в памяти процесса; между запусками узлы переносит журнал
+контрольной точки (checkpoint_journal).
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+# Максимум готовых графов в кеше
+RESULT_CACHE_SIZE = 16
+
+# (тип репозитория из конфигурации, URL, тестовый режим, имя, запрошенная версия)
+NodeKey = Tuple[str, str, bool, str, str]
+# (тип репозитория из конфигурации, URL, тестовый режим, имя корня, версия корня, глубина, фильтр)
+GraphKey = Tuple[str, str, bool, str, str, int, str]
+
+
+class ResultCache:
+    """Готовые графы по ключу запроса и зависимости каждого разрешенного узла
+
+    Зависимости узлов не зависят от глубины и фильтра, поэтому анализ с большей
+    глубиной проходит уже построенную часть графа по памяти и обращается
+    к репозиторию только за узлами за ее границей.
+    """
+
+    def __init__(self, graph_limit: int = RESULT_CACHE_SIZE, node_limit: int = 0):
+        # Ключ графа -> (дерево, анализатор со статистикой анализа)
+        self.graphs: Dict[GraphKey, Tuple[Dict[str, Any], Any]] = OrderedDict()
+        self.graph_limit = graph_limit
+        # Ключ узла -> (фактическая версия, зависимости {имя: версия})
+        self.nodes: Dict[NodeKey, Tuple[str, Dict[str, str]]] = OrderedDict()
+        # Максимум узлов (0 - без ограничения), как у кеша метаданных
+        self.node_limit = node_limit
+        self.lock = threading.Lock()
+
+    def resolved(self, node_key: NodeKey) -> Optional[Tuple[str, Dict[str, str]]]:
+        """Фактическая версия и зависимости узла или None"""
+        with self.lock:
+            resolved = self.nodes.get(node_key)
+            if resolved is not None and self.node_limit:
+                self.nodes.move_to_end(node_key)
+            return resolved
+
+    def remember(self, node_key: NodeKey, actual_version: str, dependencies: Dict[str, str]) -> None:
+        with self.lock:
+            self.nodes[node_key] = (actual_version, dependencies)
+            if self.node_limit:
+                while len(self.nodes) > self.node_limit:
+                    self.nodes.popitem(last=False)
+
+    def get_graph(self, graph_key: GraphKey) -> Optional[Tuple[Dict[str, Any], Any]]:
+        with self.lock:
+            cached = self.graphs.get(graph_key)
+            if cached is not None:
+                self.graphs.move_to_end(graph_key)
+            return cached
+
+    def put_graph(self, graph_key: GraphKey, tree: Dict[str, Any], analyzer) -> None:
+        with self.lock:
+            self.graphs[graph_key] = (tree, analyzer)
+            self.graphs.move_to_end(graph_key)
+            while len(self.graphs) > self.graph_limit:
+                self.graphs.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.graphs.clear()
+            self.nodes.clear()
+
+    def __len__(self) -> int:
+        return len(self.graphs)
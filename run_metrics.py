@@ -0,0 +1,229 @@
+"""
+Метрики запуска: счетчики и гистограммы загрузок, кешей и скорости анализа
+
+Отчет сохраняется в JSON и в текстовом формате Prometheus (для textfile
+collector в node exporter).
+"""
+
+import bisect
+import json
+import os
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+# Границы корзин гистограмм: секунды и байты
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Имя метрики -> (тип, описание, границы корзин для гистограмм)
+METRIC_DEFINITIONS = {
+    'http_requests_total': ('counter', "HTTP-запросы к реестрам по хосту и результату", None),
+    'http_retries_total': ('counter', "Повторные HTTP-запросы после временных ошибок", None),
+    'http_error_cache_hits_total': ('counter', "Запросы, отклоненные по кешу ошибок", None),
+    'http_circuit_open_total': ('counter', "Запросы, отклоненные разомкнутой цепью", None),
+    'http_request_seconds': ('histogram', "Длительность одного HTTP-запроса", LATENCY_BUCKETS),
+    'http_response_bytes': ('histogram', "Размер ответа реестра", SIZE_BUCKETS),
+    'package_fetch_seconds': ('histogram', "Получение метаданных пакета бэкендом (с повторами)", LATENCY_BUCKETS),
+    'package_fetch_errors_total': ('counter', "Ошибки получения метаданных по бэкенду и типу", None),
+    'metadata_cache_hits_total': ('counter', "Попадания в кеш метаданных пакетов", None),
+    'metadata_cache_misses_total': ('counter', "Промахи кеша метаданных пакетов", None),
+    'requirement_cache_hits_total': ('counter', "Попадания в кеш разбора требований PyPI", None),
+    'requirement_cache_misses_total': ('counter', "Промахи кеша разбора требований PyPI", None),
+    'nodes_resolved_total': ('counter', "Проанализированные узлы графа", None),
+    'result_cache_hits_total': ('counter', "Графы, взятые из кеша результатов целиком", None),
+    'result_cache_nodes_total': ('counter', "Узлы, зависимости которых взяты из кеша результатов", None),
+    'memo_hits_total': ('counter', "Повторные узлы, взятые из таблицы посещенных", None),
+    'nodes_truncated_total': ('counter', "Узлы, отсеченные бюджетом анализа", None),
+    'analysis_seconds': ('gauge', "Суммарное время анализа графа", None),
+    'nodes_per_second': ('gauge', "Скорость анализа графа", None),
+    'metadata_cache_hit_ratio': ('gauge', "Доля попаданий в кеш метаданных", None),
+    'memo_hit_ratio': ('gauge', "Доля повторных узлов среди всех посещений", None),
+    'run_duration_seconds': ('gauge', "Длительность запуска", None),
+    'run_success': ('gauge', "1 - запуск завершен успешно", None),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Гистограмма с фиксированными границами корзин"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # последняя корзина - +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(граница, число наблюдений не больше границы) для формата Prometheus"""
+        result = []
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            result.append((str(bound), running))
+        result.append(("+Inf", self.count))
+        return result
+
+
+class RunMetrics:
+    """Потокобезопасный набор метрик одного запуска"""
+
+    PREFIX = "dependency_visualizer_"
+
+    def __init__(self):
+        # Имя -> {метки -> значение или гистограмма}
+        self.values: Dict[str, Dict[Labels, Any]] = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _labels(labels: Optional[Dict[str, str]]) -> Labels:
+        return tuple(sorted((labels or {}).items()))
+
+    def inc(self, name: str, labels: Optional[Dict[str, str]] = None, amount: float = 1) -> None:
+        key = self._labels(labels)
+        with self.lock:
+            series = self.values.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        with self.lock:
+            self.values.setdefault(name, {})[self._labels(labels)] = value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        key = self._labels(labels)
+        with self.lock:
+            series = self.values.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(METRIC_DEFINITIONS[name][2])
+            histogram.observe(value)
+
+    def total(self, name: str) -> float:
+        """Сумма счетчика по всем меткам"""
+        with self.lock:
+            return sum(self.values.get(name, {}).values())
+
+    def record_fetch(self, backend: str, elapsed: float, error: Optional[Exception] = None) -> None:
+        """Получение метаданных пакета бэкендом"""
+        self.observe('package_fetch_seconds', elapsed, {'backend': backend})
+        if error is not None:
+            from graph_statistics import GraphStatistics
+            self.inc('package_fetch_errors_total',
+                     {'backend': backend, 'type': GraphStatistics.classify_error(str(error))})
+
+    def record_analysis(self, analyzer, elapsed: float) -> None:
+        """Итоги одного анализа графа (при постепенном углублении их несколько)"""
+        self.inc('nodes_resolved_total', amount=analyzer.nodes_analyzed)
+        self.inc('memo_hits_total', amount=analyzer.repeated_nodes)
+        self.inc('result_cache_nodes_total', amount=analyzer.reused_nodes)
+        self.inc('nodes_truncated_total', amount=analyzer.truncated_nodes)
+        self.inc('analysis_seconds', amount=elapsed)
+
+    def finalize(self, run_duration: float) -> None:
+        """Вычисляет производные показатели перед сохранением"""
+        from requirement_parser import parse_requirement
+
+        cache_info = parse_requirement.cache_info()
+        self.set('requirement_cache_hits_total', cache_info.hits)
+        self.set('requirement_cache_misses_total', cache_info.misses)
+
+        analysis_seconds = self.total('analysis_seconds')
+        nodes = self.total('nodes_resolved_total')
+        self.set('nodes_per_second', nodes / analysis_seconds if analysis_seconds > 0 else 0.0)
+
+        hits = self.total('metadata_cache_hits_total')
+        lookups = hits + self.total('metadata_cache_misses_total')
+        self.set('metadata_cache_hit_ratio', hits / lookups if lookups else 0.0)
+
+        memo_hits = self.total('memo_hits_total')
+        visits = memo_hits + nodes
+        self.set('memo_hit_ratio', memo_hits / visits if visits else 0.0)
+
+        self.set('run_duration_seconds', run_duration)
+        if 'run_success' not in self.values:
+            self.set('run_success', 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Метрики в виде словаря для JSON"""
+        result = {}
+        with self.lock:
+            for name in sorted(self.values):
+                series = []
+                for labels, value in sorted(self.values[name].items()):
+                    entry: Dict[str, Any] = {'labels': dict(labels)}
+                    if isinstance(value, Histogram):
+                        entry.update({
+                            'count': value.count,
+                            'sum': value.total,
+                            'buckets': dict(value.cumulative()),
+                        })
+                    else:
+                        entry['value'] = value
+                    series.append(entry)
+                result[name] = {'type': METRIC_DEFINITIONS[name][0], 'series': series}
+        return result
+
+    @staticmethod
+    def _format_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = labels + extra
+        if not pairs:
+            return ""
+        escaped = (
+            key + '="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+            for key, value in pairs
+        )
+        return "{" + ",".join(escaped) + "}"
+
+    @staticmethod
+    def _format_value(value: float) -> str:
+        """Значение в формате Prometheus: целые без округления, дробные - с полной точностью"""
+        if isinstance(value, int):
+            return str(int(value))
+        value = float(value)
+        if value != value:
+            return "NaN"
+        if value in (float('inf'), float('-inf')):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+
+    def to_prometheus(self) -> str:
+        """Метрики в текстовом формате Prometheus"""
+        lines = []
+        with self.lock:
+            for name in sorted(self.values):
+                metric_type, description, _ = METRIC_DEFINITIONS[name]
+                full_name = self.PREFIX + name
+                lines.append(f"# HELP {full_name} {description}")
+                lines.append(f"# TYPE {full_name} {metric_type}")
+                for labels, value in sorted(self.values[name].items()):
+                    if isinstance(value, Histogram):
+                        for bound, count in value.cumulative():
+                            lines.append(f"{full_name}_bucket{self._format_labels(labels, (('le', bound),))} {count}")
+                        lines.append(f"{full_name}_sum{self._format_labels(labels)} {self._format_value(value.total)}")
+                        lines.append(f"{full_name}_count{self._format_labels(labels)} {value.count}")
+                    else:
+                        lines.append(f"{full_name}{self._format_labels(labels)} {self._format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def save(self, filename: str) -> Tuple[str, str]:
+        """Сохраняет <имя>.json и <имя>.prom; файл .prom заменяется атомарно"""
+        stem, extension = os.path.splitext(filename)
+        if extension.lower() not in ('.json', '.prom'):
+            stem = filename
+        json_file = f"{stem}.json"
+        prom_file = f"{stem}.prom"
+
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+        # node exporter не должен прочитать наполовину записанный файл
+        temporary_file = f"{prom_file}.tmp"
+        with open(temporary_file, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(temporary_file, prom_file)
+        return json_file, prom_file
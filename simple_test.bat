@@ -181,6 +181,16 @@ if %errorlevel% equ 0 (
 )
 echo.
 
+echo ТЕСТ 8: Модульные тесты (tests/)
+echo.
+python -m unittest discover -s tests -t .
+if %errorlevel% equ 0 (
+    echo ТЕСТ 8 ПРОЙДЕН: Модульные тесты
+) else (
+    echo ТЕСТ 8 НЕ ПРОЙДЕН: Модульные тесты
+)
+echo.
+
 echo Очистка временных файлов...
 del test1.yaml 2>nul
 del test2.yaml 2>nul
@@ -10,6 +10,9 @@ from typing import Dict, Any, Optional
 class TestRepository:
     """Класс для работы с локальным тестовым репозиторием"""
     
+    # Данные для офлайн-режима, а не набор тестов: pytest не собирает этот класс
+    __test__ = False
+    
     def __init__(self, repo_path: str = "./test-repo"):
         # Нормализуем путь - преобразуем относительные пути в абсолютные
         # Сохраняем оригинальный путь для отладки
@@ -0,0 +1,3 @@
+"""
+Тесты визуализатора зависимостей (запуск: python -m unittest discover -s tests -t .)
+"""
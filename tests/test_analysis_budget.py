@@ -0,0 +1,70 @@
+"""
+Тесты бюджета анализа: граница графа после исчерпания max_nodes или time_budget
+"""
+
+import contextlib
+import io
+import itertools
+import os
+import unittest
+from unittest import mock
+from dependency_analyzer import DependencyAnalyzer
+from dependency_visualizer import DependencyVisualizer
+from graph_statistics import GraphStatistics
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# PACKAGEA -> B, C; B -> D, E; C -> F; D -> G
+UPPERCASE_REPO = os.path.join(REPO_ROOT, 'test_uppercase_repo.txt')
+
+
+def truncated_names(tree):
+    names = [tree['name']] if tree.get('truncated') else []
+    for child in tree['dependencies'].values():
+        names.extend(truncated_names(child))
+    return names
+
+
+class AnalysisBudgetTest(unittest.TestCase):
+
+    def analyze(self, **budget):
+        analyzer = DependencyAnalyzer(max_depth=5, **budget)
+        with contextlib.redirect_stdout(io.StringIO()):
+            tree = analyzer.analyze_package('PACKAGEA', 'latest', UPPERCASE_REPO)
+        return analyzer, tree
+
+    def test_without_budget_nothing_truncated(self):
+        analyzer, tree = self.analyze()
+        self.assertEqual(analyzer.nodes_analyzed, 7)
+        self.assertEqual(analyzer.truncated_nodes, 0)
+        self.assertEqual(analyzer.truncation_reason, "")
+        self.assertEqual(truncated_names(tree), [])
+
+    def test_max_nodes_truncates_frontier(self):
+        analyzer, tree = self.analyze(max_nodes=3)
+
+        self.assertEqual(analyzer.nodes_analyzed, 3)
+        self.assertIn("лимит узлов (3)", analyzer.truncation_reason)
+        # Обход в глубину: A, B, D разрешены, их непосещенные дети - граница графа
+        self.assertEqual(truncated_names(tree), ['PACKAGEG', 'PACKAGEE', 'PACKAGEC'])
+        self.assertEqual(analyzer.truncated_nodes, 3)
+        self.assertEqual(tree['dependencies']['PACKAGEC']['dependencies'], {})
+
+        self.assertEqual(GraphStatistics(tree).truncated_nodes, 3)
+        lines = list(DependencyVisualizer.format_tree_lines(tree))
+        self.assertEqual(sum(1 for line in lines if line.endswith("[УСЕЧЕНО]")), 3)
+
+    def test_time_budget_truncates(self):
+        # Каждое обращение к часам - одна секунда
+        clock = itertools.count()
+        with mock.patch('dependency_analyzer.time.monotonic', side_effect=lambda: float(next(clock))):
+            analyzer, tree = self.analyze(time_budget=2.5)
+
+        self.assertIn("бюджет времени (2.5 с)", analyzer.truncation_reason)
+        self.assertGreater(analyzer.truncated_nodes, 0)
+        self.assertLess(analyzer.nodes_analyzed, 7)
+        self.assertEqual(analyzer.nodes_analyzed + analyzer.truncated_nodes,
+                         GraphStatistics(tree).total_nodes)
+
+
+if __name__ == '__main__':
+    unittest.main()
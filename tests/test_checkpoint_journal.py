@@ -0,0 +1,106 @@
+"""
+Тесты журнала контрольной точки: продолжение усеченного или прерванного анализа
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from checkpoint_journal import CheckpointJournal
+from dependency_visualizer import DependencyVisualizer
+from mock_registry_server import RegistryCorpus, MockRegistryServer
+
+
+class CheckpointResumeTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = MockRegistryServer(RegistryCorpus.generate(120, 3, seed=7, payload_versions=2))
+        cls.url = cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.journal = os.path.join(self.directory.name, 'checkpoint.jsonl')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def make_visualizer(self, **options):
+        visualizer = DependencyVisualizer.__new__(DependencyVisualizer)
+        visualizer.config = {name: default for name, (_, default) in DependencyVisualizer.OPTIONAL_PARAMETERS.items()}
+        visualizer.config.update(package_name='pkg-000', repository_url=self.url, test_repository_mode=False,
+                                 package_version='latest', output_filename='graph.txt', ascii_tree_output=False,
+                                 max_depth=4, filter_substring='', repository_type='npm', http_rate_limit=0)
+        visualizer.config.update(options)
+        visualizer.analyzer = None
+        visualizer.graph_store = None
+        visualizer.metrics = None
+        visualizer.output_capture = None
+        visualizer.checkpoint = None
+        visualizer.repository_client = None
+        return visualizer
+
+    def analyze(self, **options):
+        """(дерево, анализатор, число HTTP-запросов к реестру) одного запуска"""
+        visualizer = self.make_visualizer(**options)
+        requests_before = self.server.stats['requests']
+        with contextlib.redirect_stdout(io.StringIO()):
+            if visualizer.config['checkpoint_file']:
+                visualizer.open_checkpoint()
+            try:
+                tree = visualizer.analyze_real_dependencies()
+            finally:
+                visualizer.close_checkpoint()
+                visualizer.close_repository_client()
+        return tree, visualizer.analyzer, self.server.stats['requests'] - requests_before
+
+    def test_resume_completes_truncated_graph(self):
+        full_tree, full_analyzer, _ = self.analyze()
+
+        partial_tree, analyzer, _ = self.analyze(max_nodes=10, checkpoint_file=self.journal)
+        self.assertTrue(analyzer.truncation_reason)
+        with open(self.journal, encoding='utf-8') as journal:
+            self.assertEqual(sum(1 for _ in journal), 10)
+
+        resumed_tree, analyzer, requests = self.analyze(checkpoint_file=self.journal, resume=True)
+        self.assertEqual(json.dumps(resumed_tree, sort_keys=True), json.dumps(full_tree, sort_keys=True))
+        # Узлы из журнала не запрашиваются повторно
+        self.assertEqual(analyzer.reused_nodes, 10)
+        self.assertEqual(analyzer.nodes_analyzed - analyzer.reused_nodes, full_analyzer.nodes_analyzed - 10)
+        self.assertLessEqual(requests, full_analyzer.nodes_analyzed - 10)
+
+    def test_partial_last_line_is_dropped(self):
+        self.analyze(max_nodes=5, checkpoint_file=self.journal)
+        # Сбой во время записи: последняя строка не дописана
+        with open(self.journal, 'a', encoding='utf-8') as journal:
+            journal.write('{"key": ["npm", "http://x", false, "pkg-0')
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            journal = CheckpointJournal(self.journal, resume=True)
+            journal.record(('npm', self.url, False, 'extra', 'latest'), '1.0.0', {})
+            journal.close()
+        self.assertEqual(journal.skipped_lines, 1)
+        self.assertEqual(len(journal.entries), 5)
+
+        # После отрезанного хвоста новая запись читается целиком
+        with contextlib.redirect_stdout(io.StringIO()):
+            reloaded = CheckpointJournal(self.journal, resume=True)
+            reloaded.close()
+        self.assertEqual(reloaded.skipped_lines, 0)
+        self.assertEqual(len(reloaded.entries), 6)
+
+    def test_without_resume_journal_starts_over(self):
+        self.analyze(max_nodes=5, checkpoint_file=self.journal)
+        self.analyze(max_nodes=3, checkpoint_file=self.journal)
+        with open(self.journal, encoding='utf-8') as journal:
+            self.assertEqual(sum(1 for _ in journal), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Тесты обратного индекса: кто зависит от пакета, кратчайший путь и все пути
+"""
+
+import unittest
+from dependency_index import DependencyIndex
+
+
+def node(name, *children, version="1.0", **extra):
+    result = {"name": name, "version": version, "dependencies": {child["name"]: child for child in children}}
+    result.update(extra)
+    return result
+
+
+def sample_tree():
+    # app -> web -> http -> util
+    #     -> db -> util
+    #     -> cli -> http (повтор, поддерево уже выведено)
+    #     -> util@2.0
+    return node("app",
+                node("web", node("http", node("util"))),
+                node("db", node("util")),
+                node("cli", node("http", cached=True)),
+                node("util", version="2.0"))
+
+
+class DependencyIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = DependencyIndex(sample_tree())
+
+    def test_reverse_dependencies(self):
+        # Родители в порядке обхода в ширину
+        self.assertEqual(self.index.reverse_dependencies("util"), ["app", "db", "http"])
+        self.assertEqual(self.index.reverse_dependencies("http"), ["web", "cli"])
+        self.assertEqual(self.index.fan_in("http"), 2)
+        self.assertEqual(self.index.reverse_dependencies("app"), [])
+        self.assertEqual(self.index.reverse_dependencies("missing"), [])
+
+    def test_shortest_path(self):
+        self.assertEqual(self.index.shortest_path("util"), ["app", "util"])
+        self.assertEqual(self.index.shortest_path("http"), ["app", "web", "http"])
+        self.assertEqual(self.index.shortest_path("app"), ["app"])
+        self.assertEqual(self.index.shortest_path("missing"), [])
+        self.assertEqual(self.index.depth["http"], 2)
+
+    def test_all_paths(self):
+        self.assertEqual(self.index.all_paths("util"), [
+            ["app", "util"],
+            ["app", "db", "util"],
+            ["app", "web", "http", "util"],
+            ["app", "cli", "http", "util"],
+        ])
+        self.assertEqual(self.index.all_paths("missing"), [])
+
+    def test_versions_and_packages(self):
+        self.assertEqual(self.index.versions["util"], ["2.0", "1.0"])
+        self.assertIn("cli", self.index)
+        self.assertEqual(sorted(self.index.packages()), ["app", "cli", "db", "http", "util", "web"])
+
+    def test_cycle_paths_are_simple(self):
+        # Цикл X -> Y -> Z -> X: повторный X выводится без детей
+        index = DependencyIndex(node("X", node("Y", node("Z", node("X", cached=True)))))
+        self.assertEqual(index.reverse_dependencies("X"), ["Z"])
+        self.assertEqual(index.all_paths("Z"), [["X", "Y", "Z"]])
+        self.assertEqual(index.shortest_path("Z"), ["X", "Y", "Z"])
+
+
+if __name__ == '__main__':
+    unittest.main()
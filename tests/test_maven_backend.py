@@ -0,0 +1,72 @@
+"""
+Тесты бэкенда Maven на каталоге test_maven_repo: родители, BOM и управляемые версии
+"""
+
+import contextlib
+import io
+import os
+import threading
+import unittest
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from repository_client import RepositoryClient
+
+MAVEN_REPO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'test_maven_repo')
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class MavenBackendTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), partial(QuietHandler, directory=MAVEN_REPO))
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.client = RepositoryClient(http_options={'max_retries': 0, 'rate_limit': 0})
+        self.backend = self.client.get_backend('maven')
+
+    def tearDown(self):
+        self.client.close()
+
+    def fetch(self, package_name, version="latest"):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.backend.fetch(package_name, version, self.url)
+
+    def test_versions_managed_by_parent_bom(self):
+        info = self.fetch('com.example:app')
+        self.assertEqual(info['version'], '1.0')
+        # junit (test) не попадает в граф; версии - из BOM, импортированного родителем
+        self.assertEqual(info['dependencies'], {
+            'com.example:core': '1.2',
+            'com.example:util': '1.1',
+            'org.slf4j:slf4j-api': '2.0.9',
+        })
+
+    def test_child_management_precedence(self):
+        # Собственная запись ребенка важнее его BOM, BOM ребенка важнее родителя
+        info = self.fetch('com.example:service', '1.0')
+        self.assertEqual(info['dependencies'], {
+            'com.example:util': '1.2',
+            'com.example:core': '1.2',
+            'org.slf4j:slf4j-api': '2.0.9',
+        })
+
+    def test_optional_and_interpolated_dependencies(self):
+        info = self.fetch('com.example:core', '1.2')
+        self.assertEqual(info['dependencies'], {'com.example:util': '1.2'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Тесты текстового формата Prometheus для метрик запуска
+"""
+
+import unittest
+from run_metrics import RunMetrics
+
+
+def parse_samples(text):
+    """Строки образцов Prometheus -> {имя с метками: значение}"""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith('#'):
+            continue
+        name, value = line.rsplit(' ', 1)
+        samples[name] = value
+    return samples
+
+
+class PrometheusFormatTest(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = RunMetrics()
+
+    def test_large_counter_keeps_all_digits(self):
+        self.metrics.inc('http_requests_total', {'host': 'registry', 'status': 'ok'}, 1234567)
+        samples = parse_samples(self.metrics.to_prometheus())
+
+        value = samples['dependency_visualizer_http_requests_total{host="registry",status="ok"}']
+        self.assertEqual(value, "1234567")
+        self.assertEqual(int(value), 1234567)
+
+    def test_float_values_round_trip(self):
+        self.metrics.set('analysis_seconds', 1234567.891011)
+        self.metrics.observe('http_response_bytes', 12345678.5, {'host': 'registry'})
+        self.metrics.observe('http_response_bytes', 2000001, {'host': 'registry'})
+        samples = parse_samples(self.metrics.to_prometheus())
+
+        self.assertEqual(float(samples['dependency_visualizer_analysis_seconds']), 1234567.891011)
+        self.assertEqual(float(samples['dependency_visualizer_http_response_bytes_sum{host="registry"}']),
+                         12345678.5 + 2000001)
+        self.assertEqual(samples['dependency_visualizer_http_response_bytes_count{host="registry"}'], "2")
+
+    def test_histogram_buckets_are_cumulative(self):
+        for size in (100, 5000, 5000, 20000000):
+            self.metrics.observe('http_response_bytes', size, {'host': 'registry'})
+        samples = parse_samples(self.metrics.to_prometheus())
+
+        prefix = 'dependency_visualizer_http_response_bytes_bucket{host="registry",le='
+        self.assertEqual(samples[prefix + '"1024"}'], "1")
+        self.assertEqual(samples[prefix + '"16384"}'], "3")
+        self.assertEqual(samples[prefix + '"16777216"}'], "3")
+        self.assertEqual(samples[prefix + '"+Inf"}'], "4")
+
+    def test_special_float_values(self):
+        self.assertEqual(RunMetrics._format_value(float('inf')), "+Inf")
+        self.assertEqual(RunMetrics._format_value(float('nan')), "NaN")
+        self.assertEqual(RunMetrics._format_value(0.1), "0.1")
+
+
+if __name__ == '__main__':
+    unittest.main()
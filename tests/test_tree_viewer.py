@@ -0,0 +1,136 @@
+"""
+Тесты модели просмотрщика дерева: номера строк, смещения поддеревьев и поиск
+"""
+
+import io
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+from tree_viewer import TreeView, TextBrowser
+
+
+def node(name, *children):
+    return {
+        "name": name,
+        "version": "1.0",
+        "dependencies": {child["name"]: child for child in children},
+    }
+
+
+def sample_tree():
+    # root
+    # ├── a
+    # │   ├── b
+    # │   │   └── c
+    # │   └── d
+    # ├── e
+    # │   └── c
+    # └── f
+    return node("root",
+                node("a", node("b", node("c")), node("d")),
+                node("e", node("c")),
+                node("f"))
+
+
+def visible_rows(view):
+    """Видимые строки прямым обходом раскрытых узлов (эталон для арифметики смещений)"""
+    rows = []
+
+    def visit(current):
+        rows.append(current)
+        if current.expanded:
+            for child in current.children:
+                visit(child)
+
+    visit(view.root)
+    return rows
+
+
+class TreeViewRowsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.view = TreeView(sample_tree())
+
+    def assert_rows_consistent(self):
+        rows = visible_rows(self.view)
+        self.assertEqual(self.view.total_rows, len(rows))
+        for row, expected in enumerate(rows):
+            self.assertIs(self.view.node_at(row), expected)
+            self.assertEqual(self.view.row_of(expected), row)
+        self.assertEqual(list(self.view.nodes_from(0, len(rows) + 5)), rows)
+
+    def test_only_root_children_visible_initially(self):
+        self.assertEqual(self.view.total_rows, 4)
+        self.assertEqual([n.tree["name"] for n in self.view.nodes_from(0, 10)], ["root", "a", "e", "f"])
+        self.assertEqual(self.view.format_row(self.view.node_at(1)), "    ├── a@1.0 [+2]")
+        self.assert_rows_consistent()
+
+    def test_expand_and_collapse_update_offsets(self):
+        a = self.view.node_at(1)
+        self.view.expand(a)
+        self.assertEqual(self.view.total_rows, 6)
+        self.assertEqual(self.view.root.offsets(), [0, 3, 4])
+        self.assert_rows_consistent()
+
+        b = self.view.node_at(2)
+        self.view.expand(b)
+        self.assertEqual(self.view.total_rows, 7)
+        self.assertEqual(self.view.node_at(3).tree["name"], "c")
+        self.assertEqual(self.view.root.offsets(), [0, 4, 5])
+        self.assert_rows_consistent()
+
+        # Свернутый узел запоминает раскрытых детей, но их строки не видны
+        self.view.collapse(a)
+        self.assertEqual(self.view.total_rows, 4)
+        self.assert_rows_consistent()
+        self.view.expand(a)
+        self.assertEqual(self.view.total_rows, 7)
+        self.assert_rows_consistent()
+
+    def test_node_at_clamps_row(self):
+        self.assertIs(self.view.node_at(-5), self.view.root)
+        self.assertEqual(self.view.node_at(100).tree["name"], "f")
+        self.assertEqual(list(self.view.nodes_from(100, 3)), [])
+
+    def test_search_reveals_and_wraps(self):
+        first = self.view.search("c")
+        self.assertEqual(self.view.path_of(first), [0, 0, 0])
+        self.assertEqual(self.view.row_of(first), 3)
+
+        second = self.view.search("c", first)
+        self.assertEqual(self.view.path_of(second), [1, 0])
+
+        # После последнего вхождения поиск продолжается с начала дерева
+        self.assertIs(self.view.search("c", second), first)
+        self.assertIsNone(self.view.search("missing"))
+        self.assert_rows_consistent()
+
+    def test_search_after_last_row_wraps_to_self(self):
+        f = self.view.node_at(3)
+        self.assertIs(self.view.search("f", f), f)
+
+
+class TextBrowserTest(unittest.TestCase):
+
+    def run_commands(self, browser, commands):
+        output = io.StringIO()
+        with mock.patch('builtins.input', side_effect=list(commands) + ['q']), redirect_stdout(output):
+            browser.run()
+        return output.getvalue()
+
+    def test_top_clamped_after_collapse(self):
+        root = node("root", *[node(f"p{i}", *[node(f"p{i}-{j}") for j in range(3)]) for i in range(3)])
+        view = TreeView(root)
+        browser = TextBrowser(view)
+        browser.PAGE_SIZE = 3
+
+        output = self.run_commands(browser, ["t 2", "", "", "t 2"])
+
+        self.assertEqual(view.total_rows, 4)
+        self.assertEqual(browser.top, 1)
+        self.assertIn("строки 2-4 из 4", output)
+        self.assertNotIn("строки 7-4", output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Тесты разбора UPPERCASE репозитория: параллельный разбор частями совпадает с разбором подряд
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+import uppercase_repository
+from config_error import ConfigError
+from uppercase_repository import UppercaseRepository
+
+
+def generate_repository(count, bad_line_at=None, duplicate=None, newline='\n'):
+    """Текст репозитория из count пакетов; номера пакетов для ошибки формата и повтора"""
+    lines = ["# Сгенерированный репозиторий"]
+    for number in range(count):
+        name = f"PKG{number}"
+        if duplicate is not None and number == duplicate[1]:
+            name = f"PKG{duplicate[0]}"
+        lines.append(name)
+        if number == bad_line_at:
+            lines.append("not a package")
+        dependencies = [f"PKG{(number * 7 + step) % count}" for step in range(1, number % 4 + 1)]
+        if dependencies:
+            lines.append("    " + ", ".join(dependencies[:2]))
+        if len(dependencies) > 2:
+            lines.append("\t" + dependencies[2])
+        if number % 5 == 0:
+            lines.append("")
+    return newline.join(lines) + newline
+
+
+class UppercaseParallelParseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.repo_path = os.path.join(self.directory.name, 'repo.txt')
+        # Небольшой файл делится на много частей, а границы ищутся маленькими блоками
+        patches = [mock.patch.object(uppercase_repository, 'PARALLEL_PARSE_THRESHOLD', 1),
+                   mock.patch.object(uppercase_repository, 'SPLIT_WINDOW_SIZE', 7)]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def load(self, parse_workers):
+        """(пакеты, текст ошибки) после разбора с указанным числом процессов"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                return UppercaseRepository(self.repo_path, parse_workers=parse_workers).packages, None
+            except ConfigError as e:
+                return None, str(e)
+
+    def assert_same_as_serial(self, content):
+        with open(self.repo_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        serial = self.load(0)
+        for workers in (1, 3):
+            with self.subTest(parse_workers=workers):
+                self.assertEqual(self.load(workers), serial)
+        return serial
+
+    def test_packages_identical(self):
+        packages, error = self.assert_same_as_serial(generate_repository(600))
+        self.assertIsNone(error)
+        self.assertEqual(len(packages), 600)
+        self.assertEqual(packages['PKG3'], ('PKG22', 'PKG23', 'PKG24'))
+        self.assertEqual(list(packages)[:3], ['PKG0', 'PKG1', 'PKG2'])
+
+    def test_crlf_line_endings(self):
+        self.assertIsNone(self.assert_same_as_serial(generate_repository(300, newline='\r\n'))[1])
+
+    def test_format_error_line_number(self):
+        _, error = self.assert_same_as_serial(generate_repository(600, bad_line_at=450))
+        self.assertIn("Некорректный формат в строке", error)
+        self.assertIn("not a package", error)
+
+    def test_duplicate_across_chunks(self):
+        # Повтор пакета из начала файла в его конце: части разбираются в разных процессах
+        _, error = self.assert_same_as_serial(generate_repository(600, duplicate=(10, 590)))
+        self.assertIn("Дублирующийся пакет PKG10", error)
+
+    def test_first_error_wins(self):
+        _, error = self.assert_same_as_serial(
+            generate_repository(600, bad_line_at=500, duplicate=(5, 100), newline='\r\n'))
+        self.assertIn("Дублирующийся пакет PKG5", error)
+
+    def test_error_line_matches_file(self):
+        content = generate_repository(400, bad_line_at=321)
+        line_number = content.split('\n').index("not a package") + 1
+        _, error = self.assert_same_as_serial(content)
+        self.assertIn(f"в строке {line_number}:", error)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,475 @@
+"""
+Интерактивный просмотр дерева зависимостей в терминале
+
+Строки дерева не формируются заранее: раскрытые узлы хранят число видимых
+строк своего поддерева, поэтому строка по номеру находится спуском от корня,
+а на экран выводится только видимое окно. Узлы раскрываются и сворачиваются
+по запросу, поиск использует индекс пакетов (DependencyIndex).
+"""
+
+import bisect
+import sys
+from itertools import islice
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+
+class ViewNode:
+    """Узел дерева в просмотрщике; объекты создаются только для детей раскрытых узлов"""
+
+    __slots__ = ('tree', 'parent', 'position', 'children', 'expanded', 'size', '_offsets')
+
+    def __init__(self, tree: Dict[str, Any], parent: Optional['ViewNode'] = None, position: int = 0):
+        self.tree = tree
+        self.parent = parent
+        self.position = position  # Номер среди детей родителя
+        self.children: Optional[List['ViewNode']] = None
+        self.expanded = False
+        # Видимых строк в поддереве (сам узел и раскрытые потомки)
+        self.size = 1
+        # Число видимых строк перед каждым ребенком (пересчитывается после изменения размеров)
+        self._offsets: Optional[List[int]] = None
+
+    @property
+    def child_count(self) -> int:
+        return len(self.tree.get('dependencies') or {})
+
+    def child_nodes(self) -> List['ViewNode']:
+        if self.children is None:
+            dependencies = self.tree.get('dependencies') or {}
+            self.children = [ViewNode(child, self, position)
+                             for position, child in enumerate(dependencies.values())]
+        return self.children
+
+    def offsets(self) -> List[int]:
+        if self._offsets is None:
+            offsets = []
+            total = 0
+            for child in self.children:
+                offsets.append(total)
+                total += child.size
+            self._offsets = offsets
+        return self._offsets
+
+    def is_last(self) -> bool:
+        return self.parent is None or self.position == len(self.parent.children) - 1
+
+
+class TreeView:
+    """Видимые строки дерева с раскрытием узлов по запросу"""
+
+    def __init__(self, tree: Dict[str, Any]):
+        self.root = ViewNode(tree)
+        self.expand(self.root)
+        self._index = None
+
+    @property
+    def total_rows(self) -> int:
+        return self.root.size
+
+    @property
+    def index(self):
+        """Индекс пакетов строится при первом поиске, а не при открытии просмотрщика"""
+        if self._index is None:
+            from dependency_index import DependencyIndex
+            self._index = DependencyIndex(self.root.tree)
+        return self._index
+
+    def _resize(self, node: ViewNode, delta: int) -> None:
+        """Изменяет число видимых строк узла и всех его предков"""
+        node._offsets = None
+        while node is not None:
+            node.size += delta
+            if node.parent is not None:
+                node.parent._offsets = None
+            node = node.parent
+
+    def expand(self, node: ViewNode) -> None:
+        if node.expanded or not node.child_count:
+            return
+        children = node.child_nodes()
+        node.expanded = True
+        self._resize(node, sum(child.size for child in children))
+
+    def collapse(self, node: ViewNode) -> None:
+        if not node.expanded:
+            return
+        node.expanded = False
+        self._resize(node, 1 - node.size)
+
+    def toggle(self, node: ViewNode) -> None:
+        if node.expanded:
+            self.collapse(node)
+        else:
+            self.expand(node)
+
+    def node_at(self, row: int) -> ViewNode:
+        """Узел видимой строки с номером row (спуск от корня по числу строк поддеревьев)"""
+        row = max(0, min(row, self.total_rows - 1))
+        node = self.root
+        while row:
+            row -= 1
+            offsets = node.offsets()
+            position = bisect.bisect_right(offsets, row) - 1
+            row -= offsets[position]
+            node = node.children[position]
+        return node
+
+    def row_of(self, node: ViewNode) -> int:
+        """Номер видимой строки узла (все предки должны быть раскрыты)"""
+        row = 0
+        while node.parent is not None:
+            row += 1 + node.parent.offsets()[node.position]
+            node = node.parent
+        return row
+
+    @staticmethod
+    def next_node(node: ViewNode) -> Optional[ViewNode]:
+        """Следующая видимая строка"""
+        if node.expanded:
+            return node.children[0]
+        while node.parent is not None:
+            siblings = node.parent.children
+            if node.position + 1 < len(siblings):
+                return siblings[node.position + 1]
+            node = node.parent
+        return None
+
+    def nodes_from(self, row: int, count: int) -> Iterator[ViewNode]:
+        """Узлы видимых строк [row, row + count)"""
+        if row >= self.total_rows:
+            return
+        node = self.node_at(row)
+        while node is not None and count > 0:
+            yield node
+            count -= 1
+            node = self.next_node(node)
+
+    @staticmethod
+    def format_row(node: ViewNode) -> str:
+        """Строка узла в формате ASCII-дерева визуализатора"""
+        parts = []
+        ancestor = node.parent
+        while ancestor is not None:
+            parts.append("    " if ancestor.is_last() else "│   ")
+            ancestor = ancestor.parent
+        parts.reverse()
+
+        tree = node.tree
+        line = f"{''.join(parts)}{'└── ' if node.is_last() else '├── '}{tree['name']}@{tree.get('version', 'unknown')}"
+        if tree.get('error'):
+            line += f" [ОШИБКА: {tree['error']}]"
+        if tree.get('truncated'):
+            line += " [УСЕЧЕНО]"
+        if not node.expanded and node.child_count:
+            line += f" [+{node.child_count}]"
+        return line
+
+    def _walk(self, start: Optional[List[int]] = None) -> Iterator[Tuple[List[int], Dict[str, Any]]]:
+        """Обход исходного дерева в порядке строк: путь из номеров детей и узел
+
+        С путем start обход продолжается после этого узла (сам узел не выдается):
+        спуск к нему стоит только пропуска его старших соседей на каждом уровне.
+        Путь - один и тот же изменяемый список; его нужно скопировать, чтобы сохранить.
+        """
+        if start is None:
+            yield [], self.root.tree
+            start = []
+
+        path = []
+        stack = []
+        tree = self.root.tree
+        for position in start:
+            siblings = iter((tree.get('dependencies') or {}).values())
+            tree = next(islice(siblings, position, None))
+            stack.append(siblings)
+            path.append(position)
+        dependencies = tree.get('dependencies')
+        if dependencies:
+            stack.append(iter(dependencies.values()))
+            path.append(-1)
+
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                path.pop()
+                continue
+            path[-1] += 1
+            yield path, child
+            dependencies = child.get('dependencies')
+            if dependencies:
+                stack.append(iter(dependencies.values()))
+                path.append(-1)
+
+    def reveal(self, path: List[int]) -> ViewNode:
+        """Раскрывает предков узла и возвращает его"""
+        node = self.root
+        for position in path:
+            self.expand(node)
+            node = node.children[position]
+        return node
+
+    def path_of(self, node: ViewNode) -> List[int]:
+        path = []
+        while node.parent is not None:
+            path.append(node.position)
+            node = node.parent
+        path.reverse()
+        return path
+
+    def matching_packages(self, query: str) -> List[str]:
+        """Пакеты графа, имя которых содержит query (без учета регистра)"""
+        query = query.lower()
+        return [name for name in self.index.packages() if query in name.lower()]
+
+    def search(self, query: str, after: Optional[ViewNode] = None) -> Optional[ViewNode]:
+        """Следующее после after вхождение пакета, подходящего под query (с переходом в начало)
+
+        Индекс сразу отвечает, есть ли такие пакеты; обход продолжается от after
+        только до найденного вхождения, а строки при этом не формируются.
+        """
+        names = set(self.matching_packages(query))
+        if not names:
+            return None
+
+        start = self.path_of(after) if after is not None else None
+        for path, tree in self._walk(start):
+            if tree['name'] in names:
+                return self.reveal(path)
+        if start is None:
+            return None
+
+        # После конца дерева поиск продолжается с начала до after включительно
+        for path, tree in self._walk():
+            if path > start:
+                break
+            if tree['name'] in names:
+                return self.reveal(path)
+        return None
+
+    def describe(self, node: ViewNode) -> str:
+        """Кто зависит от пакета узла и кратчайший путь до него (по индексу)"""
+        name = node.tree['name']
+        parents = self.index.reverse_dependencies(name)
+        shown = ", ".join(parents[:10]) + (f" и еще {len(parents) - 10}" if len(parents) > 10 else "")
+        return (f"{name}: зависят {len(parents)} ({shown or 'корень'}); "
+                f"путь: {' -> '.join(self.index.shortest_path(name))}")
+
+
+class CursesBrowser:
+    """Полноэкранный просмотр (curses)"""
+
+    HELP = ("↑↓ PgUp PgDn Home End - перемещение  → ← Enter - раскрыть/свернуть  "
+            "/ - поиск  n - дальше  r - кто зависит  q - выход")
+
+    def __init__(self, view: TreeView, title: str = ""):
+        self.view = view
+        self.title = title
+        self.cursor = 0
+        self.top = 0
+        self.query = ""
+        self.message = ""
+
+    def run(self, screen) -> None:
+        import curses
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass
+        if hasattr(curses, 'set_escdelay'):
+            # Esc закрывает просмотр без обычной задержки в 1 с
+            curses.set_escdelay(25)
+        while True:
+            self.draw(screen)
+            if not self.handle_key(screen, screen.getch()):
+                break
+
+    def page_size(self, screen) -> int:
+        return max(1, screen.getmaxyx()[0] - 2)
+
+    def draw(self, screen) -> None:
+        import curses
+        height, width = screen.getmaxyx()
+        rows = self.page_size(screen)
+
+        # Окно следует за курсором
+        if self.cursor < self.top:
+            self.top = self.cursor
+        elif self.cursor >= self.top + rows:
+            self.top = self.cursor - rows + 1
+
+        screen.erase()
+        header = f"{self.title}  строка {self.cursor + 1} из {self.view.total_rows}"
+        screen.addnstr(0, 0, header, width - 1, curses.A_BOLD)
+        for offset, node in enumerate(self.view.nodes_from(self.top, rows)):
+            attr = curses.A_REVERSE if self.top + offset == self.cursor else curses.A_NORMAL
+            screen.addnstr(1 + offset, 0, self.view.format_row(node), width - 1, attr)
+        if height > 1:
+            screen.addnstr(height - 1, 0, self.message or self.HELP, width - 1, curses.A_DIM)
+        screen.refresh()
+
+    def prompt(self, screen, text: str) -> str:
+        import curses
+        height, width = screen.getmaxyx()
+        screen.move(height - 1, 0)
+        screen.clrtoeol()
+        screen.addnstr(height - 1, 0, text, width - 1)
+        curses.echo()
+        try:
+            curses.curs_set(1)
+        except curses.error:
+            pass
+        try:
+            value = screen.getstr(height - 1, min(len(text), width - 1)).decode('utf-8', 'replace')
+        finally:
+            curses.noecho()
+            try:
+                curses.curs_set(0)
+            except curses.error:
+                pass
+        return value.strip()
+
+    def find(self, node: ViewNode) -> None:
+        found = self.view.search(self.query, node)
+        if found is None:
+            self.message = f"Пакет '{self.query}' не найден"
+        else:
+            self.cursor = self.view.row_of(found)
+            self.message = f"Найдено: {found.tree['name']} (пакетов по запросу: {len(self.view.matching_packages(self.query))})"
+
+    def handle_key(self, screen, key: int) -> bool:
+        """Обрабатывает клавишу; False - выход"""
+        import curses
+        view = self.view
+        node = view.node_at(self.cursor)
+        last_row = view.total_rows - 1
+        self.message = ""
+
+        if key in (ord('q'), 27):
+            return False
+        if key in (curses.KEY_UP, ord('k')):
+            self.cursor = max(0, self.cursor - 1)
+        elif key in (curses.KEY_DOWN, ord('j')):
+            self.cursor = min(last_row, self.cursor + 1)
+        elif key == curses.KEY_PPAGE:
+            self.cursor = max(0, self.cursor - self.page_size(screen))
+        elif key == curses.KEY_NPAGE:
+            self.cursor = min(last_row, self.cursor + self.page_size(screen))
+        elif key in (curses.KEY_HOME, ord('g')):
+            self.cursor = 0
+        elif key in (curses.KEY_END, ord('G')):
+            self.cursor = last_row
+        elif key in (curses.KEY_RIGHT, ord('l')):
+            if node.child_count and not node.expanded:
+                view.expand(node)
+            elif node.expanded:
+                self.cursor += 1
+        elif key in (curses.KEY_LEFT, ord('h')):
+            if node.expanded:
+                view.collapse(node)
+            elif node.parent is not None:
+                self.cursor = view.row_of(node.parent)
+        elif key in (curses.KEY_ENTER, 10, 13, ord(' ')):
+            view.toggle(node)
+        elif key == ord('/'):
+            self.query = self.prompt(screen, "Поиск: ")
+            if self.query:
+                self.find(node)
+        elif key == ord('n') and self.query:
+            self.find(node)
+        elif key == ord('r'):
+            self.message = view.describe(node)
+        return True
+
+
+class TextBrowser:
+    """Постраничный просмотр для терминалов без curses (или когда вывод не в терминал)"""
+
+    PAGE_SIZE = 40
+    HELP = ("Enter - следующая страница, b - предыдущая, t N - раскрыть/свернуть строку N, "
+            "/текст - поиск, n - следующее вхождение, r N - кто зависит, q - выход")
+
+    def __init__(self, view: TreeView, title: str = ""):
+        self.view = view
+        self.title = title
+        self.top = 0
+        self.query = ""
+        self.current: Optional[ViewNode] = None
+
+    def show_page(self) -> None:
+        print(f"\n{self.title}  строки {self.top + 1}-"
+              f"{min(self.top + self.PAGE_SIZE, self.view.total_rows)} из {self.view.total_rows}")
+        for offset, node in enumerate(self.view.nodes_from(self.top, self.PAGE_SIZE)):
+            print(f"{self.top + offset + 1:>7}  {self.view.format_row(node)}")
+
+    def row_argument(self, argument: str) -> Optional[ViewNode]:
+        try:
+            row = int(argument) - 1
+        except ValueError:
+            return None
+        if not 0 <= row < self.view.total_rows:
+            return None
+        return self.view.node_at(row)
+
+    def find(self) -> None:
+        found = self.view.search(self.query, self.current)
+        if found is None:
+            print(f"Пакет '{self.query}' не найден")
+            return
+        self.current = found
+        self.top = self.view.row_of(found)
+
+    def run(self) -> None:
+        print(self.HELP)
+        while True:
+            self.show_page()
+            try:
+                command = input("> ").strip()
+            except EOFError:
+                break
+
+            if command == 'q':
+                break
+            if command == '':
+                if self.top + self.PAGE_SIZE < self.view.total_rows:
+                    self.top += self.PAGE_SIZE
+            elif command == 'b':
+                self.top = max(0, self.top - self.PAGE_SIZE)
+            elif command.startswith('/') and command[1:].strip():
+                self.query = command[1:].strip()
+                self.current = None
+                self.find()
+            elif command == 'n' and self.query:
+                self.find()
+            elif command[:2] in ('t ', 'r '):
+                node = self.row_argument(command[2:].strip())
+                if node is None:
+                    print("Некорректный номер строки")
+                elif command[0] == 't':
+                    self.view.toggle(node)
+                    # После сворачивания строк может стать меньше, чем начало страницы
+                    self.top = min(self.top, max(0, self.view.total_rows - self.PAGE_SIZE))
+                else:
+                    print(self.view.describe(node))
+            else:
+                print(self.HELP)
+
+
+def browse_tree(tree: Dict[str, Any], title: str = "") -> None:
+    """Открывает интерактивный просмотр дерева: curses в терминале, иначе постраничный режим"""
+    view = TreeView(tree)
+    try:
+        import curses
+    except ImportError:
+        # Например, Windows без пакета windows-curses
+        curses = None
+
+    if curses is None or not sys.stdin.isatty() or not sys.stdout.isatty():
+        TextBrowser(view, title).run()
+        return
+
+    import locale
+    locale.setlocale(locale.LC_ALL, '')
+    # Вывод анализа (в том числе через захват в лог) должен попасть на экран до перехода в полноэкранный режим
+    sys.stdout.flush()
+    curses.wrapper(CursesBrowser(view, title).run)
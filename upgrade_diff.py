@@ -0,0 +1,113 @@
+"""
+Сравнение графов зависимостей двух версий корневого пакета
+"""
+
+from typing import Dict, Any, List, Tuple
+from dependency_index import DependencyIndex
+from graph_statistics import GraphStatistics
+
+
+class GraphSummary:
+    """Сводка графа для сравнения: версии и минимальная глубина каждого пакета, размер"""
+
+    def __init__(self, tree: Dict[str, Any]):
+        index = DependencyIndex(tree)
+        statistics = GraphStatistics(tree)
+        self.root = f"{tree['name']}@{tree.get('version', 'unknown')}"
+        self.versions: Dict[str, List[str]] = index.versions
+        self.depth: Dict[str, int] = index.depth
+        self.total_nodes = statistics.total_nodes
+        self.unique_packages = statistics.unique_names
+
+
+class UpgradeDiff:
+    """Структурная разница графов: добавленные и удаленные пакеты, смена версий и глубины, размер
+
+    Сравниваются сводки, поэтому граф первой версии можно освободить
+    (или закрыть его хранилище) до построения второго.
+    """
+
+    def __init__(self, old: GraphSummary, new: GraphSummary):
+        self.old_root = old.root
+        self.new_root = new.root
+        old_packages = set(old.depth)
+        new_packages = set(new.depth)
+
+        # Пакет -> версии (добавленные и удаленные)
+        self.added: Dict[str, List[str]] = {
+            name: new.versions.get(name, []) for name in sorted(new_packages - old_packages)
+        }
+        self.removed: Dict[str, List[str]] = {
+            name: old.versions.get(name, []) for name in sorted(old_packages - new_packages)
+        }
+
+        common = sorted(old_packages & new_packages)
+        # (пакет, старые версии, новые версии)
+        self.version_changes: List[Tuple[str, List[str], List[str]]] = [
+            (name, old.versions.get(name, []), new.versions.get(name, []))
+            for name in common
+            if set(old.versions.get(name, [])) != set(new.versions.get(name, []))
+        ]
+        # (пакет, старая минимальная глубина, новая минимальная глубина)
+        self.depth_changes: List[Tuple[str, int, int]] = [
+            (name, old.depth[name], new.depth[name])
+            for name in common
+            if old.depth[name] != new.depth[name]
+        ]
+
+        self.old_size = (old.total_nodes, old.unique_packages)
+        self.new_size = (new.total_nodes, new.unique_packages)
+
+    @classmethod
+    def from_trees(cls, old_tree: Dict[str, Any], new_tree: Dict[str, Any]) -> 'UpgradeDiff':
+        return cls(GraphSummary(old_tree), GraphSummary(new_tree))
+
+    @staticmethod
+    def _versions(versions: List[str]) -> str:
+        return ", ".join(versions)
+
+    @staticmethod
+    def _signed(value: int) -> str:
+        return f"{value:+d}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Разница в виде словаря для JSON"""
+        return {
+            'old_root': self.old_root,
+            'new_root': self.new_root,
+            'added': self.added,
+            'removed': self.removed,
+            'version_changes': [
+                {'name': name, 'old': old, 'new': new} for name, old, new in self.version_changes
+            ],
+            'depth_changes': [
+                {'name': name, 'old': old, 'new': new} for name, old, new in self.depth_changes
+            ],
+            'total_nodes': {'old': self.old_size[0], 'new': self.new_size[0]},
+            'unique_packages': {'old': self.old_size[1], 'new': self.new_size[1]},
+        }
+
+    def format_lines(self) -> List[str]:
+        """Разница в виде строк отчета"""
+        lines = [
+            f"Было: {self.old_root}",
+            f"Стало: {self.new_root}",
+            f"Всего пакетов в графе: {self.old_size[0]} -> {self.new_size[0]} "
+            f"({self._signed(self.new_size[0] - self.old_size[0])})",
+            f"Уникальных пакетов: {self.old_size[1]} -> {self.new_size[1]} "
+            f"({self._signed(self.new_size[1] - self.old_size[1])})",
+        ]
+
+        lines.append(f"\nДобавлено пакетов: {len(self.added)}")
+        lines.extend(f"  + {name}@{self._versions(versions)}" for name, versions in self.added.items())
+
+        lines.append(f"\nУдалено пакетов: {len(self.removed)}")
+        lines.extend(f"  - {name}@{self._versions(versions)}" for name, versions in self.removed.items())
+
+        lines.append(f"\nИзменились версии: {len(self.version_changes)}")
+        lines.extend(f"  ~ {name}: {self._versions(old)} -> {self._versions(new)}"
+                     for name, old, new in self.version_changes)
+
+        lines.append(f"\nИзменилась глубина: {len(self.depth_changes)}")
+        lines.extend(f"  {name}: уровень {old} -> {new}" for name, old, new in self.depth_changes)
+        return lines
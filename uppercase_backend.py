@@ -0,0 +1,64 @@
+import os
+from typing import Dict, Any, Optional
+from network_error import NetworkError
+from repository_backends import RepositoryBackend
+
+
+class UppercaseBackend(RepositoryBackend):
+    """Бэкенд тестового репозитория с пакетами в UPPERCASE"""
+
+    kind = "uppercase"
+
+    def __init__(self, client):
+        super().__init__(client)
+        # Кеш разобранных UPPERCASE репозиториев: путь -> UppercaseRepository
+        self.repositories: Dict[str, Any] = {}
+
+    @classmethod
+    def matches(cls, repo_url: str) -> bool:
+        # UPPERCASE репозиторий - текстовый файл
+        return repo_url.endswith('.txt')
+
+    def fetch(self, package_name: str, version: str = "latest",
+              repo_url: str = "", test_mode: bool = False) -> Dict[str, Any]:
+        """Получает информацию о пакете из UPPERCASE репозитория"""
+        try:
+            from uppercase_repository import UppercaseRepository
+            
+            # Файл репозитория разбирается один раз и переиспользуется для всех узлов
+            normalized_path = os.path.normpath(repo_url)
+            repo = self.repositories.get(normalized_path)
+            if repo is None:
+                repo = UppercaseRepository(repo_url, parse_workers=self.client.parse_workers)
+                self.repositories[normalized_path] = repo
+            package_info = repo.get_package(package_name, version)
+            
+            if not package_info:
+                raise NetworkError(f"Пакет {package_name} не найден в UPPERCASE репозитории")
+            
+            return package_info
+            
+        except ImportError:
+            raise NetworkError("Модуль UPPERCASE репозитория не доступен")
+        except Exception as e:
+            raise NetworkError(f"Ошибка получения пакета из UPPERCASE репозитория: {e}")
+
+    def collect_dependencies(self, package_info: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        print(f"[EXTRACT DEBUG] Извлечение UPPERCASE зависимостей из: {package_info.get('name', 'unknown')}")
+        
+        # Проверяем несколько возможных мест хранения зависимостей
+        if 'dependencies' in package_info and package_info['dependencies']:
+            deps = package_info['dependencies']
+            print(f"[EXTRACT DEBUG] Найдены UPPERCASE зависимости: {deps}")
+            
+            if isinstance(deps, dict):
+                print(f"[EXTRACT DEBUG] Успешно извлечено {len(deps)} зависимостей")
+                return deps
+            print(f"[EXTRACT DEBUG] ОШИБКА: зависимости не в формате dict: {type(deps)}")
+        else:
+            print(f"[EXTRACT DEBUG] ВНИМАНИЕ: нет зависимостей в package_info")
+            print(f"[EXTRACT DEBUG] Доступные ключи: {list(package_info.keys())}")
+        return {}
+
+    def clear_cache(self) -> None:
+        self.repositories.clear()
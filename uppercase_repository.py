@@ -2,122 +2,297 @@
 Модуль для работы с тестовым репозиторием с пакетами в UPPERCASE
 """
 
+import gc
 import os
-import json
 import re
-from typing import Dict, Any, Optional
+from array import array
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Tuple
 from config_error import ConfigError
 
+UPPERCASE_NAME_PATTERN = re.compile(r'^[A-Z][A-Z0-9_]*$')
+# Начало строки заголовка пакета (без отступа) - граница, по которой файл делится на части
+HEADER_START_PATTERN = re.compile(rb'\n(?=[A-Z])')
+
+# Версия всех пакетов тестового репозитория
+PACKAGE_VERSION = '1.0.0'
+
+# Файлы меньше этого размера разбираются в текущем процессе
+PARALLEL_PARSE_THRESHOLD = 8 * 1024 * 1024
+# Частей на процесс: мелкие части выравнивают нагрузку между процессами
+CHUNKS_PER_WORKER = 4
+# Размер блока чтения при поиске границ частей и подсчете строк
+SPLIT_WINDOW_SIZE = 1024 * 1024
+
+# Результат разбора части: имена пакетов, строки их заголовков, зависимости пакетов
+# и текст первой ошибки. Столбцы вместо словаря на пакет - их быстро передавать
+# между процессами и добавлять в общий словарь.
+ParsedChunk = Tuple[List[str], array, List[Tuple[str, ...]], Optional[str]]
+
+
+@contextmanager
+def gc_paused():
+    """Отключает сборщик мусора: разбор создает миллионы строк и кортежей без циклических ссылок"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def validate_uppercase_name(name: str, line_num: int):
+    """Валидирует что имя пакета в UPPERCASE"""
+    if not UPPERCASE_NAME_PATTERN.match(name):
+        raise ConfigError(
+            f"Некорректное имя пакета в строке {line_num}: '{name}'. "
+            f"Должно содержать только большие латинские буквы, цифры и подчеркивания"
+        )
 
-class UppercaseRepository:
-    """Класс для работы с тестовым репозиторием где пакеты в UPPERCASE"""
-    
-    def __init__(self, repo_path: str):
-        self.repo_path = os.path.normpath(repo_path)
-        self.packages = {}
-        self._load_repository_graph()
-    
-    def _load_repository_graph(self):
-        """Загружает граф репозитория из файла"""
-        if not os.path.exists(self.repo_path):
-            raise ConfigError(f"Файл репозитория не найден: {self.repo_path}")
-        
-        try:
-            with open(self.repo_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Парсим специальный формат графа
-            self._parse_repository_graph(content)
-            
-        except Exception as e:
-            raise ConfigError(f"Ошибка загрузки репозитория: {e}")
-    
-    def _parse_repository_graph(self, content: str):
 
-        current_package = None
-        lines = content.split('\n')
-        
+def parse_repository_chunk(content: str, first_line: int = 1) -> ParsedChunk:
+    """Разбирает часть файла репозитория, начинающуюся со строки first_line
+
+    Пакеты, прочитанные до ошибки, тоже возвращаются: при слиянии частей повтор
+    пакета из предыдущей части должен быть найден раньше ошибки, как при разборе
+    подряд. Функция определена на уровне модуля, чтобы выполняться в пуле процессов.
+    """
+    names: List[str] = []
+    header_lines = array('q')
+    dependencies: List[Tuple[str, ...]] = []
+    seen = set()
+    lines = content.split('\n')
+    # Номер строки в файле = индекс в части + смещение
+    offset = first_line - 1
+
+    try:
         i = 0
         while i < len(lines):
             line = lines[i].strip()
             i += 1
-            
+
             # Пропускаем пустые строки и комментарии
             if not line or line.startswith('#'):
                 continue
-            
+
             # Проверяем что это имя пакета (UPPERCASE и нет отступа)
-            if (re.match(r'^[A-Z][A-Z0-9_]*$', line) and 
-                not lines[i-1].startswith((' ', '\t'))):
-                
+            if (UPPERCASE_NAME_PATTERN.match(line) and
+                    not lines[i-1].startswith((' ', '\t'))):
+
                 package_name = line
-                self._validate_uppercase_name(package_name, i)
-                
-                if package_name in self.packages:
-                    raise ConfigError(f"Дублирующийся пакет {package_name} в строке {i}")
-                
-                self.packages[package_name] = {
-                    'name': package_name,
-                    'version': '1.0.0',
-                    'dependencies': []
-                }
-                current_package = package_name
-                
+                validate_uppercase_name(package_name, i + offset)
+
+                if package_name in seen:
+                    raise ConfigError(f"Дублирующийся пакет {package_name} в строке {i + offset}")
+
+                package_dependencies = []
+                seen.add(package_name)
+                names.append(package_name)
+                header_lines.append(i + offset)
+
                 # Читаем зависимости (строки с отступами)
-                while i < len(lines) and lines[i].startswith((' ', '\t')):
-                    dep_line = lines[i].strip()
-                    i += 1
-                    
-                    if dep_line and not dep_line.startswith('#'):
-                        # Поддерживаем зависимости через запятые
-                        if ',' in dep_line:
-                            dependencies = [dep.strip() for dep in dep_line.split(',')]
-                        else:
-                            dependencies = [dep_line]
-                        
-                        for dep in dependencies:
-                            if dep:  # проверяем что зависимость не пустая
-                                self._validate_uppercase_name(dep, i)
-                                self.packages[current_package]['dependencies'].append({
-                                    'name': dep,
-                                    'version': '1.0.0'
-                                })
-            
+                try:
+                    while i < len(lines) and lines[i].startswith((' ', '\t')):
+                        dep_line = lines[i].strip()
+                        i += 1
+
+                        if dep_line and not dep_line.startswith('#'):
+                            # Поддерживаем зависимости через запятые
+                            for dep in dep_line.split(','):
+                                dep = dep.strip()
+                                if dep:  # проверяем что зависимость не пустая
+                                    validate_uppercase_name(dep, i + offset)
+                                    package_dependencies.append(dep)
+                finally:
+                    dependencies.append(tuple(package_dependencies))
+
             else:
                 # Если строка не пустая, не комментарий и не пакет - ошибка формата
-                if line and not line.startswith('#'):
-                    raise ConfigError(f"Некорректный формат в строке {i}: {lines[i-1]}")
-        
+                raise ConfigError(f"Некорректный формат в строке {i + offset}: {lines[i-1]}")
+
+    except ConfigError as e:
+        return names, header_lines, dependencies, str(e)
+
+    return names, header_lines, dependencies, None
+
+
+def parse_repository_file_chunk(repo_path: str, start: int, end: int,
+                                first_line: int) -> ParsedChunk:
+    """Читает байты [start, end) файла и разбирает их (выполняется в пуле процессов)"""
+    with open(repo_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    with gc_paused():
+        return parse_repository_chunk(decode_repository_text(data), first_line)
+
+
+def decode_repository_text(data: bytes) -> str:
+    """Декодирует текст с переводом строк как при чтении файла в текстовом режиме"""
+    text = data.decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+class UppercaseRepository:
+    """Класс для работы с тестовым репозиторием где пакеты в UPPERCASE"""
+
+    def __init__(self, repo_path: str, parse_workers: int = 0):
+        self.repo_path = os.path.normpath(repo_path)
+        # Имя пакета -> имена зависимостей (версия у всех пакетов одна - PACKAGE_VERSION)
+        self.packages: Dict[str, Tuple[str, ...]] = {}
+        # Процессов для разбора больших файлов (0 - разбор в текущем процессе)
+        self.parse_workers = parse_workers
+        self._load_repository_graph()
+
+    def _load_repository_graph(self):
+        """Загружает граф репозитория из файла"""
+        if not os.path.exists(self.repo_path):
+            raise ConfigError(f"Файл репозитория не найден: {self.repo_path}")
+
+        try:
+            if self.parse_workers > 0 and os.path.getsize(self.repo_path) >= PARALLEL_PARSE_THRESHOLD:
+                self._parse_repository_parallel()
+            else:
+                with open(self.repo_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+
+                # Парсим специальный формат графа
+                self._parse_repository_graph(content)
+
+        except Exception as e:
+            raise ConfigError(f"Ошибка загрузки репозитория: {e}")
+
+    def _parse_repository_graph(self, content: str):
+        """Разбирает содержимое файла репозитория в текущем процессе"""
+        with gc_paused():
+            self._merge_chunk(*parse_repository_chunk(content))
+        self._print_summary()
+
+    @staticmethod
+    def _find_chunk_start(f, position: int, size: int) -> int:
+        """Смещение первой строки без отступа, начинающейся с заглавной буквы, не раньше position"""
+        window_start = position - 1  # перевод строки перед заголовком может стоять прямо перед position
+        f.seek(window_start)
+        tail = b''
+        while True:
+            block = f.read(SPLIT_WINDOW_SIZE)
+            if not block:
+                return size
+            window = tail + block
+            match = HEADER_START_PATTERN.search(window)
+            if match:
+                return window_start + match.end()
+            # Последний байт может быть переводом строки перед заголовком в следующем блоке
+            window_start += len(window) - 1
+            tail = window[-1:]
+
+    @staticmethod
+    def _count_lines(f, start: int, end: int) -> int:
+        """Число переводов строк в [start, end) с учетом \\r\\n и одиночных \\r"""
+        f.seek(start)
+        remaining = end - start
+        count = 0
+        previous = b''
+        while remaining > 0:
+            block = f.read(min(SPLIT_WINDOW_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            count += block.count(b'\n') + block.count(b'\r') - block.count(b'\r\n')
+            # \r\n на границе блоков
+            if previous == b'\r' and block[:1] == b'\n':
+                count -= 1
+            previous = block[-1:]
+        return count
+
+    def _split_repository(self) -> List[Tuple[int, int, int]]:
+        """Делит файл на части по строкам заголовков: (начало, конец, номер первой строки)
+
+        Файл читается блоками, поэтому целиком в память основного процесса не загружается.
+        """
+        size = os.path.getsize(self.repo_path)
+        target_size = max(1, size // (self.parse_workers * CHUNKS_PER_WORKER))
+
+        with open(self.repo_path, 'rb') as f:
+            # Часть начинается с заголовка пакета, поэтому блок зависимостей не разрывается
+            boundaries = [0]
+            while boundaries[-1] + target_size < size:
+                start = self._find_chunk_start(f, boundaries[-1] + target_size, size)
+                if start >= size:
+                    break
+                boundaries.append(start)
+            boundaries.append(size)
+
+            chunks = []
+            first_line = 1
+            for start, end in zip(boundaries, boundaries[1:]):
+                chunks.append((start, end, first_line))
+                first_line += self._count_lines(f, start, end)
+        return chunks
+
+    def _parse_repository_parallel(self):
+        """Разбирает части файла в пуле процессов и объединяет их в порядке файла"""
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunks = self._split_repository()
+        pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+        try:
+            results = pool.map(parse_repository_file_chunk,
+                               [self.repo_path] * len(chunks),
+                               [start for start, _, _ in chunks],
+                               [end for _, end, _ in chunks],
+                               [first_line for _, _, first_line in chunks])
+            with gc_paused():
+                for result in results:
+                    self._merge_chunk(*result)
+        finally:
+            # После ошибки оставшиеся части разбирать незачем
+            pool.shutdown(cancel_futures=True)
+
+        self._print_summary()
+
+    def _merge_chunk(self, names: List[str], header_lines: array,
+                     dependencies: List[Tuple[str, ...]], error: Optional[str]):
+        """Добавляет пакеты части; повторы и ошибки сообщаются в порядке строк файла"""
+        duplicates = self.packages.keys() & names
+        if duplicates:
+            for package_name, line_num in zip(names, header_lines):
+                if package_name in duplicates:
+                    raise ConfigError(f"Дублирующийся пакет {package_name} в строке {line_num}")
+
+        self.packages.update(zip(names, dependencies))
+
+        if error:
+            raise ConfigError(error)
+
+    def _print_summary(self):
         print(f"[UPPERCASE] Загружено пакетов: {len(self.packages)}")
-        for pkg_name, pkg_data in self.packages.items():
-            deps = [dep['name'] for dep in pkg_data['dependencies']]
-            print(f"  {pkg_name} -> {deps}")
-    
+        for pkg_name, deps in self.packages.items():
+            print(f"  {pkg_name} -> {list(deps)}")
+
     def _validate_uppercase_name(self, name: str, line_num: int):
         """Валидирует что имя пакета в UPPERCASE"""
-        if not re.match(r'^[A-Z][A-Z0-9_]*$', name):
-            raise ConfigError(
-                f"Некорректное имя пакета в строке {line_num}: '{name}'. "
-                f"Должно содержать только большие латинские буквы, цифры и подчеркивания"
-            )
-    
+        validate_uppercase_name(name, line_num)
+
     def get_package(self, package_name: str, version: str = "latest") -> Optional[Dict[str, Any]]:
-    
+
         if package_name in self.packages:
-            pkg = self.packages[package_name]
-            
+            deps = self.packages[package_name]
+
             # ОТЛАДОЧНЫЙ ВЫВОД
-            print(f"[UPPERCASE DEBUG] Пакет {package_name}: версия={pkg['version']}, зависимости={[dep['name'] for dep in pkg['dependencies']]}")
-            
+            print(f"[UPPERCASE DEBUG] Пакет {package_name}: версия={PACKAGE_VERSION}, зависимости={list(deps)}")
+
             # ПРАВИЛЬНЫЙ ФОРМАТ для dependency_analyzer
             return {
-                "name": pkg["name"],
-                "version": pkg["version"],
-                "dependencies": {dep['name']: dep['version'] for dep in pkg['dependencies']}
+                "name": package_name,
+                "version": PACKAGE_VERSION,
+                "dependencies": {dep: PACKAGE_VERSION for dep in deps}
             }
         print(f"[UPPERCASE DEBUG] Пакет {package_name} не найден!")
         return None
-    
+
     def package_exists(self, package_name: str) -> bool:
         """Проверяет существование пакета"""
-        return package_name in self.packages
\ No newline at end of file
+        return package_name in self.packages
@@ -0,0 +1,124 @@
+"""
+Выбор версий пакета PyPI по списку его выпусков
+
+Список выпусков разбирается один раз в отсортированный индекс, после чего
+запрошенные версии сопоставляются с ним пакетно: выпуски, начинающиеся
+с запрошенной версии, образуют в отсортированном списке непрерывный диапазон,
+а первый из них по порядку в документе - минимум исходных позиций в диапазоне.
+С NumPy границы всех диапазонов и минимумы находятся векторными операциями,
+без него - через bisect. Результат совпадает с последовательным перебором:
+точное совпадение, первый выпуск с префиксом, первый содержащий выпуск, последний.
+"""
+
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence
+
+NON_VERSION_CHARS_PATTERN = re.compile(r'[^\d\.]')
+
+# Выпусков, начиная с которого поиск выполняется в NumPy (на коротких списках bisect быстрее)
+VECTORIZE_MIN_VERSIONS = 256
+# Символ больше любого символа версии: prefix + PREFIX_END ограничивает диапазон prefix*
+PREFIX_END = '\U0010ffff'
+
+_numpy = None
+
+
+def load_numpy():
+    """Модуль numpy или None, если он не установлен (импортируется при первом обращении)"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
+class VersionIndex:
+    """Выпуски одного пакета, подготовленные для пакетного выбора версий"""
+
+    def __init__(self, versions: Sequence[str]):
+        # Выпуски в порядке документа реестра
+        self.versions = list(versions)
+        # Версия -> позиция в документе (проверка точного совпадения)
+        self.positions: Dict[str, int] = {}
+        for position, version in enumerate(self.versions):
+            self.positions.setdefault(version, position)
+        # Выпуски по возрастанию строк и их позиции в документе
+        order = sorted(range(len(self.versions)), key=self.versions.__getitem__)
+        self.sorted_versions = [self.versions[position] for position in order]
+        self.sorted_positions = order
+        # Уже выбранные версии: запрошенная -> выбранная
+        self.selected: Dict[str, str] = {}
+
+        self.arrays = None
+        numpy = load_numpy() if len(self.versions) >= VECTORIZE_MIN_VERSIONS else None
+        if numpy is not None:
+            # Последний элемент позиций - ограничитель для пустых диапазонов в конце
+            self.arrays = (numpy.array(self.sorted_versions),
+                           numpy.array(order + [len(self.versions)], dtype=numpy.int64))
+
+    def select(self, requested_versions: Sequence[str]) -> List[str]:
+        """Выбирает выпуск для каждой запрошенной версии одним пакетным поиском"""
+        if not self.versions:
+            return ["latest"] * len(requested_versions)
+
+        # Запрошенная версия без лишних символов -> запрошенные версии с ней
+        prefixes: Dict[str, List[str]] = {}
+        for requested in requested_versions:
+            if requested in self.selected:
+                continue
+            if requested in self.positions:
+                self.selected[requested] = requested
+                continue
+            requested_clean = NON_VERSION_CHARS_PATTERN.sub('', requested)
+            if not requested_clean:
+                self.selected[requested] = self.versions[-1]  # последняя версия
+                continue
+            prefixes.setdefault(requested_clean, []).append(requested)
+
+        if prefixes:
+            clean_versions = list(prefixes)
+            for requested_clean, position in zip(clean_versions, self._first_with_prefix(clean_versions)):
+                if position is None:
+                    selected = self._first_containing(requested_clean)
+                else:
+                    selected = self.versions[position]
+                for requested in prefixes[requested_clean]:
+                    self.selected[requested] = selected
+
+        return [self.selected[requested] for requested in requested_versions]
+
+    def _first_with_prefix(self, prefixes: List[str]) -> List[Optional[int]]:
+        """Позиция первого в документе выпуска, начинающегося с каждого префикса"""
+        if self.arrays is not None:
+            return self._first_with_prefix_vectorized(prefixes)
+
+        positions = []
+        for prefix in prefixes:
+            start = bisect_left(self.sorted_versions, prefix)
+            end = bisect_left(self.sorted_versions, prefix + PREFIX_END, start)
+            positions.append(min(self.sorted_positions[start:end]) if start < end else None)
+        return positions
+
+    def _first_with_prefix_vectorized(self, prefixes: List[str]) -> List[Optional[int]]:
+        numpy = load_numpy()
+        sorted_versions, sorted_positions = self.arrays
+        starts = numpy.searchsorted(sorted_versions, numpy.array(prefixes))
+        ends = numpy.searchsorted(sorted_versions, numpy.array([prefix + PREFIX_END for prefix in prefixes]))
+        # Минимум на каждом отрезке [start, end); четные элементы reduceat - искомые отрезки
+        bounds = numpy.empty(2 * len(prefixes), dtype=numpy.int64)
+        bounds[0::2] = starts
+        bounds[1::2] = ends
+        minimums = numpy.minimum.reduceat(sorted_positions, bounds)[0::2]
+        return [int(position) if start < end else None
+                for position, start, end in zip(minimums.tolist(), starts.tolist(), ends.tolist())]
+
+    def _first_containing(self, requested_clean: str) -> str:
+        """Первая версия, содержащая запрошенную, иначе последняя доступная"""
+        for available in self.versions:
+            if requested_clean in available:
+                return available
+        return self.versions[-1]